@@ -1,18 +1,14 @@
 import tkinter as tk
 from tkinter import ttk
-import webbrowser
 
 
 class AboutTab:
-    def __init__(self, notebook):
-        self.notebook = notebook
+    def __init__(self, parent):
+        self.parent = parent
         self.create_tab()
     
     def create_tab(self):
-        tab6 = ttk.Frame(self.notebook)
-        self.notebook.add(tab6, text="关于")
-        
-        main_frame = ttk.Frame(tab6)
+        main_frame = ttk.Frame(self.parent)
         main_frame.pack(fill=tk.BOTH, expand=True)
         
         header_frame = ttk.Frame(main_frame, padding="20")
@@ -82,4 +78,5 @@ class AboutTab:
         copyright_label.bind("<Button-1>", lambda e: self.open_url("https://gitee.com/xushuai-wk/ipv6-address-planner"))
     
     def open_url(self, url):
+        import webbrowser
         webbrowser.open(url)
\ No newline at end of file
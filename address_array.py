@@ -0,0 +1,227 @@
+import ipaddress
+from address_format import MAPPED_AS_DOTTED, hex_tables
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+MASK64 = (1 << 64) - 1
+
+_HEX4_BYTES = None
+_HEX_SHORT_BYTES = None
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("IPv6Array 需要 numpy，请先执行: pip install numpy")
+
+
+def _hex4_bytes():
+    global _HEX4_BYTES
+    if _HEX4_BYTES is None:
+        table = np.frombuffer("".join(hex_tables()[0]).encode("ascii"), dtype=np.uint8)
+        _HEX4_BYTES = table.reshape(65536, 4)
+    return _HEX4_BYTES
+
+
+def _hex_short_bytes():
+    global _HEX_SHORT_BYTES
+    if _HEX_SHORT_BYTES is None:
+        table = _hex4_bytes().copy()
+        leading = np.cumprod(table[:, :3] == ord("0"), axis=1).astype(bool)
+        table[:, :3][leading] = 0
+        _HEX_SHORT_BYTES = table
+    return _HEX_SHORT_BYTES
+
+
+def _split(value):
+    return np.uint64(value >> 64), np.uint64(value & MASK64)
+
+
+def _prefix_masks(prefixlen):
+    mask = ((1 << 128) - 1) ^ ((1 << (128 - prefixlen)) - 1)
+    return _split(mask)
+
+
+class IPv6Array:
+    def __init__(self, hi, lo):
+        _require_numpy()
+        self.hi = np.asarray(hi, dtype=np.uint64)
+        self.lo = np.asarray(lo, dtype=np.uint64)
+        if self.hi.shape != self.lo.shape:
+            raise ValueError("hi 与 lo 数组长度必须一致")
+    
+    @classmethod
+    def from_ints(cls, values):
+        _require_numpy()
+        values = [int(v) for v in values]
+        hi = np.fromiter((v >> 64 for v in values), dtype=np.uint64, count=len(values))
+        lo = np.fromiter((v & MASK64 for v in values), dtype=np.uint64, count=len(values))
+        return cls(hi, lo)
+    
+    @classmethod
+    def from_strings(cls, texts):
+        return cls.from_ints(int(ipaddress.IPv6Address(text.strip())) for text in texts)
+    
+    @classmethod
+    def from_range(cls, start, count, step=1):
+        _require_numpy()
+        index = np.arange(count, dtype=np.uint64)
+        if step & (step - 1) == 0 and step > 0:
+            shift = step.bit_length() - 1
+            if shift == 0:
+                offset_hi, offset_lo = np.zeros(count, dtype=np.uint64), index
+            elif shift < 64:
+                offset_hi = index >> np.uint64(64 - shift)
+                offset_lo = index << np.uint64(shift)
+            else:
+                offset_hi = index << np.uint64(shift - 64)
+                offset_lo = np.zeros(count, dtype=np.uint64)
+        elif count * step <= MASK64:
+            offset_hi = np.zeros(count, dtype=np.uint64)
+            offset_lo = index * np.uint64(step)
+        else:
+            return cls.from_ints(start + i * step for i in range(count))
+        return cls(offset_hi, offset_lo).add(start)
+    
+    def __len__(self):
+        return len(self.hi)
+    
+    def __getitem__(self, key):
+        if isinstance(key, (int, np.integer)):
+            return (int(self.hi[key]) << 64) | int(self.lo[key])
+        return IPv6Array(self.hi[key], self.lo[key])
+    
+    def __iter__(self):
+        return iter(self.to_ints())
+    
+    def __repr__(self):
+        return f"IPv6Array(len={len(self)})"
+    
+    def to_ints(self):
+        return [(hi << 64) | lo for hi, lo in zip(self.hi.tolist(), self.lo.tolist())]
+    
+    def add(self, offset):
+        if isinstance(offset, IPv6Array):
+            offset_hi, offset_lo = offset.hi, offset.lo
+        else:
+            offset_hi, offset_lo = _split(int(offset) & ((1 << 128) - 1))
+        lo = self.lo + offset_lo
+        carry = (lo < self.lo).astype(np.uint64)
+        hi = self.hi + offset_hi + carry
+        return IPv6Array(hi, lo)
+    
+    def mask(self, prefixlen):
+        mask_hi, mask_lo = _prefix_masks(prefixlen)
+        return IPv6Array(self.hi & mask_hi, self.lo & mask_lo)
+    
+    def contains(self, network):
+        network = ipaddress.IPv6Network(network, strict=False)
+        mask_hi, mask_lo = _prefix_masks(network.prefixlen)
+        net_hi, net_lo = _split(int(network.network_address))
+        return ((self.hi & mask_hi) == net_hi) & ((self.lo & mask_lo) == net_lo)
+    
+    def _compare(self, other):
+        if isinstance(other, IPv6Array):
+            return other.hi, other.lo
+        return _split(int(other))
+    
+    def __eq__(self, other):
+        hi, lo = self._compare(other)
+        return (self.hi == hi) & (self.lo == lo)
+    
+    def __ne__(self, other):
+        return ~self.__eq__(other)
+    
+    def __lt__(self, other):
+        hi, lo = self._compare(other)
+        return (self.hi < hi) | ((self.hi == hi) & (self.lo < lo))
+    
+    def __le__(self, other):
+        hi, lo = self._compare(other)
+        return (self.hi < hi) | ((self.hi == hi) & (self.lo <= lo))
+    
+    def __gt__(self, other):
+        return ~self.__le__(other)
+    
+    def __ge__(self, other):
+        return ~self.__lt__(other)
+    
+    def argsort(self):
+        return np.lexsort((self.lo, self.hi))
+    
+    def sort(self):
+        order = self.argsort()
+        return IPv6Array(self.hi[order], self.lo[order])
+    
+    def groups(self):
+        columns = []
+        for half in (self.hi, self.lo):
+            for shift in (48, 32, 16, 0):
+                columns.append((half >> np.uint64(shift)) & np.uint64(0xFFFF))
+        return np.stack(columns, axis=1).astype(np.intp)
+    
+    def exploded_bytes(self, separator=b"\n"):
+        count = len(self)
+        if count == 0:
+            return b""
+        table = _hex4_bytes()
+        groups = self.groups()
+        row_width = 39 + len(separator)
+        buffer = np.empty((count, row_width), dtype=np.uint8)
+        for g in range(8):
+            buffer[:, 5 * g:5 * g + 4] = table[groups[:, g]]
+            if g < 7:
+                buffer[:, 5 * g + 4] = ord(":")
+        if separator:
+            buffer[:, 39:] = np.frombuffer(separator, dtype=np.uint8)
+        return buffer.tobytes()
+    
+    def exploded(self):
+        if not len(self):
+            return []
+        return self.exploded_bytes(b"\n").decode("ascii").split("\n")[:-1]
+    
+    def _zero_runs(self, groups):
+        run = np.zeros(groups.shape, dtype=np.int8)
+        previous = np.zeros(len(groups), dtype=np.int8)
+        for g in range(8):
+            previous = np.where(groups[:, g] == 0, previous + 1, 0).astype(np.int8)
+            run[:, g] = previous
+        length = run.max(axis=1)
+        end = run.argmax(axis=1)
+        start = end - length + 1
+        compress = length >= 2
+        return np.where(compress, start, 8), np.where(compress, end, -1)
+    
+    def compressed(self):
+        count = len(self)
+        if count == 0:
+            return []
+        groups = self.groups()
+        start, end = self._zero_runs(groups)
+        start = start[:, None]
+        end = end[:, None]
+        
+        buffer = np.empty((count, 40), dtype=np.uint8)
+        buffer[:, 39] = ord("\n")
+        positions = np.arange(8)
+        in_run = (positions >= start) & (positions <= end)
+        table = _hex_short_bytes()
+        for g in range(8):
+            buffer[:, 5 * g:5 * g + 4] = table[groups[:, g]]
+            buffer[in_run[:, g], 5 * g:5 * g + 4] = 0
+        
+        colons = positions[:7]
+        dropped = (colons >= start) & (colons < end)
+        dropped &= ~(((start == 0) & (colons == end - 1)) | ((end == 7) & (colons == start)))
+        buffer[:, 4:39:5] = np.where(dropped, 0, ord(":"))
+        
+        result = buffer.tobytes().replace(b"\0", b"").decode("ascii").split("\n")[:-1]
+        if MAPPED_AS_DOTTED:
+            mapped = np.flatnonzero((self.hi == 0) & ((self.lo >> np.uint64(32)) == np.uint64(0xFFFF)))
+            for i in mapped.tolist():
+                result[i] = str(ipaddress.IPv6Address(self[i]))
+        return result
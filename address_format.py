@@ -0,0 +1,169 @@
+import ipaddress
+import re
+
+
+_HEX4 = None
+_HEX_SHORT = None
+
+MAPPED_AS_DOTTED = str(ipaddress.IPv6Address("::ffff:1.2.3.4")) == "::ffff:1.2.3.4"
+
+HEX_COLON_PATTERN = re.compile(r'^[0-9A-Fa-f:]+$')
+PREFIX_TOKEN_PATTERN = re.compile(r'^([0-9A-Fa-f:.]+)/(\d{1,3})$')
+LAYOUT_FIELD_PATTERN = re.compile(r'^(?:\d+\.?|[0-9A-Fa-f]*:[0-9A-Fa-f:.]*)$')
+
+
+def hex_tables():
+    global _HEX4, _HEX_SHORT
+    if _HEX4 is None:
+        _HEX4 = [f"{i:04x}" for i in range(65536)]
+        _HEX_SHORT = [f"{i:x}" for i in range(65536)]
+    return _HEX4, _HEX_SHORT
+
+
+class AddressFormatter:
+    @staticmethod
+    def parse(text):
+        if not HEX_COLON_PATTERN.match(text):
+            return int(ipaddress.IPv6Address(text))
+        if len(text) == 39 and text.count(":") == 7 and "::" not in text:
+            return int(text.replace(":", ""), 16)
+        head, double_colon, tail = text.partition("::")
+        head_groups = head.split(":") if head else []
+        tail_groups = tail.split(":") if tail else []
+        if double_colon:
+            fill = 8 - len(head_groups) - len(tail_groups)
+            if fill < 1:
+                raise ipaddress.AddressValueError(f"地址格式无效: {text}")
+            groups = head_groups + ["0"] * fill + tail_groups
+        else:
+            groups = head_groups
+        if len(groups) != 8:
+            raise ipaddress.AddressValueError(f"地址格式无效: {text}")
+        value = 0
+        for group in groups:
+            if not 1 <= len(group) <= 4:
+                raise ipaddress.AddressValueError(f"地址格式无效: {text}")
+            value = (value << 16) | int(group, 16)
+        return value
+    
+    @staticmethod
+    def parse_prefix_line(line):
+        fields = line.replace("\t", ",").split(",")
+        match = PREFIX_TOKEN_PATTERN.match(fields[0].strip())
+        if match:
+            labels = [text for text in map(str.strip, fields[1:]) if text]
+        else:
+            for position, field in enumerate(fields):
+                if "/" not in field:
+                    continue
+                tokens = field.split()
+                for offset, token in enumerate(tokens):
+                    match = PREFIX_TOKEN_PATTERN.match(token)
+                    if match:
+                        break
+                if match:
+                    break
+            else:
+                return None
+            labels = [text for text in map(str.strip, fields[:position] + tokens[:offset])
+                      if text and not LAYOUT_FIELD_PATTERN.match(text)]
+            labels += [text for text in map(str.strip, [" ".join(tokens[offset + 1:])] + fields[position + 1:]) if text]
+        
+        length = int(match.group(2))
+        if length > 128:
+            raise ValueError("前缀长度必须在 0-128 之间")
+        return AddressFormatter.parse(match.group(1)), length, labels
+    
+    @staticmethod
+    def exploded(value):
+        h = f"{value:032x}"
+        return f"{h[0:4]}:{h[4:8]}:{h[8:12]}:{h[12:16]}:{h[16:20]}:{h[20:24]}:{h[24:28]}:{h[28:32]}"
+    
+    @staticmethod
+    def compressed(value):
+        if MAPPED_AS_DOTTED and value >> 32 == 0xFFFF:
+            return str(ipaddress.IPv6Address(value))
+        _, hex_short = hex_tables()
+        hextets = [hex_short[(value >> shift) & 0xFFFF] for shift in (112, 96, 80, 64, 48, 32, 16, 0)]
+        return AddressFormatter.join_compressed(hextets)
+    
+    @staticmethod
+    def join_compressed(hextets):
+        best_start = -1
+        best_len = 0
+        run_start = -1
+        run_len = 0
+        for index, hextet in enumerate(hextets):
+            if hextet == "0":
+                run_len += 1
+                if run_start == -1:
+                    run_start = index
+                if run_len > best_len:
+                    best_len = run_len
+                    best_start = run_start
+            else:
+                run_len = 0
+                run_start = -1
+        
+        if best_len > 1:
+            best_end = best_start + best_len
+            head = ":".join(hextets[:best_start])
+            tail = ":".join(hextets[best_end:])
+            return f"{head}::{tail}"
+        return ":".join(hextets)
+    
+    @staticmethod
+    def iter_exploded(start, count, step=1):
+        if count <= 0:
+            return
+        hex4, _ = hex_tables()
+        
+        if step == 1:
+            value = start
+            end = start + count
+            while value < end:
+                block_end = min(end, (value | 0xFFFF) + 1)
+                head = AddressFormatter.exploded(value)[:35]
+                low = value & 0xFFFF
+                for group in hex4[low:low + block_end - value]:
+                    yield head + group
+                value = block_end
+            return
+        
+        value = start
+        text = AddressFormatter.exploded(value)
+        yield text
+        for _ in range(count - 1):
+            previous = value
+            value += step
+            changed = 7 - ((previous ^ value).bit_length() - 1) // 16
+            tail = ":".join([hex4[(value >> (16 * (7 - g))) & 0xFFFF] for g in range(changed, 8)])
+            text = text[:5 * changed] + tail
+            yield text
+    
+    @staticmethod
+    def iter_compressed(start, count, step=1):
+        if count <= 0:
+            return
+        _, hex_short = hex_tables()
+        
+        value = start
+        hextets = [hex_short[(value >> shift) & 0xFFFF] for shift in (112, 96, 80, 64, 48, 32, 16, 0)]
+        for n in range(count):
+            if n:
+                previous = value
+                value += step
+                changed = 7 - ((previous ^ value).bit_length() - 1) // 16
+                for g in range(changed, 8):
+                    hextets[g] = hex_short[(value >> (16 * (7 - g))) & 0xFFFF]
+            if MAPPED_AS_DOTTED and value >> 32 == 0xFFFF:
+                yield str(ipaddress.IPv6Address(value))
+            else:
+                yield AddressFormatter.join_compressed(hextets)
+    
+    @staticmethod
+    def numbered_lines(first_index, first_value, count, step=1, suffix=""):
+        index = first_index
+        for text in AddressFormatter.iter_exploded(first_value, count, step):
+            yield f"{index}. {text}{suffix}\n"
+            index += 1
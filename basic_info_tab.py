@@ -2,23 +2,27 @@ import ipaddress
 import tkinter as tk
 from tkinter import ttk, messagebox
 from utils import UIUtils
+from planner_engine import PlannerEngine
+from result_cache import ResultCache
+from live_recalc import LiveRecalculator
+from instrumentation import Instrumentation
 
 
 class BasicInfoTab:
-    def __init__(self, notebook, root, log_status_func):
-        self.notebook = notebook
+    def __init__(self, parent, root, log_status_func, result_cache, job_manager):
+        self.parent = parent
         self.root = root
         self.log_status = log_status_func
+        self.result_cache = result_cache
+        self.job_manager = job_manager
         self.ipv6_entry1 = None
         self.prefix_entry1 = None
         self.result_text1 = None
+        self.live = None
         self.create_tab()
     
     def create_tab(self):
-        tab1 = ttk.Frame(self.notebook)
-        self.notebook.add(tab1, text="基础子网信息")
-        
-        frame = ttk.Frame(tab1, padding="25")
+        frame = ttk.Frame(self.parent, padding="25")
         frame.pack(fill=tk.BOTH, expand=True)
         
         self.ipv6_entry1 = UIUtils.create_input_row(frame, "IPv6 地址:", "2026:db8::", 0, None, placeholder="例如: 2026:db8::")
@@ -26,36 +30,15 @@ class BasicInfoTab:
         UIUtils.create_button_frame(frame, 2, [("计算", self.calculate_basic_info), ("复制结果", self.copy_basic_info)], 
                                tooltips=["计算基础子网信息", "复制计算结果到剪贴板"])
         self.result_text1 = UIUtils.create_result_display(frame, 3, "result_text1")
+        
+        self.live = LiveRecalculator(self.root, lambda inputs, is_stale: self._compute_basic_info(*inputs),
+                                     self._show_basic_info, self._show_live_error, jobs=self.job_manager)
+        self.live.watch([self.ipv6_entry1, self.prefix_entry1])
     
     def calculate_basic_info(self):
         try:
-            ipv6_str = UIUtils.clean_ipv6_input(self.ipv6_entry1.get())
-            prefix = int(self.prefix_entry1.get().strip())
-            
-            if not 0 <= prefix <= 128:
-                raise ValueError("前缀长度必须在 0-128 之间")
-            
-            network = ipaddress.IPv6Network(f"{ipv6_str}/{prefix}", strict=False)
-            input_address = ipaddress.IPv6Address(ipv6_str)
-            
-            network_address = network.network_address
-            broadcast_address = network.broadcast_address
-            total_addresses = network.num_addresses
-            
-            self.result_text1.delete(1.0, tk.END)
-            self.result_text1.insert(tk.END, "=" * 60 + "\n")
-            self.result_text1.insert(tk.END, "计算\n")
-            self.result_text1.insert(tk.END, "=" * 60 + "\n\n")
-            self.result_text1.insert(tk.END, f"输入地址全写: {input_address.exploded}\n\n")
-            self.result_text1.insert(tk.END, "网络地址: ")
-            self.result_text1.insert(tk.END, f"{network_address.exploded}\n", "network")
-            self.result_text1.insert(tk.END, f"网络范围: {network_address.exploded} - {broadcast_address.exploded}\n\n")
-            self.result_text1.insert(tk.END, f"前缀长度: /{prefix}\n")
-            self.result_text1.insert(tk.END, f"可用地址总数: {total_addresses:,}\n")
-            
-            self.result_text1.tag_config("network", foreground="#0066CC", font=('Arial', 10, 'bold'))
-            
-            self.log_status("计算完成", "success")
+            self.live.cancel()
+            self._show_basic_info(self._compute_basic_info(self.ipv6_entry1.get(), self.prefix_entry1.get()))
             
         except (ipaddress.AddressValueError, ValueError) as e:
             UIUtils.highlight_error(self.ipv6_entry1)
@@ -66,6 +49,45 @@ class BasicInfoTab:
             messagebox.showerror("错误", f"计算失败: {str(e)}")
             self.log_status(f"错误: {str(e)}", "error")
     
+    def _compute_basic_info(self, ipv6_input, prefix_input):
+        with Instrumentation.span("basic_info.compute"):
+            key = ResultCache.make_key("basic_info", ipv6_input, prefix_input)
+            return self.result_cache.get_or_compute(key, lambda: self._basic_info_segments(ipv6_input, prefix_input))
+    
+    def _show_basic_info(self, result):
+        segments, cached = result
+        with Instrumentation.span("basic_info.render"):
+            UIUtils.clear_error_highlight(self.ipv6_entry1)
+            UIUtils.render_segments(self.result_text1, segments)
+            self.result_text1.tag_config("network", foreground="#0066CC", font=('Arial', 10, 'bold'))
+        
+        self.log_status("计算完成（缓存）" if cached else "计算完成", "success")
+    
+    def _show_live_error(self, error_msg):
+        UIUtils.highlight_error(self.ipv6_entry1)
+        self.log_status(f"错误: {error_msg}", "error")
+    
+    def _basic_info_segments(self, ipv6_input, prefix_input):
+        info = PlannerEngine.basic_info(ipv6_input, prefix_input)
+        
+        input_address = info["input_address"]
+        network_address = info["network_address"]
+        broadcast_address = info["broadcast_address"]
+        prefix = info["prefix"]
+        total_addresses = info["total_addresses"]
+        
+        return [
+            ("=" * 60 + "\n",),
+            ("计算\n",),
+            ("=" * 60 + "\n\n",),
+            (f"输入地址全写: {input_address.exploded}\n\n",),
+            ("网络地址: ",),
+            (f"{network_address.exploded}\n", "network"),
+            (f"网络范围: {network_address.exploded} - {broadcast_address.exploded}\n\n",),
+            (f"前缀长度: /{prefix}\n",),
+            (f"可用地址总数: {total_addresses:,}\n",),
+        ]
+    
     def copy_basic_info(self):
         try:
             content = self.result_text1.get(1.0, tk.END)
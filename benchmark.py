@@ -0,0 +1,285 @@
+import argparse
+import ipaddress
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from address_format import AddressFormatter
+from planner_engine import PlannerEngine
+from export_writer import AddressExporter
+from eui64_batch import EUI64Converter
+
+
+DEFAULT_SIZES = [10000, 100000, 1000000]
+QUICK_SIZES = [10000, 100000]
+DEFAULT_THRESHOLD = 0.10
+
+NETWORK = ipaddress.IPv6Network("2026:db8::/64")
+DIVISION_NETWORK = ipaddress.IPv6Network("2026:db8::/32")
+
+
+class PlannerBenchmark:
+    @staticmethod
+    def host_preview(size, work_dir):
+        network_int = int(NETWORK.network_address)
+        PlannerEngine.host_addresses(str(NETWORK.network_address), NETWORK.prefixlen, limit=0)
+        rows = [f"{i + 1}. {AddressFormatter.exploded(network_int + i + 1)}" for i in range(size)]
+        return len(rows), 0
+    
+    @staticmethod
+    def export_hosts_first_n(size, work_dir):
+        file_path = os.path.join(work_dir, "hosts_first_n.txt")
+        total_hosts = PlannerEngine.host_count(NETWORK)
+        done = AddressExporter.export_hosts(file_path, NETWORK, 1, size, total_hosts)
+        return done, os.path.getsize(file_path)
+    
+    @staticmethod
+    def export_hosts_range(size, work_dir):
+        file_path = os.path.join(work_dir, "hosts_range.txt")
+        total_hosts = PlannerEngine.host_count(NETWORK)
+        start_index = 1 << 40
+        done = AddressExporter.export_hosts(file_path, NETWORK, start_index, start_index + size - 1, total_hosts)
+        return done, os.path.getsize(file_path)
+    
+    @staticmethod
+    def export_hosts_sample(size, work_dir):
+        file_path = os.path.join(work_dir, "hosts_sample.txt")
+        total_hosts = PlannerEngine.host_count(NETWORK)
+        done = AddressExporter.export_hosts(file_path, NETWORK, 1, size, total_hosts, sample_seed="benchmark")
+        return done, os.path.getsize(file_path)
+    
+    @staticmethod
+    def export_subnets_csv(size, work_dir):
+        file_path = os.path.join(work_dir, "subnets.csv")
+        done = AddressExporter.export_subnets(file_path, DIVISION_NETWORK, 64, 1, size)
+        return done, os.path.getsize(file_path)
+    
+    @staticmethod
+    def export_subnets_txt(size, work_dir):
+        file_path = os.path.join(work_dir, "subnets.txt")
+        done = AddressExporter.export_subnets(file_path, DIVISION_NETWORK, 64, 1, size)
+        return done, os.path.getsize(file_path)
+    
+    @staticmethod
+    def subnet_division_deep(size, work_dir):
+        result = PlannerEngine.subnet_division(str(DIVISION_NETWORK.network_address), 32, 1 << 32, limit=0)
+        new_prefix = result["new_prefix"]
+        middle = result["max_subnets"] // 2
+        subnets = PlannerEngine.subnet_slice(DIVISION_NETWORK, new_prefix, middle, middle + size - 1)
+        return len(subnets), 0
+    
+    @staticmethod
+    def eui64_single(size, work_dir):
+        rng = random.Random(size)
+        prefix = str(NETWORK)
+        count = min(size, 100000)
+        for _ in range(count):
+            h = f"{rng.getrandbits(48):012x}"
+            PlannerEngine.eui64(f"{h[0:2]}:{h[2:4]}:{h[4:6]}:{h[6:8]}:{h[8:10]}:{h[10:12]}", prefix)
+        return count, 0
+    
+    @staticmethod
+    def eui64_batch(size, work_dir):
+        macs_path = os.path.join(work_dir, f"macs_{size}.txt")
+        if not os.path.exists(macs_path):
+            rng = random.Random(size)
+            with open(macs_path, 'w', encoding='utf-8') as f:
+                for _ in range(size):
+                    f.write(EUI64Converter.mac_text(rng.getrandbits(48)) + "\n")
+        output_path = os.path.join(work_dir, "slaac.csv")
+        stats = EUI64Converter.convert_file(macs_path, [NETWORK], output_path)
+        return stats["addresses"], os.path.getsize(output_path)
+    
+    @staticmethod
+    def plan_store_import(size, work_dir):
+        from plan_store import PlanStore
+        
+        prefixes_path = os.path.join(work_dir, f"prefixes_{size}.txt")
+        if not os.path.exists(prefixes_path):
+            network_int = int(DIVISION_NETWORK.network_address)
+            with open(prefixes_path, 'w', encoding='utf-8') as f:
+                for i in range(size):
+                    f.write(f"{AddressFormatter.compressed(network_int + (i << 64))}/64,owner{i % 100},vlan{i % 4096}\n")
+        db_path = os.path.join(work_dir, "plans.db")
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(db_path + suffix):
+                os.remove(db_path + suffix)
+        with PlanStore(db_path) as store:
+            stats = store.import_file(prefixes_path)
+        return stats["imported"], os.path.getsize(db_path)
+    
+    @staticmethod
+    def conflict_check(size, work_dir):
+        from conflict_checker import ConflictChecker
+        
+        prefixes_path = os.path.join(work_dir, f"conflict_prefixes_{size}.txt")
+        if not os.path.exists(prefixes_path):
+            rng = random.Random(size)
+            network_int = int(DIVISION_NETWORK.network_address)
+            with open(prefixes_path, 'w', encoding='utf-8') as f:
+                for i in range(size):
+                    length = rng.choice((48, 56, 64))
+                    start = network_int | (rng.getrandbits(32) << 64)
+                    f.write(f"{AddressFormatter.compressed(start)}/{length},team{i % 8}\n")
+        output_path = os.path.join(work_dir, "conflicts.csv")
+        stats = ConflictChecker.check_files([prefixes_path], output_path)
+        return stats["prefixes"], os.path.getsize(output_path)
+    
+    @staticmethod
+    def prefix_aggregate(size, work_dir):
+        from prefix_aggregator import PrefixAggregator
+        
+        subnets_path = os.path.join(work_dir, f"aggregate_subnets_{size}.txt")
+        if not os.path.exists(subnets_path):
+            AddressExporter.export_subnets(subnets_path, DIVISION_NETWORK, 64, 1, size)
+        output_path = os.path.join(work_dir, "aggregated.txt")
+        stats = PrefixAggregator.aggregate_file(subnets_path, output_path)
+        return stats["inputs"], os.path.getsize(output_path)
+    
+    @staticmethod
+    def startup_import(size, work_dir):
+        subprocess.run([sys.executable, "-c", "import main"], check=True,
+                       cwd=os.path.dirname(os.path.abspath(__file__)))
+        return 1, 0
+    
+    CASES = [
+        ("host_preview", "地址"),
+        ("export_hosts_first_n", "地址"),
+        ("export_hosts_range", "地址"),
+        ("export_hosts_sample", "地址"),
+        ("export_subnets_csv", "子网"),
+        ("export_subnets_txt", "子网"),
+        ("subnet_division_deep", "子网"),
+        ("eui64_single", "地址"),
+        ("eui64_batch", "地址"),
+        ("plan_store_import", "行"),
+        ("conflict_check", "前缀"),
+        ("prefix_aggregate", "前缀"),
+    ]
+    
+    SINGLE_CASES = [
+        ("startup_import", "次"),
+    ]
+    
+    @staticmethod
+    def measure(case, size, work_dir, repeat):
+        best = None
+        for _ in range(repeat):
+            start_time = time.perf_counter()
+            items, bytes_written = case(size, work_dir)
+            elapsed = time.perf_counter() - start_time
+            if best is None or elapsed < best:
+                best = elapsed
+        
+        tracemalloc.start()
+        try:
+            case(size, work_dir)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        
+        return {
+            "items": items,
+            "seconds": best,
+            "rate": items / best if best > 0 else 0,
+            "peak_memory_bytes": peak,
+            "bytes_written": bytes_written,
+        }
+    
+    @staticmethod
+    def run(sizes, names=None, repeat=1, on_result=None):
+        results = []
+        with tempfile.TemporaryDirectory(prefix="ipv6_bench_") as work_dir:
+            plan = [(name, unit, sizes) for name, unit in PlannerBenchmark.CASES]
+            plan += [(name, unit, [1]) for name, unit in PlannerBenchmark.SINGLE_CASES]
+            for name, unit, case_sizes in plan:
+                if names and name not in names:
+                    continue
+                case = getattr(PlannerBenchmark, name)
+                for size in case_sizes:
+                    result = dict(name=name, size=size, unit=unit,
+                                  **PlannerBenchmark.measure(case, size, work_dir, repeat))
+                    results.append(result)
+                    if on_result:
+                        on_result(result)
+        return {
+            "meta": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "cpu_count": os.cpu_count(),
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "repeat": repeat,
+            },
+            "results": results,
+        }
+    
+    @staticmethod
+    def compare(report, baseline, threshold=DEFAULT_THRESHOLD):
+        baseline_rates = {(r["name"], r["size"]): r["rate"] for r in baseline["results"]}
+        comparisons = []
+        for result in report["results"]:
+            base_rate = baseline_rates.get((result["name"], result["size"]))
+            if not base_rate:
+                continue
+            change = result["rate"] / base_rate - 1
+            comparisons.append({
+                "name": result["name"],
+                "size": result["size"],
+                "baseline_rate": base_rate,
+                "rate": result["rate"],
+                "change": change,
+                "regression": change < -threshold,
+            })
+        return comparisons
+
+
+def format_result(result):
+    return (
+        f"{result['name']:<24} {result['size']:>10,}  {result['rate']:>14,.0f} {result['unit']}/秒  "
+        f"{result['seconds']:>8.3f} 秒  峰值内存 {result['peak_memory_bytes'] / 1024 / 1024:>8.1f} MB  "
+        f"写入 {result['bytes_written'] / 1024 / 1024:>8.1f} MB"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="IPv6 Address Planner 计算与导出性能基准（无需图形界面）")
+    parser.add_argument("--sizes", type=int, nargs="+", help="每个用例的数据规模，默认 10000 100000 1000000")
+    parser.add_argument("--quick", action="store_true", help="只运行较小规模 (10000 100000)")
+    parser.add_argument("--case", action="append", dest="cases", help="只运行指定用例，可重复指定")
+    parser.add_argument("--repeat", type=int, default=3, help="每个用例重复次数，取最快一次，默认 3")
+    parser.add_argument("--output", default="bench_results.json", help="JSON 结果输出路径")
+    parser.add_argument("--baseline", help="与之前的 JSON 结果对比")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="速率下降超过该比例视为性能回退，默认 0.10")
+    args = parser.parse_args(argv)
+    
+    sizes = args.sizes or (QUICK_SIZES if args.quick else DEFAULT_SIZES)
+    report = PlannerBenchmark.run(sizes, args.cases, max(1, args.repeat),
+                                  on_result=lambda result: print(format_result(result), flush=True))
+    
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        comparisons = PlannerBenchmark.compare(report, baseline, args.threshold)
+        report["comparison"] = {"baseline": args.baseline, "threshold": args.threshold, "results": comparisons}
+        print()
+        print(f"与基线对比 ({args.baseline}):")
+        for item in comparisons:
+            marker = "回退" if item["regression"] else "正常"
+            print(f"  {item['name']:<24} {item['size']:>10,}  {item['change']:>+8.1%}  {marker}")
+        if any(item["regression"] for item in comparisons):
+            exit_code = 1
+    
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n结果已写入: {args.output}")
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+import os
+import time
+from export_writer import BufferedExportWriter, open_input, csv_field
+from address_format import AddressFormatter
+
+
+ALL_ONES = (1 << 128) - 1
+CHUNK_LINES = 65536
+
+KIND_DUPLICATE = "duplicate"
+KIND_CONTAINED = "contained"
+
+KIND_LABELS = {
+    KIND_DUPLICATE: "重复",
+    KIND_CONTAINED: "包含",
+}
+
+
+class PrefixTable:
+    def __init__(self):
+        self.starts = []
+        self.lengths = []
+        self.labels = []
+        self.sources = []
+        self.lines = []
+        self.source_names = []
+    
+    def __len__(self):
+        return len(self.starts)
+    
+    def add_source(self, name):
+        self.source_names.append(name)
+        return len(self.source_names) - 1
+    
+    def add(self, start, length, label="", source=0, line=0):
+        self.starts.append(start & (ALL_ONES ^ (ALL_ONES >> length)))
+        self.lengths.append(length)
+        self.labels.append(label)
+        self.sources.append(source)
+        self.lines.append(line)
+    
+    def end(self, index):
+        return self.starts[index] | (ALL_ONES >> self.lengths[index])
+    
+    def prefix_text(self, index):
+        return f"{AddressFormatter.compressed(self.starts[index])}/{self.lengths[index]}"
+    
+    def load_file(self, file_path, should_stop=None, on_progress=None):
+        source = self.add_source(os.path.basename(file_path))
+        parse_line = AddressFormatter.parse_prefix_line
+        skipped = 0
+        with open_input(file_path) as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                try:
+                    parsed = parse_line(line)
+                except ValueError:
+                    parsed = None
+                if parsed is None:
+                    skipped += 1
+                    continue
+                start, length, labels = parsed
+                self.add(start, length, labels[0] if labels else "", source, line_number)
+                
+                if line_number % CHUNK_LINES == 0:
+                    if on_progress:
+                        on_progress(len(self.starts))
+                    if should_stop and should_stop():
+                        break
+        return skipped
+
+
+class ConflictChecker:
+    @staticmethod
+    def sorted_order(table):
+        starts = table.starts
+        lengths = table.lengths
+        keys = [(start << 8) | length for start, length in zip(starts, lengths)]
+        return sorted(range(len(keys)), key=keys.__getitem__)
+    
+    @staticmethod
+    def find_conflicts(table, should_stop=None):
+        starts = table.starts
+        lengths = table.lengths
+        conflicts = []
+        stack = []
+        stack_ends = []
+        max_depth = 0
+        
+        for n, index in enumerate(ConflictChecker.sorted_order(table)):
+            if should_stop and n % CHUNK_LINES == 0 and should_stop():
+                return None, max_depth
+            start = starts[index]
+            while stack_ends and stack_ends[-1] < start:
+                stack.pop()
+                stack_ends.pop()
+            if stack:
+                top = stack[-1]
+                if starts[top] == start and lengths[top] == lengths[index]:
+                    conflicts.append((KIND_DUPLICATE, top, index, len(stack)))
+                    continue
+                conflicts.append((KIND_CONTAINED, top, index, len(stack)))
+            stack.append(index)
+            stack_ends.append(start | (ALL_ONES >> lengths[index]))
+            if len(stack) > max_depth:
+                max_depth = len(stack)
+        return conflicts, max_depth
+    
+    @staticmethod
+    def conflict_lines(table, conflicts):
+        names = [csv_field(name) for name in table.source_names]
+        sources = table.sources
+        lines = table.lines
+        labels = table.labels
+        outer_texts = {}
+        for kind, outer, inner, depth in conflicts:
+            outer_text = outer_texts.get(outer)
+            if outer_text is None:
+                outer_text = f"{table.prefix_text(outer)},{csv_field(labels[outer])},{names[sources[outer]]},{lines[outer]}"
+                outer_texts[outer] = outer_text
+            yield (f"{KIND_LABELS[kind]},{outer_text},{table.prefix_text(inner)},{csv_field(labels[inner])},{names[sources[inner]]},"
+                   f"{lines[inner]},{'是' if sources[outer] == sources[inner] else '否'},{depth}\r\n")
+    
+    @staticmethod
+    def check_files(file_paths, output_path, should_stop=None, on_progress=None):
+        start_time = time.time()
+        table = PrefixTable()
+        skipped = 0
+        for file_path in file_paths:
+            skipped += table.load_file(file_path, should_stop, on_progress)
+            if should_stop and should_stop():
+                return None
+        load_seconds = time.time() - start_time
+        
+        conflicts, max_depth = ConflictChecker.find_conflicts(table, should_stop)
+        if conflicts is None:
+            return None
+        sweep_seconds = time.time() - start_time - load_seconds
+        
+        with BufferedExportWriter(output_path, encoding="utf-8-sig", translate_newlines=False) as writer:
+            writer.write_text("类型,外层前缀,外层标签,外层来源,外层行号,内层前缀,内层标签,内层来源,内层行号,同一来源,嵌套深度\r\n")
+            rows = []
+            for line in ConflictChecker.conflict_lines(table, conflicts):
+                rows.append(line)
+                if len(rows) >= CHUNK_LINES:
+                    writer.write_text("".join(rows))
+                    rows = []
+                    if should_stop and should_stop():
+                        break
+            if rows:
+                writer.write_text("".join(rows))
+        
+        duplicates = sum(1 for conflict in conflicts if conflict[0] == KIND_DUPLICATE)
+        cross_source = sum(1 for _, outer, inner, _ in conflicts if table.sources[outer] != table.sources[inner])
+        elapsed = time.time() - start_time
+        return {
+            "prefixes": len(table),
+            "skipped": skipped,
+            "sources": len(table.source_names),
+            "duplicates": duplicates,
+            "contained": len(conflicts) - duplicates,
+            "cross_source": cross_source,
+            "max_depth": max_depth,
+            "load_seconds": load_seconds,
+            "sweep_seconds": sweep_seconds,
+            "seconds": elapsed,
+            "rate": len(table) / elapsed if elapsed > 0 else 0,
+        }
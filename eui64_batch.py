@@ -0,0 +1,151 @@
+import ipaddress
+import re
+import time
+from address_format import AddressFormatter, hex_tables
+from export_writer import BufferedExportWriter, open_input
+
+
+MAC_SEARCH_PATTERN = re.compile(
+    r'(?<![0-9A-Fa-f])(?:[0-9A-Fa-f]{2}[:-]){5}[0-9A-Fa-f]{2}(?![0-9A-Fa-f])'
+    r'|(?<![0-9A-Fa-f.])[0-9A-Fa-f]{4}\.[0-9A-Fa-f]{4}\.[0-9A-Fa-f]{4}(?![0-9A-Fa-f.])'
+)
+MAC_SEPARATORS = str.maketrans("", "", ":-.")
+
+IID_MASK = (1 << 64) - 1
+UL_BIT = 0x02 << 56
+FFFE = 0xFFFE << 24
+HEX2 = [f"{i:02x}" for i in range(256)]
+
+
+class EUI64Converter:
+    @staticmethod
+    def mac_to_int(mac_input):
+        mac_str = mac_input.strip().translate(MAC_SEPARATORS)
+        if len(mac_str) != 12:
+            raise ValueError("MAC 地址必须是12位十六进制数字 (例如: 001122334455)")
+        return int(mac_str, 16)
+    
+    @staticmethod
+    def mac_text(mac):
+        return (f"{HEX2[mac >> 40]}:{HEX2[(mac >> 32) & 0xFF]}:{HEX2[(mac >> 24) & 0xFF]}:"
+                f"{HEX2[(mac >> 16) & 0xFF]}:{HEX2[(mac >> 8) & 0xFF]}:{HEX2[mac & 0xFF]}")
+    
+    @staticmethod
+    def interface_id(mac):
+        return (((mac >> 24) << 40) | FFFE | (mac & 0xFFFFFF)) ^ UL_BIT
+    
+    @staticmethod
+    def interface_id_text(iid):
+        _, hex_short = hex_tables()
+        return f"{hex_short[iid >> 48]}:{hex_short[(iid >> 32) & 0xFFFF]}:{hex_short[(iid >> 16) & 0xFFFF]}:{hex_short[iid & 0xFFFF]}"
+    
+    @staticmethod
+    def mac_from_interface_id(iid):
+        if (iid >> 24) & 0xFFFF != 0xFFFE:
+            return None
+        iid ^= UL_BIT
+        return ((iid >> 40) << 24) | (iid & 0xFFFFFF)
+    
+    @staticmethod
+    def mac_from_address(address):
+        return EUI64Converter.mac_from_interface_id(int(address) & IID_MASK)
+    
+    @staticmethod
+    def parse_prefixes(prefix_input):
+        prefixes = []
+        for text in prefix_input.replace(",", " ").replace(";", " ").split():
+            network = ipaddress.IPv6Network(text, strict=False)
+            if network.prefixlen != 64:
+                raise ValueError(f"前缀必须是 /64: {text}")
+            if network not in prefixes:
+                prefixes.append(network)
+        if not prefixes:
+            raise ValueError("请至少输入一个 /64 前缀")
+        return prefixes
+    
+    @staticmethod
+    def prefix_head(network):
+        _, hex_short = hex_tables()
+        value = int(network.network_address)
+        hextets = [hex_short[(value >> shift) & 0xFFFF] for shift in (112, 96, 80, 64)]
+        return AddressFormatter.join_compressed(hextets + ["x"] * 4)[:-len("x:x:x:x")]
+    
+    @staticmethod
+    def convert_file(macs_path, prefixes, output_path, index=None, should_stop=None, on_progress=None,
+                     chunk_lines=65536):
+        targets = [(int(network.network_address), EUI64Converter.prefix_head(network), f"{network}")
+                   for network in prefixes]
+        
+        macs = 0
+        duplicates = 0
+        invalid = 0
+        written = 0
+        seen = {} if index is None else index.entries
+        search = MAC_SEARCH_PATTERN.search
+        interface_id = EUI64Converter.interface_id
+        interface_id_text = EUI64Converter.interface_id_text
+        mac_text = EUI64Converter.mac_text
+        start_time = time.time()
+        with open_input(macs_path) as source, \
+                BufferedExportWriter(output_path, encoding="utf-8-sig", translate_newlines=False) as writer:
+            writer.write_text("MAC 地址,网络前缀,接口标识,SLAAC 地址\r\n")
+            rows = []
+            for line_number, line in enumerate(source, 1):
+                match = search(line)
+                if match is None:
+                    if line.strip() and not line.lstrip().startswith("#"):
+                        invalid += 1
+                    continue
+                
+                mac = int(match.group(0).translate(MAC_SEPARATORS), 16)
+                iid = interface_id(mac)
+                if iid in seen:
+                    duplicates += 1
+                    continue
+                seen[iid] = (mac, line_number)
+                macs += 1
+                
+                iid_text = interface_id_text(iid)
+                mac_string = mac_text(mac)
+                for prefix_int, head, network_text in targets:
+                    if iid >> 48:
+                        address_text = head + iid_text
+                    else:
+                        address_text = AddressFormatter.compressed(prefix_int | iid)
+                    rows.append(f"{mac_string},{network_text},{iid_text},{address_text}\r\n")
+                written += len(targets)
+                
+                if len(rows) >= chunk_lines:
+                    writer.write_text("".join(rows))
+                    rows = []
+                    if on_progress:
+                        on_progress(written)
+                    if should_stop and should_stop():
+                        break
+            
+            if rows:
+                writer.write_text("".join(rows))
+        
+        elapsed = time.time() - start_time
+        return {
+            "macs": macs,
+            "duplicates": duplicates,
+            "invalid": invalid,
+            "addresses": written,
+            "seconds": elapsed,
+            "rate": written / elapsed if elapsed > 0 else 0,
+        }
+
+
+class EUI64Index:
+    def __init__(self):
+        self.entries = {}
+    
+    def __len__(self):
+        return len(self.entries)
+    
+    def add(self, mac, line_number=0):
+        self.entries[EUI64Converter.interface_id(mac)] = (mac, line_number)
+    
+    def lookup(self, address):
+        return self.entries.get(int(address) & IID_MASK)
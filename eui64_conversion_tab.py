@@ -1,88 +1,220 @@
 import ipaddress
 import tkinter as tk
 from tkinter import ttk, messagebox
-import re
 from utils import UIUtils
+from planner_engine import PlannerEngine
+from result_cache import ResultCache
+from live_recalc import LiveRecalculator
+from progress_channel import ProgressChannel
+from job_manager import PRIORITY_BATCH
+from instrumentation import Instrumentation
 
 
 class EUI64ConversionTab:
-    def __init__(self, notebook, root, log_status_func):
-        self.notebook = notebook
+    def __init__(self, parent, root, log_status_func, result_cache, job_manager):
+        self.parent = parent
         self.root = root
         self.log_status = log_status_func
+        self.result_cache = result_cache
+        self.job_manager = job_manager
         self.mac_entry = None
         self.prefix_entry = None
+        self.address_entry = None
         self.result_text6 = None
+        self.eui64_index = None
+        self.live = None
         self.create_tab()
     
     def create_tab(self):
-        tab5 = ttk.Frame(self.notebook)
-        self.notebook.add(tab5, text="EUI-64 转换")
-        
-        frame = ttk.Frame(tab5, padding="25")
+        frame = ttk.Frame(self.parent, padding="25")
         frame.pack(fill=tk.BOTH, expand=True)
         
         self.mac_entry = UIUtils.create_input_row(frame, "MAC 地址 (格式: XX:XX:XX:XX:XX:XX):", "00:11:22:33:44:55", 0, None, placeholder="例如: 00:11:22:33:44:55")
         self.prefix_entry = UIUtils.create_input_row(frame, "IPv6 前缀 (格式: 2026:db8::/64):", "2026:db8::/64", 1, None, placeholder="例如: 2026:db8::/64")
-        UIUtils.create_button_frame(frame, 2, [("转换", self.convert_eui64), ("复制结果", self.copy_eui64_result)], 
-                               tooltips=["MAC地址转换为EUI-64", "复制转换结果到剪贴板"])
-        self.result_text6 = UIUtils.create_result_display(frame, 3, "result_text6")
+        self.address_entry = UIUtils.create_input_row(frame, "SLAAC 地址 (反查 MAC):", "2026:db8::211:22ff:fe33:4455", 2, None, placeholder="例如: 2026:db8::211:22ff:fe33:4455")
+        UIUtils.create_button_frame(frame, 3, [
+            ("转换", self.convert_eui64),
+            ("批量转换", self.batch_convert),
+            ("反查 MAC", self.reverse_lookup),
+            ("复制结果", self.copy_eui64_result)
+        ], tooltips=[
+            "MAC地址转换为EUI-64",
+            "读取 MAC 清单文件（DHCP 租约、ARP/CAM 表等），与一个或多个 /64 前缀（用逗号分隔）组合生成 SLAAC 地址并导出 CSV",
+            "由 SLAAC 地址还原 MAC 地址，批量转换后可定位到清单中的行号",
+            "复制转换结果到剪贴板"
+        ])
+        self.result_text6 = UIUtils.create_result_display(frame, 4, "result_text6")
+        
+        self.live = LiveRecalculator(self.root, lambda inputs, is_stale: self._compute_eui64(*inputs),
+                                     self._show_eui64, self._show_live_error, jobs=self.job_manager)
+        self.live.watch([self.mac_entry, self.prefix_entry])
     
     def convert_eui64(self):
         try:
-            mac_input = self.mac_entry.get().strip()
+            self.live.cancel()
+            self._show_eui64(self._compute_eui64(self.mac_entry.get(), self.prefix_entry.get()))
             
-            mac_pattern = re.compile(r'^([0-9A-Fa-f]{2}[:-]){5}[0-9A-Fa-f]{2}$')
-            if not mac_pattern.match(mac_input):
-                raise ValueError("MAC 地址格式无效，请使用 XX:XX:XX:XX:XX:XX 或 XX-XX-XX-XX-XX-XX 格式")
+        except (ValueError, ipaddress.AddressValueError) as e:
+            messagebox.showerror("错误", f"转换失败: {str(e)}")
+            self.log_status(f"错误: {str(e)}", "error")
+        except Exception as e:
+            messagebox.showerror("错误", f"转换失败: {str(e)}")
+            self.log_status(f"错误: {str(e)}", "error")
+    
+    def _compute_eui64(self, mac_input, prefix_input):
+        with Instrumentation.span("eui64.compute"):
+            prefix_address, _, prefix_length = prefix_input.strip().partition("/")
+            key = ResultCache.make_key("eui64", prefix_address, prefix_length, mac_input)
+            return self.result_cache.get_or_compute(key, lambda: self._eui64_segments(mac_input, prefix_input))
+    
+    def _show_eui64(self, result):
+        segments, cached = result
+        with Instrumentation.span("eui64.render"):
+            UIUtils.clear_error_highlight(self.mac_entry)
+            UIUtils.render_segments(self.result_text6, segments)
+        
+        self.log_status("转换完成（缓存）" if cached else "转换完成", "success")
+    
+    def _show_live_error(self, error_msg):
+        UIUtils.highlight_error(self.mac_entry)
+        self.log_status(f"错误: {error_msg}", "error")
+    
+    def _eui64_segments(self, mac_input, prefix_input):
+        result = PlannerEngine.eui64(mac_input, prefix_input)
+        
+        eui64_formatted = result["eui64"]
+        prefix_without_len = result["prefix"]
+        ipv6_full_address = result["address"]
+        
+        return [
+            ("=" * 60 + "\n",),
+            ("EUI-64 转换结果\n",),
+            ("=" * 60 + "\n\n",),
+            (f"原始 MAC 地址: {result['mac']}\n",),
+            (f"转换后的 EUI-64: {eui64_formatted}\n",),
+            (f"完整 IPv6 地址: {ipv6_full_address.exploded}\n",),
+            (f"网络前缀: {prefix_without_len}\n",),
+            ("\n地址结构:\n",),
+            (f"网络前缀: {prefix_without_len}\n",),
+            (f"接口标识: {eui64_formatted}\n",),
+            (f"完整地址: {ipv6_full_address.exploded}\n",),
+        ]
+    
+    def batch_convert(self):
+        try:
+            from tkinter import filedialog
+            from eui64_batch import EUI64Converter, EUI64Index
             
-            mac_str = mac_input.replace(":", "").replace("-", "")
-            if len(mac_str) != 12:
-                raise ValueError("MAC 地址必须是12位十六进制数字 (例如: 001122334455)")
+            prefixes = EUI64Converter.parse_prefixes(self.prefix_entry.get())
             
-            eui64 = mac_str[:6] + "FFFE" + mac_str[6:]
+            macs_path = filedialog.askopenfilename(
+                filetypes=[("MAC 清单", "*.txt *.csv *.log *.gz *.xz *.bz2"), ("所有文件", "*.*")],
+                title="选择 MAC 清单文件（每行包含一个 MAC 地址）"
+            )
+            if not macs_path:
+                return
             
-            mac_bytes = bytes.fromhex(eui64)
-            mac_bytes = bytearray(mac_bytes)
-            mac_bytes[0] = mac_bytes[0] ^ 0x02
-            eui64 = mac_bytes.hex()
+            output_path = filedialog.asksaveasfilename(
+                defaultextension=".csv",
+                filetypes=[("CSV 文件", "*.csv"), ("Gzip 压缩 CSV", "*.csv.gz"), ("所有文件", "*.*")],
+                title="保存 SLAAC 地址"
+            )
+            if not output_path:
+                return
             
-            eui64_formatted = ":".join([eui64[i:i+4] for i in range(0, len(eui64), 4)])
+            if self.job_manager.find_active(output_path) is not None:
+                messagebox.showwarning("警告", "该文件正在写入中，请稍候...")
+                return
             
-            prefix = self.prefix_entry.get().strip()
-            if not prefix.endswith("/64"):
-                raise ValueError("前缀必须包含 /64 例如: 2026:db8::/64")
+            index = EUI64Index()
+            channel = ProgressChannel(self.root, lambda written: self.log_status(f"已生成 {written:,} 个 SLAAC 地址...")).start()
             
-            prefix_without_len = prefix.split("/")[0]
+            def batch_job(job):
+                try:
+                    def on_progress(written):
+                        job.report(written)
+                        channel.post(written)
+                    
+                    with Instrumentation.span("eui64.batch"):
+                        stats = EUI64Converter.convert_file(macs_path, prefixes, output_path, index=index,
+                                                            should_stop=job.token, on_progress=on_progress)
+                    if job.token.is_cancelled():
+                        channel.call(lambda: self.log_status(f"批量转换已取消，已写入 {stats['addresses']:,} 个地址", "warning"))
+                    else:
+                        channel.call(lambda: self._display_batch_result(stats, prefixes, index, output_path))
+                except Exception as e:
+                    error_msg = str(e)
+                    channel.call(lambda: messagebox.showerror("错误", f"批量转换失败: {error_msg}"))
+                    channel.call(lambda: self.log_status(f"批量转换失败: {error_msg}", "error"))
+                    raise
+                finally:
+                    channel.close()
             
-            if prefix_without_len.endswith("::"):
-                ipv6_address = prefix_without_len + eui64_formatted
-            else:
-                ipv6_address = prefix_without_len + "::" + eui64_formatted
+            try:
+                self.job_manager.submit("批量 EUI-64 转换", batch_job, PRIORITY_BATCH, unit="地址", key=output_path)
+            except Exception:
+                channel.close()
+                raise
+            self.log_status("正在批量转换...")
             
-            ipv6_full_address = ipaddress.IPv6Address(ipv6_address)
+        except (ValueError, ipaddress.AddressValueError) as e:
+            messagebox.showerror("错误", f"批量转换失败: {str(e)}")
+            self.log_status(f"错误: {str(e)}", "error")
+        except Exception as e:
+            messagebox.showerror("错误", f"批量转换失败: {str(e)}")
+            self.log_status(f"错误: {str(e)}", "error")
+    
+    def _display_batch_result(self, stats, prefixes, index, output_path):
+        self.eui64_index = index
+        
+        self.result_text6.delete(1.0, tk.END)
+        self.result_text6.insert(tk.END, "=" * 60 + "\n")
+        self.result_text6.insert(tk.END, "EUI-64 批量转换结果\n")
+        self.result_text6.insert(tk.END, "=" * 60 + "\n\n")
+        self.result_text6.insert(tk.END, f"网络前缀: {', '.join(str(p) for p in prefixes)}\n")
+        self.result_text6.insert(tk.END, f"MAC 地址数量: {stats['macs']:,}\n")
+        self.result_text6.insert(tk.END, f"重复 MAC: {stats['duplicates']:,}\n")
+        self.result_text6.insert(tk.END, f"无法识别的行: {stats['invalid']:,}\n")
+        self.result_text6.insert(tk.END, f"生成 SLAAC 地址: {stats['addresses']:,}\n")
+        self.result_text6.insert(tk.END, f"耗时: {stats['seconds']:.2f} 秒\n")
+        self.result_text6.insert(tk.END, f"速率: {stats['rate']:,.0f} 地址/秒\n\n")
+        self.result_text6.insert(tk.END, f"结果文件: {output_path}\n")
+        self.result_text6.insert(tk.END, "已建立反查索引，可使用“反查 MAC”定位清单行号\n")
+        
+        self.log_status(f"批量转换完成: {output_path}", "success")
+    
+    def reverse_lookup(self):
+        try:
+            from eui64_batch import EUI64Converter
+            
+            address_text = UIUtils.clean_ipv6_input(self.address_entry.get())
+            address = ipaddress.IPv6Address(address_text)
+            
+            mac = EUI64Converter.mac_from_address(address)
+            if mac is None:
+                raise ValueError("该地址的接口标识不是由 MAC 生成的 EUI-64 格式 (缺少 ff:fe)")
+            
+            entry = self.eui64_index.lookup(address) if self.eui64_index else None
             
             self.result_text6.delete(1.0, tk.END)
             self.result_text6.insert(tk.END, "=" * 60 + "\n")
-            self.result_text6.insert(tk.END, "EUI-64 转换结果\n")
+            self.result_text6.insert(tk.END, "SLAAC 地址反查结果\n")
             self.result_text6.insert(tk.END, "=" * 60 + "\n\n")
-            self.result_text6.insert(tk.END, f"原始 MAC 地址: {self.mac_entry.get()}\n")
-            self.result_text6.insert(tk.END, f"转换后的 EUI-64: {eui64_formatted}\n")
-            self.result_text6.insert(tk.END, f"完整 IPv6 地址: {ipv6_full_address.exploded}\n")
-            self.result_text6.insert(tk.END, f"网络前缀: {prefix_without_len}\n")
-            
-            self.result_text6.insert(tk.END, "\n地址结构:\n")
-            self.result_text6.insert(tk.END, f"网络前缀: {prefix_without_len}\n")
-            self.result_text6.insert(tk.END, f"接口标识: {eui64_formatted}\n")
-            self.result_text6.insert(tk.END, f"完整地址: {ipv6_full_address.exploded}\n")
+            self.result_text6.insert(tk.END, f"SLAAC 地址: {address}\n")
+            self.result_text6.insert(tk.END, f"接口标识: {address.exploded[20:]}\n")
+            self.result_text6.insert(tk.END, f"MAC 地址: {EUI64Converter.mac_text(mac)}\n")
+            if entry is not None:
+                self.result_text6.insert(tk.END, f"清单位置: 第 {entry[1]:,} 行\n")
+            elif self.eui64_index is not None:
+                self.result_text6.insert(tk.END, "清单位置: 不在最近一次批量转换的 MAC 清单中\n")
             
-            self.log_status("转换完成", "success")
+            self.log_status("反查完成", "success")
             
         except (ValueError, ipaddress.AddressValueError) as e:
-            messagebox.showerror("错误", f"转换失败: {str(e)}")
+            messagebox.showerror("错误", f"反查失败: {str(e)}")
             self.log_status(f"错误: {str(e)}", "error")
         except Exception as e:
-            messagebox.showerror("错误", f"转换失败: {str(e)}")
+            messagebox.showerror("错误", f"反查失败: {str(e)}")
             self.log_status(f"错误: {str(e)}", "error")
     
     def copy_eui64_result(self):
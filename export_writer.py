@@ -0,0 +1,403 @@
+import bz2
+import codecs
+import gzip
+import json
+import lzma
+import os
+import queue
+import threading
+import time
+from itertools import islice
+from address_format import AddressFormatter
+from instrumentation import Instrumentation
+
+
+CHUNK_LINES = 65536
+
+CHECKPOINT_SUFFIX = ".checkpoint.json"
+CHECKPOINT_INTERVAL = 5.0
+
+COMPRESSION_SUFFIXES = {
+    ".gz": "gzip",
+    ".xz": "xz",
+    ".bz2": "bz2",
+}
+
+
+def split_compression(file_path):
+    for suffix, compression in COMPRESSION_SUFFIXES.items():
+        if file_path.lower().endswith(suffix):
+            return file_path[:-len(suffix)], compression
+    return file_path, None
+
+
+def open_output(file_path, compression=None, append=False):
+    mode = "ab" if append else "wb"
+    if compression == "gzip":
+        return gzip.open(file_path, mode, compresslevel=6)
+    if compression == "xz":
+        return lzma.open(file_path, mode, preset=1)
+    if compression == "bz2":
+        return bz2.open(file_path, mode)
+    return open(file_path, mode)
+
+
+def open_input(file_path):
+    compression = split_compression(file_path)[1]
+    if compression == "gzip":
+        return gzip.open(file_path, "rt", encoding="utf-8-sig", errors="replace")
+    if compression == "xz":
+        return lzma.open(file_path, "rt", encoding="utf-8-sig", errors="replace")
+    if compression == "bz2":
+        return bz2.open(file_path, "rt", encoding="utf-8-sig", errors="replace")
+    return open(file_path, 'r', encoding='utf-8-sig', errors='replace')
+
+
+def csv_field(text):
+    if any(char in text for char in ',"\r\n'):
+        return '"' + text.replace('"', '""') + '"'
+    return text
+
+
+def compress_bytes(data, compression=None):
+    if compression == "gzip":
+        return gzip.compress(data, compresslevel=6)
+    if compression == "xz":
+        return lzma.compress(data, preset=1)
+    if compression == "bz2":
+        return bz2.compress(data)
+    return data
+
+
+class BufferedExportWriter:
+    def __init__(self, file_path, encoding="utf-8", translate_newlines=True, max_pending=2, compression="auto",
+                 resume_offset=None):
+        if compression == "auto":
+            compression = split_compression(file_path)[1]
+        self.file_path = file_path
+        self.compression = compression
+        self.encoding = "utf-8" if encoding == "utf-8-sig" else encoding
+        self.linesep = os.linesep if translate_newlines else "\n"
+        self.bytes_written = 0
+        self.error = None
+        if resume_offset is not None:
+            with open(file_path, 'r+b') as f:
+                f.truncate(resume_offset)
+            self.committed_offset = resume_offset
+            self._file = open_output(file_path, compression, append=True)
+        else:
+            self.committed_offset = 0
+            self._file = open_output(file_path, compression)
+            if encoding == "utf-8-sig":
+                self._file.write(codecs.BOM_UTF8)
+                self.bytes_written += len(codecs.BOM_UTF8)
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._thread = threading.Thread(target=self._write_loop, daemon=True)
+        self._thread.start()
+    
+    def _write_loop(self):
+        while True:
+            data = self._queue.get()
+            if data is None:
+                break
+            if isinstance(data, threading.Event):
+                if self.error is None:
+                    try:
+                        with Instrumentation.span("export.commit"):
+                            self._commit()
+                    except Exception as e:
+                        self.error = e
+                data.set()
+                continue
+            if self.error is not None:
+                continue
+            try:
+                with Instrumentation.span("export.write"):
+                    self._file.write(data)
+                self.bytes_written += len(data)
+            except Exception as e:
+                self.error = e
+    
+    def _commit(self):
+        if self.compression:
+            self._file.close()
+            self._file = open_output(self.file_path, self.compression, append=True)
+        else:
+            self._file.flush()
+        self.committed_offset = os.path.getsize(self.file_path)
+    
+    def commit(self):
+        marker = threading.Event()
+        self._queue.put(marker)
+        marker.wait()
+        if self.error is not None:
+            raise self.error
+        return self.committed_offset
+    
+    def write_text(self, text):
+        if self.error is not None:
+            raise self.error
+        if self.linesep != "\n":
+            text = text.replace("\n", self.linesep)
+        self._queue.put(text.encode(self.encoding))
+    
+    def write_bytes(self, data):
+        if self.error is not None:
+            raise self.error
+        self._queue.put(data)
+    
+    def close(self):
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+        self._file.close()
+        if self.error is not None:
+            raise self.error
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+class ExportCheckpoint:
+    def __init__(self, file_path, state, interval=CHECKPOINT_INTERVAL):
+        self.file_path = file_path
+        self.path = ExportCheckpoint.sidecar_path(file_path)
+        self.state = dict(state, compression=split_compression(file_path)[1])
+        self.interval = interval
+        self.last_save = time.time()
+    
+    @staticmethod
+    def sidecar_path(file_path):
+        return file_path + CHECKPOINT_SUFFIX
+    
+    @staticmethod
+    def load(file_path):
+        path = ExportCheckpoint.sidecar_path(file_path)
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        if not os.path.exists(file_path) or os.path.getsize(file_path) < state["byte_offset"]:
+            raise ValueError("导出文件比断点记录的长度短，文件可能已被修改，无法继续导出")
+        return state
+    
+    def save(self, next_index, byte_offset):
+        self.state["next_index"] = next_index
+        self.state["byte_offset"] = byte_offset
+        temp_path = self.path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, self.path)
+        self.last_save = time.time()
+    
+    def maybe_commit(self, writer, next_index):
+        if time.time() - self.last_save >= self.interval:
+            self.save(next_index, writer.commit())
+    
+    def remove(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class AddressExporter:
+    @staticmethod
+    def pump_lines(writer, lines, total, should_stop=None, on_progress=None, chunk_lines=CHUNK_LINES):
+        done = 0
+        while done < total:
+            if should_stop and should_stop():
+                break
+            size = min(chunk_lines, total - done)
+            with Instrumentation.span("export.format"):
+                chunk = list(islice(lines, size))
+            if not chunk:
+                break
+            with Instrumentation.span("export.queue"):
+                writer.write_text("".join(chunk))
+            done += len(chunk)
+            if on_progress:
+                with Instrumentation.span("export.progress"):
+                    on_progress(done)
+        return done
+    
+    @staticmethod
+    def pump_blocks(writer, blocks, total, should_stop=None, on_progress=None):
+        done = 0
+        while done < total:
+            if should_stop and should_stop():
+                break
+            with Instrumentation.span("export.format"):
+                block = next(blocks, None)
+            if block is None:
+                break
+            size, data = block
+            with Instrumentation.span("export.queue"):
+                writer.write_bytes(data)
+            done += size
+            if on_progress:
+                with Instrumentation.span("export.progress"):
+                    on_progress(done)
+        return done
+    
+    @staticmethod
+    def checkpointed_progress(writer, checkpoint, first_index, already, on_progress):
+        def progress(done):
+            checkpoint.maybe_commit(writer, first_index + done)
+            if on_progress:
+                on_progress(already + done)
+        return progress
+    
+    @staticmethod
+    def host_header(network, start_index, end_index, total_hosts, sample_seed=None):
+        count = end_index - start_index + 1
+        if sample_seed is None:
+            selection = f"导出范围: 第 {start_index:,} 个到第 {end_index:,} 个\n"
+        else:
+            selection = f"随机抽样: 不重复地址，种子 {sample_seed}\n"
+        return (
+            f"网络: {network.exploded}\n"
+            f"可用主机总数: {total_hosts:,}\n"
+            + selection +
+            f"导出数量: {count:,}\n"
+            + "=" * 60 + "\n\n"
+        )
+    
+    @staticmethod
+    def export_hosts(file_path, network, start_index, end_index, total_hosts, should_stop=None, on_progress=None,
+                     resume_from=None, sample_seed=None):
+        prefix = network.prefixlen
+        if sample_seed is not None and not 1 <= start_index <= end_index <= total_hosts:
+            raise ValueError(f"抽样数量必须在 1 到 {total_hosts:,} 之间")
+        
+        if prefix >= 127:
+            with BufferedExportWriter(file_path) as writer:
+                writer.write_text(AddressExporter.host_header(network, start_index, end_index, total_hosts, sample_seed))
+                if prefix == 127:
+                    writer.write_text(
+                        f"1. {(network.network_address + 1).exploded}\n"
+                        f"2. {(network.network_address + 2).exploded}\n"
+                    )
+                    return 2
+                writer.write_text(f"{network.network_address.exploded}\n")
+                return 1
+        
+        checkpoint = ExportCheckpoint(file_path, {
+            "kind": "hosts",
+            "network": str(network),
+            "start_index": start_index,
+            "end_index": end_index,
+            "total_hosts": total_hosts,
+            "sample_seed": sample_seed,
+            "format": "txt",
+        })
+        first_index = start_index if resume_from is None else resume_from["next_index"]
+        count = end_index - first_index + 1
+        already = first_index - start_index
+        
+        resume_offset = None if resume_from is None else resume_from["byte_offset"]
+        with BufferedExportWriter(file_path, resume_offset=resume_offset) as writer:
+            if resume_from is None:
+                checkpoint.remove()
+                writer.write_text(AddressExporter.host_header(network, start_index, end_index, total_hosts, sample_seed))
+            
+            network_int = int(network.network_address)
+            progress = AddressExporter.checkpointed_progress(writer, checkpoint, first_index, already, on_progress)
+            if sample_seed is None:
+                lines = AddressFormatter.numbered_lines(first_index, network_int + first_index, count)
+                done = AddressExporter.pump_lines(writer, lines, count, should_stop, progress)
+            else:
+                from host_sampler import HostSampler
+                blocks = HostSampler.numbered_blocks(network_int, total_hosts, sample_seed, first_index, count,
+                                                     writer.linesep, CHUNK_LINES)
+                done = AddressExporter.pump_blocks(writer, blocks, count, should_stop, progress)
+            if done < count:
+                checkpoint.save(first_index + done, writer.commit())
+        
+        if done == count:
+            checkpoint.remove()
+        return already + done
+    
+    @staticmethod
+    def allocation_lines(plan, is_csv):
+        index = 1
+        for label, prefix, start, count in plan.runs:
+            step = 1 << (128 - prefix)
+            if is_csv:
+                if '"' in label:
+                    label = '"' + label.replace('"', '""') + '"'
+                network_texts = AddressFormatter.iter_compressed(start, count, step)
+                broadcast_texts = AddressFormatter.iter_compressed(start + step - 1, count, step)
+                for i, (network_text, broadcast_text) in enumerate(zip(network_texts, broadcast_texts), index):
+                    yield f"{i},{label},{network_text},{prefix},{broadcast_text},{network_text}/{prefix}\r\n"
+            else:
+                suffix = f"/{prefix}  {label}" if label else f"/{prefix}"
+                yield from AddressFormatter.numbered_lines(index, start, count, step, suffix=suffix)
+            index += count
+    
+    @staticmethod
+    def export_allocations(file_path, plan, should_stop=None, on_progress=None):
+        is_csv = split_compression(file_path)[0].endswith('.csv')
+        if is_csv:
+            writer = BufferedExportWriter(file_path, encoding="utf-8-sig", translate_newlines=False)
+        else:
+            writer = BufferedExportWriter(file_path)
+        
+        with writer:
+            if is_csv:
+                writer.write_text("序号,标签,网络地址,前缀长度,子网结束地址,完整表示\r\n")
+            lines = AddressExporter.allocation_lines(plan, is_csv)
+            return AddressExporter.pump_lines(writer, lines, plan.total, should_stop, on_progress)
+    
+    @staticmethod
+    def export_subnets(file_path, network, new_prefix, start_index, end_index, should_stop=None, on_progress=None,
+                       resume_from=None):
+        is_csv = split_compression(file_path)[0].endswith('.csv')
+        checkpoint = ExportCheckpoint(file_path, {
+            "kind": "subnets",
+            "network": str(network),
+            "new_prefix": new_prefix,
+            "start_index": start_index,
+            "end_index": end_index,
+            "format": "csv" if is_csv else "txt",
+        })
+        first_index = start_index if resume_from is None else resume_from["next_index"]
+        count = end_index - first_index + 1
+        already = first_index - start_index
+        
+        step = 1 << (128 - new_prefix)
+        network_int = int(network.network_address) + (first_index - 1) * step
+        
+        resume_offset = None if resume_from is None else resume_from["byte_offset"]
+        if is_csv:
+            writer = BufferedExportWriter(file_path, encoding="utf-8-sig", translate_newlines=False,
+                                          resume_offset=resume_offset)
+        else:
+            writer = BufferedExportWriter(file_path, resume_offset=resume_offset)
+        
+        with writer:
+            if resume_from is None:
+                checkpoint.remove()
+                if is_csv:
+                    writer.write_text("序号,网络地址,前缀长度,子网结束地址,完整表示\r\n")
+            
+            if is_csv:
+                network_texts = AddressFormatter.iter_compressed(network_int, count, step)
+                broadcast_texts = AddressFormatter.iter_compressed(network_int + step - 1, count, step)
+                lines = (
+                    f"{i},{network_text},{new_prefix},{broadcast_text},{network_text}/{new_prefix}\r\n"
+                    for i, (network_text, broadcast_text) in enumerate(zip(network_texts, broadcast_texts), first_index)
+                )
+            else:
+                lines = AddressFormatter.numbered_lines(first_index, network_int, count, step, suffix=f"/{new_prefix}")
+            
+            progress = AddressExporter.checkpointed_progress(writer, checkpoint, first_index, already, on_progress)
+            done = AddressExporter.pump_lines(writer, lines, count, should_stop, progress)
+            if done < count:
+                checkpoint.save(first_index + done, writer.commit())
+        
+        if done == count:
+            checkpoint.remove()
+        return already + done
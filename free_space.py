@@ -0,0 +1,135 @@
+import bisect
+from address_format import AddressFormatter
+from prefix_aggregator import PrefixAggregator
+
+
+ALL_ONES = (1 << 128) - 1
+NO_FIT = 129
+
+
+def split_point(start, end):
+    if start == 0:
+        return 0
+    shift = ((start - 1) ^ end).bit_length() - 1
+    return (end >> shift) << shift
+
+
+def gap_shape(start, end):
+    middle = split_point(start, end)
+    left = middle - start
+    right = end + 1 - middle
+    largest = max(left, right)
+    blocks = bin(left).count("1") + bin(right).count("1")
+    return 129 - largest.bit_length(), blocks
+
+
+class FreeSpaceIndex:
+    def __init__(self, parent_start, parent_prefixlen, keys):
+        mask = ALL_ONES ^ (ALL_ONES >> parent_prefixlen)
+        self.parent_start = parent_start & mask
+        self.parent_prefixlen = parent_prefixlen
+        self.parent_end = self.parent_start | (ALL_ONES >> parent_prefixlen)
+        self.allocated_count = 0
+        self.allocated_addresses = 0
+        
+        self.gap_starts = []
+        self.gap_ends = []
+        position = self.parent_start
+        for start, end in PrefixAggregator.merged_ranges(keys):
+            if end < self.parent_start or start > self.parent_end:
+                continue
+            start = max(start, self.parent_start)
+            end = min(end, self.parent_end)
+            self.allocated_count += 1
+            self.allocated_addresses += end - start + 1
+            if start > position:
+                self.gap_starts.append(position)
+                self.gap_ends.append(start - 1)
+            position = end + 1
+        if position <= self.parent_end:
+            self.gap_starts.append(position)
+            self.gap_ends.append(self.parent_end)
+        
+        self.best = []
+        self.block_offsets = []
+        total = 0
+        for start, end in zip(self.gap_starts, self.gap_ends):
+            best, blocks = gap_shape(start, end)
+            self.best.append(best)
+            self.block_offsets.append(total)
+            total += blocks
+        self.block_count = total
+        
+        self.leaves = 1
+        while self.leaves < len(self.best):
+            self.leaves <<= 1
+        self.tree = [NO_FIT] * (2 * self.leaves)
+        self.tree[self.leaves:self.leaves + len(self.best)] = self.best
+        for node in range(self.leaves - 1, 0, -1):
+            self.tree[node] = min(self.tree[2 * node], self.tree[2 * node + 1])
+    
+    @classmethod
+    def from_file(cls, parent_start, parent_prefixlen, file_path, should_stop=None, on_progress=None):
+        keys, skipped = PrefixAggregator.read_keys(file_path, should_stop, on_progress)
+        return cls(parent_start, parent_prefixlen, keys), len(keys), skipped
+    
+    @property
+    def free_addresses(self):
+        return (self.parent_end - self.parent_start + 1) - self.allocated_addresses
+    
+    def largest_free_block(self):
+        if not self.best:
+            return None
+        prefixlen = self.tree[1]
+        return self.next_free(prefixlen), prefixlen
+    
+    def _first_fit(self, first, prefixlen):
+        if first >= len(self.best):
+            return -1
+        tree = self.tree
+        node = first + self.leaves
+        while tree[node] > prefixlen:
+            while node & 1:
+                node >>= 1
+            if node == 0:
+                return -1
+            node += 1
+        while node < self.leaves:
+            node = 2 * node if tree[2 * node] <= prefixlen else 2 * node + 1
+        return node - self.leaves
+    
+    def next_free(self, prefixlen, after=None):
+        if not self.parent_prefixlen <= prefixlen <= 128:
+            raise ValueError(f"前缀长度必须在 /{self.parent_prefixlen} 到 /128 之间")
+        size = 1 << (128 - prefixlen)
+        after = self.parent_start if after is None else max(after, self.parent_start)
+        
+        index = bisect.bisect_right(self.gap_starts, after) - 1
+        if index >= 0 and self.gap_ends[index] >= after:
+            candidate = -(-after // size) * size
+            if candidate + size - 1 <= self.gap_ends[index]:
+                return candidate
+        index = self._first_fit(index + 1, prefixlen)
+        if index < 0:
+            return None
+        return -(-self.gap_starts[index] // size) * size
+    
+    def is_free(self, start, prefixlen):
+        end = start | (ALL_ONES >> prefixlen)
+        index = bisect.bisect_right(self.gap_starts, start) - 1
+        return index >= 0 and end <= self.gap_ends[index]
+    
+    def free_blocks(self):
+        for start, end in zip(self.gap_starts, self.gap_ends):
+            yield from PrefixAggregator.range_blocks(start, end)
+    
+    def block(self, index):
+        gap = bisect.bisect_right(self.block_offsets, index) - 1
+        blocks = PrefixAggregator.range_blocks(self.gap_starts[gap], self.gap_ends[gap])
+        for _ in range(index - self.block_offsets[gap]):
+            next(blocks)
+        return next(blocks)
+    
+    def block_text(self, index):
+        start, prefixlen = self.block(index)
+        return f"{index + 1}. {AddressFormatter.compressed(start)}/{prefixlen}"
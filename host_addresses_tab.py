@@ -1,32 +1,35 @@
 import ipaddress
 import tkinter as tk
-from tkinter import ttk, messagebox, filedialog
-import threading
+from tkinter import ttk, messagebox
 import time
 from utils import UIUtils
+from virtual_list import VirtualListView
+from address_format import AddressFormatter
+from planner_engine import PlannerEngine
+from result_cache import ResultCache
+from live_recalc import LiveRecalculator
+from progress_channel import ProgressChannel
+from job_manager import PRIORITY_EXPORT
+from instrumentation import Instrumentation
 
 
 class HostAddressesTab:
-    def __init__(self, notebook, root, log_status_func, stop_flag_lock):
-        self.notebook = notebook
+    def __init__(self, parent, root, log_status_func, result_cache, job_manager):
+        self.parent = parent
         self.root = root
         self.log_status = log_status_func
-        self.stop_flag_lock = stop_flag_lock
+        self.result_cache = result_cache
+        self.job_manager = job_manager
         self.ipv6_entry3 = None
         self.prefix_entry3 = None
         self.result_text3 = None
+        self.host_list = None
         self.current_network = None
-        self.is_calculating = False
-        self.is_exporting = False
-        self.calculate_lock = threading.Lock()
-        self.export_lock = threading.Lock()
+        self.live = None
         self.create_tab()
     
     def create_tab(self):
-        tab3 = ttk.Frame(self.notebook)
-        self.notebook.add(tab3, text="可用主机地址")
-        
-        frame = ttk.Frame(tab3, padding="25")
+        frame = ttk.Frame(self.parent, padding="25")
         frame.pack(fill=tk.BOTH, expand=True)
         
         self.ipv6_entry3 = UIUtils.create_input_row(frame, "IPv6 地址:", "2026:db8::", 0, None, placeholder="例如: 2026:db8::")
@@ -34,144 +37,100 @@ class HostAddressesTab:
         UIUtils.create_button_frame(frame, 2, [
             ("计算地址", self.generate_host_addresses),
             ("复制结果", self.copy_hosts),
-            ("导出地址", self.export_hosts_dialog)
-        ], tooltips=["生成可用主机地址", "复制地址列表到剪贴板", "导出地址到文件"])
-        self.result_text3 = UIUtils.create_result_display(frame, 3, "result_text3")
-    
-    def _set_stop_flag(self, flag_name, value):
-        with self.stop_flag_lock:
-            setattr(self, flag_name, value)
-    
-    def _get_stop_flag(self, flag_name):
-        with self.stop_flag_lock:
-            return getattr(self, flag_name)
+            ("导出地址", self.export_hosts_dialog),
+            ("继续导出", self.resume_export)
+        ], tooltips=["生成可用主机地址", "复制地址列表到剪贴板", "导出地址到文件", "从断点继续中断的导出"])
+        self.result_text3 = UIUtils.create_result_display(frame, 3, "result_text3", height=8)
+        self.host_list = VirtualListView(frame, height=12)
+        self.host_list.grid(row=4, column=0, columnspan=3, sticky=tk.NSEW)
+        
+        self.live = LiveRecalculator(self.root, self._compute_hosts, self._show_hosts, self._show_live_error,
+                                     jobs=self.job_manager)
+        self.live.watch([self.ipv6_entry3, self.prefix_entry3])
     
     def generate_host_addresses(self):
-        try:
-            if self.is_calculating:
-                self.log_status("正在计算中，请稍候...", "info")
-                return
-            
-            ipv6_str = UIUtils.clean_ipv6_input(self.ipv6_entry3.get())
-            prefix = int(self.prefix_entry3.get().strip())
-            
-            if not 0 <= prefix <= 128:
-                raise ValueError("前缀长度必须在 0-128 之间")
-            
-            def generate_thread():
-                try:
-                    self._set_stop_flag("stop_generate", False)
-                    with self.calculate_lock:
-                        self.is_calculating = True
-                        try:
-                            network = ipaddress.IPv6Network(f"{ipv6_str}/{prefix}", strict=False)
-                            self.current_network = network
-                            
-                            total_hosts = network.num_addresses - 2 if network.num_addresses > 2 else 0
-                            
-                            if prefix == 127:
-                                total_hosts = 2
-                            elif prefix == 128:
-                                total_hosts = 1
-                            
-                            first_100_hosts = []
-                            
-                            if prefix == 127:
-                                first_100_hosts = [
-                                    network.network_address + 1,
-                                    network.network_address + 2
-                                ]
-                            elif prefix == 128:
-                                first_100_hosts = [network.network_address]
-                            else:
-                                hosts_iterator = network.hosts()
-                                for i, host in enumerate(hosts_iterator):
-                                    if self._get_stop_flag("stop_generate"):
-                                        break
-                                    if i < 100:
-                                        first_100_hosts.append(host)
-                                    else:
-                                        break
-                            
-                            if not self._get_stop_flag("stop_generate"):
-                                self.root.after(0, lambda: self._display_hosts(network, total_hosts, first_100_hosts, prefix))
-                            else:
-                                self.root.after(0, lambda: self.log_status("已停止生成", "info"))
-                        finally:
-                            self.is_calculating = False
-                            
-                except Exception as e:
-                    self.root.after(0, lambda: self._show_error(f"输入无效: {str(e)}"))
-                    self.is_calculating = False
-            
-            self.log_status("正在生成地址...")
-            thread = threading.Thread(target=generate_thread, daemon=True)
-            thread.start()
-            
-        except (ipaddress.AddressValueError, ValueError) as e:
-            UIUtils.highlight_error(self.ipv6_entry3)
-            messagebox.showerror("错误", f"输入无效: {str(e)}")
-            self.log_status(f"错误: {str(e)}", "error")
-        except Exception as e:
-            UIUtils.highlight_error(self.ipv6_entry3)
-            messagebox.showerror("错误", f"计算失败: {str(e)}")
-            self.log_status(f"错误: {str(e)}", "error")
+        self.log_status("正在生成地址...")
+        self.live.run_now(on_error=lambda error_msg: self._show_error(f"输入无效: {error_msg}"))
     
-    def _display_hosts(self, network, total_hosts, hosts_list, prefix):
-        self.result_text3.delete(1.0, tk.END)
-        self.result_text3.insert(tk.END, "=" * 60 + "\n")
-        self.result_text3.insert(tk.END, "可用主机地址\n")
-        self.result_text3.insert(tk.END, "=" * 60 + "\n\n")
-        self.result_text3.insert(tk.END, f"网络: {network.exploded}\n")
-        self.result_text3.insert(tk.END, f"可用主机总数: {total_hosts:,}\n\n")
+    def _compute_hosts(self, inputs, is_stale):
+        ipv6_input, prefix_input = inputs
+        ipv6_str = UIUtils.clean_ipv6_input(ipv6_input)
+        prefix = PlannerEngine.parse_prefix(prefix_input)
+        key = ResultCache.make_key("host_addresses", ipv6_str, prefix)
         
-        if prefix == 127:
-            self.result_text3.insert(tk.END, "RFC 6164 说明: /127 网络用于点对点链路，两个有效地址为:\n")
-            self.result_text3.insert(tk.END, f"  1. ")
-            self.result_text3.insert(tk.END, f"{(network.network_address + 1).exploded}\n", "host")
-            self.result_text3.insert(tk.END, f"  2. ")
-            self.result_text3.insert(tk.END, f"{(network.network_address + 2).exploded}\n\n", "host")
-        elif prefix == 128:
-            self.result_text3.insert(tk.END, "RFC 4291 说明: /128 网络表示单个主机地址\n\n")
+        cached = self.result_cache.get(key)
+        if cached is not None:
+            network, total_hosts, segments = cached
+            return network, total_hosts, prefix, segments, True
+        
+        with Instrumentation.span("hosts.compute"):
+            result = PlannerEngine.host_addresses(ipv6_str, prefix, limit=0, stop_check=is_stale)
+            if result is None or is_stale():
+                return None
+            
+            network = result["network"]
+            total_hosts = result["total_hosts"]
+            segments = self._host_segments(network, total_hosts, prefix)
+        self.result_cache.put(key, (network, total_hosts, segments))
+        return network, total_hosts, prefix, segments, False
+    
+    def _host_segments(self, network, total_hosts, prefix):
+        segments = [
+            ("=" * 60 + "\n",),
+            ("可用主机地址\n",),
+            ("=" * 60 + "\n\n",),
+            (f"网络: {network.exploded}\n",),
+            (f"可用主机总数: {total_hosts:,}\n\n",),
+        ]
         
-        self.result_text3.insert(tk.END, "-" * 60 + "\n")
         if prefix == 127:
-            self.result_text3.insert(tk.END, "可用主机地址:\n")
+            segments.append(("RFC 6164 说明: /127 网络用于点对点链路，两个有效地址为:\n",))
+            segments.append(("  1. ",))
+            segments.append((f"{(network.network_address + 1).exploded}\n", "host"))
+            segments.append(("  2. ",))
+            segments.append((f"{(network.network_address + 2).exploded}\n\n", "host"))
         elif prefix == 128:
-            self.result_text3.insert(tk.END, "主机地址:\n")
-        else:
-            self.result_text3.insert(tk.END, "前 100 个可用主机地址:\n")
-        self.result_text3.insert(tk.END, "-" * 60 + "\n\n")
+            segments.append(("RFC 4291 说明: /128 网络表示单个主机地址\n\n",))
         
-        for i, host in enumerate(hosts_list):
-            if prefix == 127:
-                self.result_text3.insert(tk.END, f"{i+1}. ")
-                self.result_text3.insert(tk.END, f"{host.exploded}\n", "host")
-            elif prefix == 128:
-                self.result_text3.insert(tk.END, f"{host.exploded}\n", "host")
+        segments.append(("-" * 60 + "\n",))
+        segments.append(("下方列表可滚动查看全部地址，或输入行号直接跳转\n",))
+        return segments
+    
+    def _show_hosts(self, result):
+        network, total_hosts, prefix, segments, cached = result
+        self.current_network = network
+        with Instrumentation.span("hosts.render"):
+            UIUtils.clear_error_highlight(self.ipv6_entry3)
+            UIUtils.render_segments(self.result_text3, segments)
+            self.result_text3.tag_config("host", foreground="#009900")
+            
+            network_int = int(network.network_address)
+            if prefix == 128:
+                self.host_list.set_source(1, lambda i: AddressFormatter.exploded(network_int))
             else:
-                self.result_text3.insert(tk.END, f"{i+1}. ")
-                self.result_text3.insert(tk.END, f"{host.exploded}\n", "host")
-        
-        self.result_text3.tag_config("host", foreground="#009900")
-        
-        if prefix not in [127, 128] and total_hosts > 100:
-            self.result_text3.insert(tk.END, f"\n... 还有 {total_hosts - 100:,} 个地址未显示\n")
-            self.result_text3.insert(tk.END, f"点击\"导出地址\"按钮可导出更多地址\n")
+                self.host_list.set_source(
+                    total_hosts,
+                    lambda i: f"{i + 1}. {AddressFormatter.exploded(network_int + i + 1)}"
+                )
         
-        self.log_status(f"生成完成，共 {total_hosts:,} 个可用地址", "success")
+        self.log_status(f"生成完成{'（缓存）' if cached else ''}，共 {total_hosts:,} 个可用地址", "success")
     
     def _show_error(self, error_msg):
+        UIUtils.highlight_error(self.ipv6_entry3)
         messagebox.showerror("错误", error_msg)
         self.log_status(f"错误: {error_msg}", "error")
     
+    def _show_live_error(self, error_msg):
+        UIUtils.highlight_error(self.ipv6_entry3)
+        self.log_status(f"错误: {error_msg}", "error")
+    
     def copy_hosts(self):
         try:
             if not self.current_network:
                 self.log_status("请先生成主机地址", "warning")
                 return
             
-            content = self.result_text3.get(1.0, tk.END)
+            content = self.result_text3.get(1.0, tk.END) + "\n" + self.host_list.get_preview_text(unit="个地址")
             self.root.clipboard_clear()
             self.root.clipboard_append(content)
             self.log_status("已复制计算结果", "success")
@@ -181,24 +140,21 @@ class HostAddressesTab:
     
     def export_hosts_dialog(self):
         try:
+            import random
+            from sharded_export import ShardedExporter, SHARD_MIN_ADDRESSES
+            
             if not self.current_network:
                 messagebox.showwarning("警告", "请先生成主机地址")
                 return
             
             dialog = tk.Toplevel(self.root)
             dialog.title("导出地址")
-            dialog.geometry("500x650")
+            dialog.geometry("500x790")
             dialog.transient(self.root)
             dialog.grab_set()
             
             network = self.current_network
-            prefix = network.prefixlen
-            total_hosts = network.num_addresses - 2 if network.num_addresses > 2 else 0
-            
-            if prefix == 127:
-                total_hosts = 2
-            elif prefix == 128:
-                total_hosts = 1
+            total_hosts = PlannerEngine.host_count(network)
             
             main_frame = ttk.Frame(dialog)
             main_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
@@ -217,6 +173,8 @@ class HostAddressesTab:
                 size_label = tk.Label(warning_frame, text=f"预估文件大小: {size_str}", 
                                      fg="red", font=('Arial', 9))
                 size_label.pack(pady=2)
+                tk.Label(warning_frame, text="提示: 保存为 .gz / .xz / .bz2 文件可流式压缩，显著减小文件体积",
+                         font=('Arial', 9)).pack(pady=2)
             
             ttk.Separator(main_frame, orient=tk.HORIZONTAL).pack(fill=tk.X, pady=15)
             
@@ -260,10 +218,30 @@ class HostAddressesTab:
             range_end_entry.pack(side=tk.LEFT, padx=2)
             ttk.Label(range_frame, text=" 个").pack(side=tk.LEFT)
             
+            ttk.Radiobutton(main_frame, text="随机抽样 N 个不重复地址", variable=export_var, value="sample").pack(anchor=tk.W, pady=2)
+            
+            sample_frame = ttk.Frame(main_frame)
+            sample_frame.pack(anchor=tk.W, pady=5, padx=20)
+            ttk.Label(sample_frame, text="N = ").pack(side=tk.LEFT)
+            sample_n_entry = ttk.Entry(sample_frame, width=15)
+            sample_n_entry.insert(0, "1000")
+            sample_n_entry.pack(side=tk.LEFT)
+            ttk.Label(sample_frame, text=" 种子: ").pack(side=tk.LEFT, padx=2)
+            sample_seed_entry = ttk.Entry(sample_frame, width=12)
+            sample_seed_entry.insert(0, str(random.randrange(1, 10 ** 8)))
+            sample_seed_entry.pack(side=tk.LEFT)
+            UIUtils.add_tooltip(sample_seed_entry, "相同的网络、数量和种子总是得到相同的抽样结果")
+            
             ttk.Separator(main_frame, orient=tk.HORIZONTAL).pack(fill=tk.X, pady=15)
             
+            workers = ShardedExporter.default_workers()
+            parallel_var = tk.BooleanVar(value=total_hosts >= SHARD_MIN_ADDRESSES and workers > 1)
+            ttk.Checkbutton(main_frame, text=f"多进程并行导出 ({workers} 个进程，适用于 {SHARD_MIN_ADDRESSES:,} 个以上地址)",
+                            variable=parallel_var).pack(anchor=tk.W, pady=2)
+            
             def on_export():
                 export_type = export_var.get()
+                sample_seed = None
                 
                 if export_type == "all":
                     if total_hosts > 1000000:
@@ -337,11 +315,27 @@ class HostAddressesTab:
                     except ValueError:
                         messagebox.showerror("错误", "请输入有效的数字")
                         return
+                elif export_type == "sample":
+                    try:
+                        count = int(sample_n_entry.get().strip())
+                        if count <= 0:
+                            messagebox.showerror("错误", "请输入大于 0 的数字")
+                            return
+                        count = min(count, total_hosts)
+                        start_index = 1
+                        end_index = count
+                    except ValueError:
+                        messagebox.showerror("错误", "请输入有效的数字")
+                        return
+                    sample_seed = sample_seed_entry.get().strip()
+                    if not sample_seed:
+                        messagebox.showerror("错误", "请输入抽样种子")
+                        return
                 else:
                     return
                 
                 dialog.destroy()
-                self.export_hosts(export_type, start_index, end_index, count, total_hosts)
+                self.export_hosts(export_type, start_index, end_index, count, total_hosts, parallel_var.get(), sample_seed)
             
             button_frame = ttk.Frame(main_frame)
             button_frame.pack(pady=15)
@@ -352,33 +346,105 @@ class HostAddressesTab:
             messagebox.showerror("错误", f"打开导出对话框失败: {str(e)}")
             self.log_status(f"错误: {str(e)}", "error")
     
-    def export_hosts(self, export_type, start_index, end_index, count, total_hosts):
+    def export_hosts(self, export_type, start_index, end_index, count, total_hosts, parallel=False, sample_seed=None):
         try:
-            if self.is_exporting:
-                messagebox.showwarning("警告", "正在导出中，请稍候...")
-                return
+            from tkinter import filedialog
             
             if not self.current_network:
                 messagebox.showwarning("警告", "请先生成主机地址")
                 return
             
             network = self.current_network
-            prefix = network.prefixlen
             
             file_path = filedialog.asksaveasfilename(
                 defaultextension=".txt",
-                filetypes=[("文本文件", "*.txt"), ("所有文件", "*.*")],
+                filetypes=[
+                    ("文本文件", "*.txt"),
+                    ("Gzip 压缩文本", "*.txt.gz"),
+                    ("XZ 压缩文本", "*.txt.xz"),
+                    ("BZ2 压缩文本", "*.txt.bz2"),
+                    ("所有文件", "*.*")
+                ],
                 title="保存主机地址列表"
             )
             
             if not file_path:
                 return
             
+            self._run_host_export(network, file_path, start_index, end_index, total_hosts, parallel, sample_seed=sample_seed)
+            
+        except Exception as e:
+            messagebox.showerror("错误", f"导出失败: {str(e)}")
+            self.log_status(f"导出失败: {str(e)}")
+    
+    def resume_export(self):
+        try:
+            from tkinter import filedialog
+            from export_writer import ExportCheckpoint
+            from sharded_export import ShardedExporter, SHARD_MIN_ADDRESSES
+            
+            file_path = filedialog.askopenfilename(
+                filetypes=[
+                    ("文本文件", "*.txt *.txt.gz *.txt.xz *.txt.bz2"),
+                    ("所有文件", "*.*")
+                ],
+                title="选择未完成的主机地址导出文件"
+            )
+            if not file_path:
+                return
+            
+            state = ExportCheckpoint.load(file_path)
+            if state is None or state.get("kind") != "hosts":
+                messagebox.showwarning("警告", "未找到该文件的主机地址导出断点信息")
+                return
+            
+            network = ipaddress.IPv6Network(state["network"])
+            start_index = state["start_index"]
+            end_index = state["end_index"]
+            count = end_index - start_index + 1
+            done = state["next_index"] - start_index
+            sample_seed = state.get("sample_seed")
+            if sample_seed is None:
+                selection = f"导出范围: 第 {start_index:,} 个到第 {end_index:,} 个\n"
+            else:
+                selection = f"随机抽样: {count:,} 个地址，种子 {sample_seed}\n"
+            
+            confirm = messagebox.askyesno(
+                "继续导出",
+                f"网络: {network.exploded}\n"
+                + selection +
+                f"已完成: {done:,} / {count:,} ({done / count * 100:.1f}%)\n\n"
+                f"将截断文件到最后一个断点并从第 {state['next_index']:,} 个地址继续导出，是否继续？"
+            )
+            if not confirm:
+                return
+            
+            remaining = end_index - state["next_index"] + 1
+            parallel = sample_seed is None and remaining >= SHARD_MIN_ADDRESSES and ShardedExporter.default_workers() > 1
+            self._run_host_export(network, file_path, start_index, end_index, state["total_hosts"], parallel, state, sample_seed)
+            
+        except Exception as e:
+            messagebox.showerror("错误", f"继续导出失败: {str(e)}")
+            self.log_status(f"继续导出失败: {str(e)}", "error")
+    
+    def _run_host_export(self, network, file_path, start_index, end_index, total_hosts, parallel, resume_from=None,
+                         sample_seed=None):
+        try:
+            from export_writer import AddressExporter
+            from sharded_export import ShardedExporter, SHARD_MIN_ADDRESSES
+            
+            if self.job_manager.find_active(file_path) is not None:
+                messagebox.showwarning("警告", "该文件正在导出中，请稍候...")
+                return
+            
+            count = end_index - start_index + 1
+            initial = 0 if resume_from is None else resume_from["next_index"] - start_index
+            
             progress_dialog = tk.Toplevel(self.root)
-            progress_dialog.title("导出进度")
+            progress_dialog.title(f"导出进度 - {network}")
             progress_dialog.geometry("450x250")
             progress_dialog.transient(self.root)
-            progress_dialog.grab_set()
+            progress_dialog.protocol("WM_DELETE_WINDOW", progress_dialog.withdraw)
             
             frame = ttk.Frame(progress_dialog, padding="20")
             frame.pack(fill=tk.BOTH, expand=True)
@@ -389,88 +455,80 @@ class HostAddressesTab:
             progress_bar = ttk.Progressbar(frame, variable=progress_var, maximum=100, length=380)
             progress_bar.pack(pady=10)
             
-            progress_label = ttk.Label(frame, text="准备中...")
+            progress_label = ttk.Label(frame, text="排队中...")
             progress_label.pack(pady=5)
             
             stats_label = ttk.Label(frame, text="")
             stats_label.pack(pady=5)
             
-            def on_stop():
-                self._set_stop_flag("stop_export", True)
+            start_time = time.time()
             
-            ttk.Button(frame, text="停止导出", command=on_stop).pack(pady=10)
+            def show_progress(current_index):
+                percent = (current_index / count) * 100
+                progress_var.set(percent)
+                
+                elapsed = time.time() - start_time
+                if current_index > initial and elapsed > 0:
+                    rate = (current_index - initial) / elapsed
+                    remaining = (count - current_index) / rate if rate > 0 else 0
+                    remaining_str = f"{int(remaining)}秒" if remaining < 60 else f"{int(remaining/60)}分{int(remaining%60)}秒"
+                    stats_label.config(text=f"速率: {rate:.0f} 地址/秒 | 剩余: {remaining_str}")
+                
+                progress_label.config(text=f"已导出 {current_index:,} / {count:,} ({percent:.1f}%)")
             
-            progress_dialog.update()
+            channel = ProgressChannel(self.root, show_progress).start()
             
-            def export_thread():
+            def export_job(job):
                 try:
-                    self._set_stop_flag("stop_export", False)
-                    with self.export_lock:
-                        self.is_exporting = True
-                        try:
-                            with open(file_path, 'w', encoding='utf-8') as f:
-                                f.write(f"网络: {network.exploded}\n")
-                                f.write(f"可用主机总数: {total_hosts:,}\n")
-                                f.write(f"导出范围: 第 {start_index:,} 个到第 {end_index:,} 个\n")
-                                f.write(f"导出数量: {count:,}\n")
-                                f.write("=" * 60 + "\n\n")
-                                
-                                if prefix == 127:
-                                    f.write(f"1. {(network.network_address + 1).exploded}\n")
-                                    f.write(f"2. {(network.network_address + 2).exploded}\n")
-                                    current_index = 2
-                                elif prefix == 128:
-                                    f.write(f"{network.network_address.exploded}\n")
-                                    current_index = 1
-                                else:
-                                    current_index = 0
-                                    start_time = time.time()
-                                    
-                                    network_int = int(network.network_address)
-                                    
-                                    for i in range(start_index, end_index + 1):
-                                        if self._get_stop_flag("stop_export"):
-                                            break
-                                        
-                                        address_int = network_int + i
-                                        address = ipaddress.IPv6Address(address_int)
-                                        
-                                        current_index += 1
-                                        f.write(f"{i}. {address.exploded}\n")
-                                        
-                                        if current_index % 100000 == 0 or current_index == count:
-                                            percent = (current_index / count) * 100
-                                            progress_var.set(percent)
-                                            
-                                            elapsed = time.time() - start_time
-                                            if current_index > 0:
-                                                rate = current_index / elapsed
-                                                remaining = (count - current_index) / rate if rate > 0 else 0
-                                                remaining_str = f"{int(remaining)}秒" if remaining < 60 else f"{int(remaining/60)}分{int(remaining%60)}秒"
-                                                stats_label.config(text=f"速率: {rate:.0f} 地址/秒 | 剩余: {remaining_str}")
-                                            
-                                            progress_label.config(text=f"已导出 {current_index:,} / {count:,} ({percent:.1f}%)")
-                                            progress_dialog.update()
-                            
-                            progress_dialog.after(0, lambda: progress_dialog.destroy())
-                            
-                            if self._get_stop_flag("stop_export"):
-                                self.root.after(0, lambda: messagebox.showinfo("已停止", f"导出已停止，已导出部分地址到:\n{file_path}"))
-                                self.root.after(0, lambda: self.log_status("导出已停止"))
-                            else:
-                                self.root.after(0, lambda: messagebox.showinfo("成功", f"已导出 {count:,} 个主机地址到:\n{file_path}"))
-                                self.root.after(0, lambda: self.log_status(f"导出成功: {file_path}"))
-                        finally:
-                            self.is_exporting = False
-                            
+                    options = {}
+                    if sample_seed is not None:
+                        exporter = AddressExporter.export_hosts
+                        options["sample_seed"] = sample_seed
+                    elif parallel and network.prefixlen < 127 and count >= SHARD_MIN_ADDRESSES:
+                        exporter = ShardedExporter.export_hosts
+                    else:
+                        exporter = AddressExporter.export_hosts
+                    
+                    def on_progress(current_index):
+                        job.report(current_index)
+                        channel.post(current_index)
+                    
+                    with Instrumentation.span("hosts.export"):
+                        exporter(
+                            file_path, network, start_index, end_index, total_hosts,
+                            should_stop=job.token,
+                            on_progress=on_progress,
+                            resume_from=resume_from,
+                            **options
+                        )
+                    
+                    channel.call(progress_dialog.destroy)
+                    
+                    if job.token.is_cancelled():
+                        channel.call(lambda: messagebox.showinfo("已停止", f"导出已停止，已导出部分地址到:\n{file_path}\n\n可使用“继续导出”从断点继续"))
+                        channel.call(lambda: self.log_status("导出已停止"))
+                    else:
+                        channel.call(lambda: messagebox.showinfo("成功", f"已导出 {count:,} 个主机地址到:\n{file_path}"))
+                        channel.call(lambda: self.log_status(f"导出成功: {file_path}"))
+                    
                 except Exception as e:
-                    progress_dialog.after(0, lambda: progress_dialog.destroy())
-                    self.root.after(0, lambda: messagebox.showerror("错误", f"导出失败: {str(e)}"))
-                    self.root.after(0, lambda: self.log_status(f"导出失败: {str(e)}"))
-                    self.is_exporting = False
-            
-            thread = threading.Thread(target=export_thread, daemon=True)
-            thread.start()
+                    error_msg = str(e)
+                    channel.call(progress_dialog.destroy)
+                    channel.call(lambda: messagebox.showerror("错误", f"导出失败: {error_msg}"))
+                    channel.call(lambda: self.log_status(f"导出失败: {error_msg}"))
+                    raise
+                finally:
+                    channel.close()
+            
+            try:
+                job = self.job_manager.submit(f"导出主机地址 {network}", export_job, PRIORITY_EXPORT,
+                                              total=count, done=initial, unit="地址", key=file_path)
+            except Exception:
+                channel.close()
+                progress_dialog.destroy()
+                raise
+            
+            ttk.Button(frame, text="停止导出", command=job.cancel).pack(pady=10)
             
         except Exception as e:
             messagebox.showerror("错误", f"导出失败: {str(e)}")
@@ -0,0 +1,165 @@
+import hashlib
+from itertools import islice
+from address_format import AddressFormatter
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+ROUNDS = 4
+BLOCK_SIZE = 65536
+MASK64 = (1 << 64) - 1
+
+
+class FeistelPermutation:
+    def __init__(self, domain, seed, rounds=ROUNDS):
+        if domain <= 0:
+            raise ValueError("抽样范围必须大于 0")
+        self.domain = domain
+        bits = max(2, (domain - 1).bit_length())
+        self.half_bits = (bits + 1) // 2
+        self.half_mask = (1 << self.half_bits) - 1
+        self.shift = 64 - self.half_bits
+        
+        digest = hashlib.shake_256(f"ipv6-sample:{seed}".encode("utf-8")).digest(16 * rounds)
+        words = [int.from_bytes(digest[i:i + 8], "big") for i in range(0, len(digest), 8)]
+        self.keys = [(words[2 * r] | 1, words[2 * r + 1]) for r in range(rounds)]
+    
+    def _encrypt(self, value):
+        half_bits = self.half_bits
+        shift = self.shift
+        left = value >> half_bits
+        right = value & self.half_mask
+        for multiplier, addend in self.keys:
+            mixed = (right * multiplier + addend) & MASK64
+            mixed = ((mixed ^ (mixed >> 32)) * multiplier) & MASK64
+            left, right = right, left ^ (mixed >> shift)
+        return (left << half_bits) | right
+    
+    def __call__(self, index):
+        if not 0 <= index < self.domain:
+            raise ValueError(f"序号超出抽样范围: {index}")
+        value = self._encrypt(index)
+        while value >= self.domain:
+            value = self._encrypt(value)
+        return value
+    
+    def _encrypt_halves(self, left, right):
+        shift = np.uint64(self.shift)
+        for multiplier, addend in self.keys:
+            multiplier = np.uint64(multiplier)
+            mixed = right * multiplier + np.uint64(addend)
+            mixed ^= mixed >> np.uint64(32)
+            mixed *= multiplier
+            left, right = right, left ^ (mixed >> shift)
+        return left, right
+    
+    def _index_halves(self, start, count):
+        left = np.uint64(start >> self.half_bits)
+        low = np.uint64(start & self.half_mask)
+        right = np.arange(count, dtype=np.uint64) + low
+        if self.half_bits == 64:
+            return (right < low).astype(np.uint64) + left, right
+        return (right >> np.uint64(self.half_bits)) + left, right & np.uint64(self.half_mask)
+    
+    @property
+    def vectorized(self):
+        return np is not None
+    
+    def block_array(self, start, count):
+        left, right = self._encrypt_halves(*self._index_halves(start, count))
+        limit_left = self.domain >> self.half_bits
+        if limit_left <= MASK64:
+            limit_left = np.uint64(limit_left)
+            limit_right = np.uint64(self.domain & self.half_mask)
+            outside = np.flatnonzero((left > limit_left) | ((left == limit_left) & (right >= limit_right)))
+            while len(outside):
+                left[outside], right[outside] = self._encrypt_halves(left[outside], right[outside])
+                outside_left = left[outside]
+                outside = outside[(outside_left > limit_left) | ((outside_left == limit_left) & (right[outside] >= limit_right))]
+        
+        if self.half_bits == 64:
+            return left, right
+        return left >> np.uint64(self.shift), (left << np.uint64(self.half_bits)) | right
+    
+    def block(self, start, count):
+        if self.vectorized:
+            hi, lo = self.block_array(start, count)
+            return [(high << 64) | low for high, low in zip(hi.tolist(), lo.tolist())]
+        
+        domain = self.domain
+        encrypt = self._encrypt
+        result = []
+        for value in range(start, start + count):
+            value = encrypt(value)
+            while value >= domain:
+                value = encrypt(value)
+            result.append(value)
+        return result
+    
+    def iter_range(self, start, count, block_size=BLOCK_SIZE):
+        end = start + count
+        while start < end:
+            size = min(block_size, end - start)
+            yield from self.block(start, size)
+            start += size
+
+
+def _numbered_rows(first_position, addresses, newline):
+    count = len(addresses)
+    text = np.frombuffer(addresses.exploded_bytes(b""), dtype=np.uint8).reshape(count, 39)
+    separator = np.frombuffer(newline, dtype=np.uint8)
+    parts = []
+    row = 0
+    while row < count:
+        position = first_position + row
+        width = len(str(position))
+        size = min(count - row, 10 ** width - position)
+        positions = np.arange(position, position + size, dtype=np.uint64)
+        buffer = np.empty((size, width + 41 + len(newline)), dtype=np.uint8)
+        for digit in range(width):
+            power = np.uint64(10 ** (width - 1 - digit))
+            buffer[:, digit] = (positions // power) % np.uint64(10) + np.uint64(ord("0"))
+        buffer[:, width] = ord(".")
+        buffer[:, width + 1] = ord(" ")
+        buffer[:, width + 2:width + 41] = text[row:row + size]
+        buffer[:, width + 41:] = separator
+        parts.append(buffer.tobytes())
+        row += size
+    return b"".join(parts)
+
+
+class HostSampler:
+    @staticmethod
+    def numbered_lines(network_int, total_hosts, seed, first_position, count, block_size=BLOCK_SIZE):
+        permutation = FeistelPermutation(total_hosts, seed)
+        first_host = network_int + 1
+        position = first_position
+        exploded = AddressFormatter.exploded
+        for index in permutation.iter_range(first_position - 1, count, block_size):
+            yield f"{position}. {exploded(first_host + index)}\n"
+            position += 1
+    
+    @staticmethod
+    def numbered_blocks(network_int, total_hosts, seed, first_position, count, newline="\n", block_size=BLOCK_SIZE):
+        permutation = FeistelPermutation(total_hosts, seed)
+        if not permutation.vectorized:
+            lines = HostSampler.numbered_lines(network_int, total_hosts, seed, first_position, count, block_size)
+            while count > 0:
+                size = min(block_size, count)
+                text = "".join(islice(lines, size))
+                yield size, text.replace("\n", newline).encode("ascii")
+                count -= size
+            return
+        
+        from address_array import IPv6Array
+        
+        first_host = network_int + 1
+        newline = newline.encode("ascii")
+        end = first_position - 1 + count
+        for start in range(first_position - 1, end, block_size):
+            size = min(block_size, end - start)
+            addresses = IPv6Array(*permutation.block_array(start, size)).add(first_host)
+            yield size, _numbered_rows(start + 1, addresses, newline)
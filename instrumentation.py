@@ -0,0 +1,133 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+TRACE_LIMIT = 100000
+PROFILE_ENV = "IPV6_PLANNER_PROFILE"
+TRACE_ENV = "IPV6_PLANNER_TRACE"
+
+_lock = threading.Lock()
+_stats = {}
+_events = deque(maxlen=TRACE_LIMIT)
+_recent = deque(maxlen=8)
+_origin = time.perf_counter()
+_profiler = None
+
+
+class Instrumentation:
+    @staticmethod
+    @contextmanager
+    def span(name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            Instrumentation.record(name, time.perf_counter() - start, start)
+    
+    @staticmethod
+    def record(name, seconds, start=None):
+        if start is None:
+            start = time.perf_counter() - seconds
+        with _lock:
+            stat = _stats.get(name)
+            if stat is None:
+                _stats[name] = [1, seconds, seconds]
+            else:
+                stat[0] += 1
+                stat[1] += seconds
+                if seconds > stat[2]:
+                    stat[2] = seconds
+            _events.append((name, start, seconds, threading.get_ident()))
+            _recent.append((name, seconds))
+    
+    @staticmethod
+    def stats():
+        with _lock:
+            return {
+                name: {
+                    "count": count,
+                    "total_seconds": total,
+                    "mean_seconds": total / count,
+                    "max_seconds": maximum,
+                }
+                for name, (count, total, maximum) in _stats.items()
+            }
+    
+    @staticmethod
+    def recent_summary(limit=3):
+        with _lock:
+            recent = list(_recent)[-limit:]
+        return " | ".join(f"{name} {seconds * 1000:.1f} ms" for name, seconds in reversed(recent))
+    
+    @staticmethod
+    def reset():
+        with _lock:
+            _stats.clear()
+            _events.clear()
+            _recent.clear()
+    
+    @staticmethod
+    def dump_trace(file_path):
+        with _lock:
+            events = list(_events)
+        trace = {
+            "traceEvents": [
+                {
+                    "name": name,
+                    "ph": "X",
+                    "ts": (start - _origin) * 1000000,
+                    "dur": seconds * 1000000,
+                    "pid": os.getpid(),
+                    "tid": thread_id,
+                }
+                for name, start, seconds, thread_id in events
+            ],
+            "stats": Instrumentation.stats(),
+        }
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(trace, f, ensure_ascii=False)
+        return len(events)
+    
+    @staticmethod
+    def profiling_enabled():
+        return os.environ.get(PROFILE_ENV, "").strip() not in ("", "0")
+    
+    @staticmethod
+    def start_profiling():
+        global _profiler
+        import cProfile
+        import tracemalloc
+        
+        tracemalloc.start(10)
+        _profiler = cProfile.Profile()
+        _profiler.enable()
+    
+    @staticmethod
+    def stop_profiling(output_dir="."):
+        global _profiler
+        import pstats
+        import tracemalloc
+        
+        if _profiler is None:
+            return []
+        _profiler.disable()
+        profile_path = os.path.join(output_dir, "ipv6_planner.prof")
+        _profiler.dump_stats(profile_path)
+        _profiler = None
+        
+        memory_path = os.path.join(output_dir, "ipv6_planner_memory.txt")
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        with open(memory_path, 'w', encoding='utf-8') as f:
+            f.write(f"当前内存: {current / 1024 / 1024:.1f} MB, 峰值内存: {peak / 1024 / 1024:.1f} MB\n\n")
+            for stat in snapshot.statistics("lineno")[:30]:
+                f.write(f"{stat}\n")
+            f.write("\n")
+            stats = pstats.Stats(profile_path, stream=f)
+            stats.sort_stats("cumulative").print_stats(30)
+        return [profile_path, memory_path]
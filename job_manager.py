@@ -0,0 +1,201 @@
+import heapq
+import itertools
+import os
+import threading
+import time
+
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BATCH = 5
+PRIORITY_EXPORT = 10
+
+DEFAULT_WORKERS = max(2, min(4, os.cpu_count() or 1))
+HISTORY_LIMIT = 20
+
+STATE_LABELS = {
+    "queued": "排队中",
+    "running": "运行中",
+    "done": "已完成",
+    "cancelled": "已取消",
+    "failed": "失败",
+}
+
+
+class CancelToken:
+    def __init__(self):
+        self.event = threading.Event()
+    
+    def cancel(self):
+        self.event.set()
+    
+    def is_cancelled(self):
+        return self.event.is_set()
+    
+    def __call__(self):
+        return self.event.is_set()
+
+
+class Job:
+    def __init__(self, job_id, name, func, priority, total=None, done=0, unit="", key=None):
+        self.job_id = job_id
+        self.name = name
+        self.func = func
+        self.priority = priority
+        self.total = total
+        self.initial = done
+        self.done = done
+        self.unit = unit
+        self.key = key
+        self.token = CancelToken()
+        self.state = "queued"
+        self.error = None
+        self.submitted = time.time()
+        self.started = None
+        self.finished = None
+    
+    def report(self, done):
+        self.done = done
+    
+    def cancel(self):
+        self.token.cancel()
+    
+    def elapsed(self):
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.time()) - self.started
+    
+    def rate(self):
+        elapsed = self.elapsed()
+        return (self.done - self.initial) / elapsed if elapsed > 0 else 0.0
+    
+    def is_active(self):
+        return self.state in ("queued", "running")
+
+
+class JobManager:
+    def __init__(self, max_workers=DEFAULT_WORKERS):
+        self.max_workers = max(2, max_workers)
+        self.max_bulk = self.max_workers - 1
+        self.queue = []
+        self.jobs = {}
+        self.running_bulk = 0
+        self.workers = []
+        self.counter = itertools.count(1)
+        self.closed = False
+        self.condition = threading.Condition()
+    
+    def submit(self, name, func, priority=PRIORITY_EXPORT, total=None, done=0, unit="", key=None):
+        with self.condition:
+            if self.closed:
+                raise RuntimeError("任务管理器已关闭")
+            if key is not None and self.find_active(key) is not None:
+                raise ValueError(f"已有相同目标的任务正在进行: {name}")
+            job = Job(next(self.counter), name, func, priority, total, done, unit, key)
+            self.jobs[job.job_id] = job
+            heapq.heappush(self.queue, (priority, job.job_id, job))
+            if len(self.workers) < self.max_workers:
+                worker = threading.Thread(target=self._worker, daemon=True)
+                self.workers.append(worker)
+                worker.start()
+            self.condition.notify_all()
+            return job
+    
+    def find_active(self, key):
+        with self.condition:
+            for job in self.jobs.values():
+                if job.key == key and job.is_active():
+                    return job
+            return None
+    
+    def cancel(self, job_id):
+        with self.condition:
+            job = self.jobs.get(job_id)
+            if job is None or not job.is_active():
+                return False
+            job.cancel()
+            self.condition.notify_all()
+            return True
+    
+    def cancel_all(self):
+        with self.condition:
+            job_ids = [job.job_id for job in self.jobs.values() if job.is_active()]
+        for job_id in job_ids:
+            self.cancel(job_id)
+    
+    def shutdown(self, timeout=2.0):
+        self.cancel_all()
+        deadline = time.time() + timeout
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+            while any(job.state == "running" for job in self.jobs.values()):
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                self.condition.wait(remaining)
+    
+    def snapshot(self):
+        with self.condition:
+            return sorted(self.jobs.values(), key=lambda job: (not job.is_active(), job.priority, job.job_id))
+    
+    def counts(self):
+        with self.condition:
+            running = sum(1 for job in self.jobs.values() if job.state == "running" and job.priority > PRIORITY_INTERACTIVE)
+            queued = sum(1 for job in self.jobs.values() if job.state == "queued" and job.priority > PRIORITY_INTERACTIVE)
+            return running, queued
+    
+    def _next_job(self):
+        while self.queue and self.queue[0][2].state != "queued":
+            heapq.heappop(self.queue)
+        if not self.queue:
+            return None
+        priority, _, job = self.queue[0]
+        if priority <= PRIORITY_INTERACTIVE or self.running_bulk < self.max_bulk:
+            heapq.heappop(self.queue)
+            return job
+        for index, (_, _, job) in enumerate(self.queue):
+            if job.state == "queued" and job.token.is_cancelled():
+                self.queue.pop(index)
+                heapq.heapify(self.queue)
+                return job
+        return None
+    
+    def _worker(self):
+        while True:
+            with self.condition:
+                job = self._next_job()
+                while job is None:
+                    if self.closed:
+                        return
+                    self.condition.wait()
+                    job = self._next_job()
+                job.state = "running"
+                job.started = time.time()
+                bulk = job.priority > PRIORITY_INTERACTIVE and not job.token.is_cancelled()
+                if bulk:
+                    self.running_bulk += 1
+            
+            state = "done"
+            try:
+                job.func(job)
+            except Exception as e:
+                job.error = str(e)
+                state = "failed"
+            
+            with self.condition:
+                if bulk:
+                    self.running_bulk -= 1
+                if state == "done" and job.token.is_cancelled():
+                    state = "cancelled"
+                self._finish(job, state)
+                self.condition.notify_all()
+    
+    def _finish(self, job, state):
+        job.state = state
+        job.finished = time.time()
+        if job.priority == PRIORITY_INTERACTIVE:
+            self.jobs.pop(job.job_id, None)
+            return
+        finished = [j for j in self.jobs.values() if not j.is_active()]
+        for old in finished[:-HISTORY_LIMIT]:
+            self.jobs.pop(old.job_id, None)
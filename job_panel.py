@@ -0,0 +1,102 @@
+import tkinter as tk
+from tkinter import ttk
+from job_manager import STATE_LABELS
+
+
+REFRESH_MS = 500
+
+
+class JobPanel:
+    def __init__(self, root, job_manager):
+        self.root = root
+        self.job_manager = job_manager
+        self.window = None
+        self.tree = None
+        self.pending = None
+    
+    def show(self):
+        if self.window is not None and self.window.winfo_exists():
+            self.window.deiconify()
+            self.window.lift()
+            return
+        
+        self.window = tk.Toplevel(self.root)
+        self.window.title("后台任务")
+        self.window.geometry("720x320")
+        self.window.transient(self.root)
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+        
+        frame = ttk.Frame(self.window, padding="10")
+        frame.pack(fill=tk.BOTH, expand=True)
+        
+        columns = ("name", "state", "progress", "rate", "elapsed")
+        self.tree = ttk.Treeview(frame, columns=columns, show="headings", height=10)
+        for column, title, width, anchor in [
+            ("name", "任务", 280, tk.W),
+            ("state", "状态", 70, tk.CENTER),
+            ("progress", "进度", 150, tk.E),
+            ("rate", "速率", 110, tk.E),
+            ("elapsed", "已用时间", 70, tk.E),
+        ]:
+            self.tree.heading(column, text=title)
+            self.tree.column(column, width=width, anchor=anchor)
+        scrollbar = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.grid(row=0, column=0, sticky=tk.NSEW)
+        scrollbar.grid(row=0, column=1, sticky=tk.NS)
+        frame.rowconfigure(0, weight=1)
+        frame.columnconfigure(0, weight=1)
+        
+        button_frame = ttk.Frame(frame)
+        button_frame.grid(row=1, column=0, columnspan=2, pady=(10, 0))
+        ttk.Button(button_frame, text="取消所选", command=self.cancel_selected).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="关闭", command=self.close).pack(side=tk.LEFT, padx=5)
+        
+        self.refresh()
+    
+    def close(self):
+        if self.pending is not None:
+            self.root.after_cancel(self.pending)
+            self.pending = None
+        if self.window is not None:
+            self.window.destroy()
+        self.window = None
+        self.tree = None
+    
+    def cancel_selected(self):
+        for item in self.tree.selection():
+            self.job_manager.cancel(int(item))
+        self.refresh()
+    
+    def refresh(self):
+        if self.pending is not None:
+            self.root.after_cancel(self.pending)
+            self.pending = None
+        if self.tree is None:
+            return
+        
+        jobs = self.job_manager.snapshot()
+        seen = set()
+        for job in jobs:
+            item = str(job.job_id)
+            seen.add(item)
+            values = (job.name, STATE_LABELS[job.state], self._progress_text(job),
+                      f"{job.rate():,.0f} {job.unit}/秒" if job.started else "",
+                      f"{job.elapsed():.0f} 秒" if job.started else "")
+            if self.tree.exists(item):
+                self.tree.item(item, values=values)
+            else:
+                self.tree.insert("", tk.END, iid=item, values=values)
+        for item in self.tree.get_children():
+            if item not in seen:
+                self.tree.delete(item)
+        for index, job in enumerate(jobs):
+            self.tree.move(str(job.job_id), "", index)
+        
+        self.pending = self.root.after(REFRESH_MS, self.refresh)
+    
+    @staticmethod
+    def _progress_text(job):
+        if not job.total:
+            return f"{job.done:,}"
+        return f"{job.done:,} / {job.total:,} ({job.done / job.total:.0%})"
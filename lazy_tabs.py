@@ -0,0 +1,39 @@
+from tkinter import ttk
+from instrumentation import Instrumentation
+
+
+class LazyTabs:
+    def __init__(self, notebook):
+        self.notebook = notebook
+        self.names = []
+        self.frames = []
+        self.factories = []
+        self.actions = []
+        self.tabs = []
+        self.notebook.bind('<<NotebookTabChanged>>', lambda e: self.build(self.current_index()), add='+')
+    
+    def register(self, name, title, factory, **actions):
+        frame = ttk.Frame(self.notebook)
+        self.notebook.add(frame, text=title)
+        self.names.append(name)
+        self.frames.append(frame)
+        self.factories.append(factory)
+        self.actions.append(actions)
+        self.tabs.append(None)
+    
+    def current_index(self):
+        return self.notebook.index(self.notebook.select())
+    
+    def build(self, index):
+        tab = self.tabs[index]
+        if tab is None:
+            with Instrumentation.span(f"{self.names[index]}.build"):
+                tab = self.factories[index](self.frames[index])
+            self.tabs[index] = tab
+        return tab
+    
+    def invoke_current(self, action):
+        index = self.current_index()
+        method_name = self.actions[index].get(action)
+        if method_name:
+            getattr(self.build(index), method_name)()
@@ -0,0 +1,109 @@
+import threading
+from job_manager import PRIORITY_INTERACTIVE
+from progress_channel import ProgressChannel
+
+
+DEFAULT_DELAY_MS = 300
+
+
+class LiveRecalculator:
+    def __init__(self, root, compute, on_result, on_error=None, delay_ms=DEFAULT_DELAY_MS, jobs=None):
+        self.root = root
+        self.compute = compute
+        self.on_result = on_result
+        self.on_error = on_error
+        self.delay_ms = delay_ms
+        self.jobs = jobs
+        self.entries = []
+        self.pending = None
+        self.last_inputs = None
+        self.generation = 0
+        self.lock = threading.Lock()
+        self.channel = None
+        self.active = 0
+    
+    def watch(self, entries):
+        self.entries = list(entries)
+        self.last_inputs = self.current_inputs()
+        for entry in self.entries:
+            entry.bind('<KeyRelease>', lambda e: self.schedule(), add='+')
+            entry.bind('<FocusOut>', lambda e: self.schedule(), add='+')
+    
+    def current_inputs(self):
+        return tuple(entry.get() for entry in self.entries)
+    
+    def schedule(self):
+        inputs = self.current_inputs()
+        if inputs == self.last_inputs:
+            return
+        self.last_inputs = inputs
+        self.cancel()
+        if any(not value.strip() for value in inputs):
+            return
+        self.pending = self.root.after(self.delay_ms, lambda: self._start(inputs, self.on_error))
+    
+    def run_now(self, on_error=None):
+        inputs = self.current_inputs()
+        self.last_inputs = inputs
+        self.cancel()
+        self._start(inputs, on_error or self.on_error)
+    
+    def cancel(self):
+        if self.pending is not None:
+            self.root.after_cancel(self.pending)
+            self.pending = None
+        with self.lock:
+            self.generation += 1
+    
+    def is_current(self, token):
+        with self.lock:
+            return token == self.generation
+    
+    def _start(self, inputs, on_error):
+        self.pending = None
+        with self.lock:
+            self.generation += 1
+            token = self.generation
+        
+        def is_stale():
+            return not self.is_current(token)
+        
+        if self.channel is None:
+            self.channel = ProgressChannel(self.root, lambda value: None).start()
+        channel = self.channel
+        self.active += 1
+        
+        def worker():
+            try:
+                if is_stale():
+                    return
+                try:
+                    result = self.compute(inputs, is_stale)
+                except Exception as e:
+                    error_msg = str(e)
+                    channel.call(lambda: self._deliver(token, on_error, error_msg))
+                    return
+                if result is not None and not is_stale():
+                    channel.call(lambda: self._deliver(token, self.on_result, result))
+            finally:
+                channel.call(self._finished)
+        
+        try:
+            if self.jobs is not None:
+                self.jobs.submit("实时计算", lambda job: worker(), PRIORITY_INTERACTIVE)
+                return
+            thread = threading.Thread(target=worker, daemon=True)
+            thread.start()
+        except Exception:
+            self._finished()
+            raise
+    
+    def _finished(self):
+        self.active -= 1
+        if self.active == 0 and self.channel is not None:
+            self.channel.close()
+            self.channel = None
+    
+    def _deliver(self, token, callback, value):
+        if callback and self.is_current(token):
+            callback(value)
@@ -1,13 +1,16 @@
+import time
+START_TIME = time.perf_counter()
+
 import tkinter as tk
 from tkinter import ttk
-import threading
-from utils import UIUtils
-from basic_info_tab import BasicInfoTab
-from subnet_division_tab import SubnetDivisionTab
-from host_addresses_tab import HostAddressesTab
-from subnet_membership_tab import SubnetMembershipTab
-from eui64_conversion_tab import EUI64ConversionTab
-from about_tab import AboutTab
+import os
+from result_cache import ResultCache, DEFAULT_MAX_BYTES
+from instrumentation import Instrumentation, TRACE_ENV
+from lazy_tabs import LazyTabs
+from job_manager import JobManager, DEFAULT_WORKERS
+
+
+STARTUP_EXIT_ENV = "IPV6_PLANNER_STARTUP_EXIT"
 
 
 class IPv6SubnetCalculator:
@@ -17,7 +20,11 @@ class IPv6SubnetCalculator:
         self.root.geometry("1000x700")
         self.root.minsize(900, 650)
         
-        self.stop_flag_lock = threading.Lock()
+        cache_mb = os.environ.get("IPV6_PLANNER_CACHE_MB")
+        self.result_cache = ResultCache(int(cache_mb) * 1024 * 1024 if cache_mb else DEFAULT_MAX_BYTES)
+        job_workers = os.environ.get("IPV6_PLANNER_JOB_WORKERS")
+        self.job_manager = JobManager(int(job_workers) if job_workers else DEFAULT_WORKERS)
+        self.job_panel = None
         
         style = ttk.Style()
         style.theme_use('clam')
@@ -32,12 +39,20 @@ class IPv6SubnetCalculator:
         
         self.root.bind('<Configure>', self._on_window_resize)
         
-        self.basic_info_tab = BasicInfoTab(self.notebook, self.root, self.log_status)
-        self.subnet_division_tab = SubnetDivisionTab(self.notebook, self.root, self.log_status)
-        self.host_addresses_tab = HostAddressesTab(self.notebook, self.root, self.log_status, self.stop_flag_lock)
-        self.subnet_membership_tab = SubnetMembershipTab(self.notebook, self.root, self.log_status)
-        self.eui64_conversion_tab = EUI64ConversionTab(self.notebook, self.root, self.log_status)
-        self.about_tab = AboutTab(self.notebook)
+        self.tabs = LazyTabs(self.notebook)
+        self.tabs.register("basic_info", "基础子网信息", self._create_basic_info_tab,
+                           copy="copy_basic_info", calculate="calculate_basic_info")
+        self.tabs.register("division", "子网划分", self._create_subnet_division_tab,
+                           copy="copy_subnet_division", export="export_subnets", calculate="calculate_subnet_division")
+        self.tabs.register("hosts", "可用主机地址", self._create_host_addresses_tab,
+                           copy="copy_hosts", export="export_hosts_dialog", calculate="generate_host_addresses")
+        self.tabs.register("membership", "所属子网", self._create_subnet_membership_tab,
+                           copy="copy_subnet_membership", calculate="calculate_subnet_membership")
+        self.tabs.register("eui64", "EUI-64 转换", self._create_eui64_conversion_tab,
+                           copy="copy_eui64_result", calculate="convert_eui64")
+        self.tabs.register("plan_store", "规划库", self._create_plan_store_tab,
+                           copy="copy_results", calculate="query_within")
+        self.tabs.register("about", "关于", self._create_about_tab)
         
         status_frame = tk.Frame(root)
         status_frame.pack(side=tk.BOTTOM, fill=tk.X)
@@ -48,7 +63,55 @@ class IPv6SubnetCalculator:
         self.status_bar = tk.Label(status_frame, text="就绪", bd=1, relief=tk.SUNKEN, anchor=tk.W)
         self.status_bar.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5, pady=5)
         
+        self.timing_label = tk.Label(status_frame, text="", fg="#666666", anchor=tk.E)
+        self.timing_label.pack(side=tk.RIGHT, padx=5, pady=5)
+        
+        self.jobs_label = tk.Label(status_frame, text="", fg="#0066CC", cursor="hand2")
+        self.jobs_label.pack(side=tk.RIGHT, padx=5, pady=5)
+        self.jobs_label.bind('<Button-1>', lambda e: self._show_job_panel())
+        
+        self.tabs.build(self.tabs.current_index())
+        
         self._setup_shortcuts()
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
+        self.root.after_idle(self._report_startup)
+        self._refresh_job_status()
+    
+    def _create_basic_info_tab(self, parent):
+        from basic_info_tab import BasicInfoTab
+        return BasicInfoTab(parent, self.root, self.log_status, self.result_cache, self.job_manager)
+    
+    def _create_subnet_division_tab(self, parent):
+        from subnet_division_tab import SubnetDivisionTab
+        return SubnetDivisionTab(parent, self.root, self.log_status, self.result_cache, self.job_manager)
+    
+    def _create_host_addresses_tab(self, parent):
+        from host_addresses_tab import HostAddressesTab
+        return HostAddressesTab(parent, self.root, self.log_status, self.result_cache, self.job_manager)
+    
+    def _create_subnet_membership_tab(self, parent):
+        from subnet_membership_tab import SubnetMembershipTab
+        return SubnetMembershipTab(parent, self.root, self.log_status, self.result_cache, self.job_manager)
+    
+    def _create_eui64_conversion_tab(self, parent):
+        from eui64_conversion_tab import EUI64ConversionTab
+        return EUI64ConversionTab(parent, self.root, self.log_status, self.result_cache, self.job_manager)
+    
+    def _create_plan_store_tab(self, parent):
+        from plan_store_tab import PlanStoreTab
+        return PlanStoreTab(parent, self.root, self.log_status, self.job_manager)
+    
+    def _create_about_tab(self, parent):
+        from about_tab import AboutTab
+        return AboutTab(parent)
+    
+    def _report_startup(self):
+        elapsed = time.perf_counter() - START_TIME
+        Instrumentation.record("app.startup", elapsed, START_TIME)
+        self.log_status(f"就绪 (启动耗时 {elapsed * 1000:.0f} ms)")
+        if os.environ.get(STARTUP_EXIT_ENV):
+            print(f"startup_ms={elapsed * 1000:.1f}", flush=True)
+            self._on_close()
     
     def log_status(self, message, status_type="info"):
         icon_map = {
@@ -60,6 +123,7 @@ class IPv6SubnetCalculator:
         icon = icon_map.get(status_type, "●")
         self.status_icon.config(text=icon, foreground=self._get_status_color(status_type))
         self.status_bar.config(text=message)
+        self.timing_label.config(text=Instrumentation.recent_summary())
     
     def _get_status_color(self, status_type):
         color_map = {
@@ -85,51 +149,79 @@ class IPv6SubnetCalculator:
         self.root.bind('<Control-s>', lambda e: self._export_current_result())
         self.root.bind('<Control-r>', lambda e: self._calculate_current_tab())
         self.root.bind('<F1>', lambda e: self._show_help())
+        self.root.bind('<F2>', lambda e: self._dump_trace())
+        self.root.bind('<F3>', lambda e: self._show_job_panel())
     
     def _copy_current_result(self):
-        current_tab = self.notebook.index(self.notebook.select())
-        if current_tab == 0:
-            self.basic_info_tab.copy_basic_info()
-        elif current_tab == 1:
-            self.subnet_division_tab.copy_subnet_division()
-        elif current_tab == 2:
-            self.host_addresses_tab.copy_hosts()
-        elif current_tab == 3:
-            self.subnet_membership_tab.copy_subnet_membership()
-        elif current_tab == 4:
-            self.eui64_conversion_tab.copy_eui64_result()
+        self.tabs.invoke_current("copy")
     
     def _export_current_result(self):
-        current_tab = self.notebook.index(self.notebook.select())
-        if current_tab == 1:
-            self.subnet_division_tab.export_subnets()
-        elif current_tab == 2:
-            self.host_addresses_tab.export_hosts_dialog()
+        self.tabs.invoke_current("export")
     
     def _calculate_current_tab(self):
-        current_tab = self.notebook.index(self.notebook.select())
-        if current_tab == 0:
-            self.basic_info_tab.calculate_basic_info()
-        elif current_tab == 1:
-            self.subnet_division_tab.calculate_subnet_division()
-        elif current_tab == 2:
-            self.host_addresses_tab.generate_host_addresses()
-        elif current_tab == 3:
-            self.subnet_membership_tab.calculate_subnet_membership()
-        elif current_tab == 4:
-            self.eui64_conversion_tab.convert_eui64()
+        self.tabs.invoke_current("calculate")
+    
+    def _show_job_panel(self):
+        if self.job_panel is None:
+            from job_panel import JobPanel
+            self.job_panel = JobPanel(self.root, self.job_manager)
+        self.job_panel.show()
+    
+    def _refresh_job_status(self):
+        running, queued = self.job_manager.counts()
+        if running or queued:
+            text = f"后台任务: {running} 运行" + (f" / {queued} 排队" if queued else "")
+        else:
+            text = ""
+        self.jobs_label.config(text=text)
+        self.root.after(1000, self._refresh_job_status)
+    
+    def _dump_trace(self):
+        from tkinter import filedialog
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".json",
+            filetypes=[("JSON 文件", "*.json"), ("所有文件", "*.*")],
+            title="保存性能追踪"
+        )
+        if not file_path:
+            return
+        try:
+            count = Instrumentation.dump_trace(file_path)
+            self.log_status(f"已保存 {count:,} 条性能追踪记录: {file_path}", "success")
+        except Exception as e:
+            self.log_status(f"保存性能追踪失败: {str(e)}", "error")
+    
+    def _on_close(self):
+        self.job_manager.shutdown()
+        trace_path = os.environ.get(TRACE_ENV)
+        if trace_path:
+            Instrumentation.dump_trace(trace_path)
+        if Instrumentation.profiling_enabled():
+            Instrumentation.stop_profiling()
+        self.root.destroy()
     
     def _show_help(self):
-        help_text = """快捷键说明:
+        stats = self.result_cache.stats()
+        help_text = f"""快捷键说明:
 Ctrl+C - 复制当前结果
 Ctrl+S - 导出当前结果
 Ctrl+R - 重新计算当前标签页
-F1 - 显示帮助信息"""
+F1 - 显示帮助信息
+F2 - 保存性能追踪 (JSON)
+F3 - 查看后台任务
+
+结果缓存:
+已缓存 {stats['entries']:,} 项，占用 {stats['bytes'] / 1024 / 1024:.1f} / {stats['max_bytes'] / 1024 / 1024:.0f} MB
+命中 {stats['hits']:,} 次，未命中 {stats['misses']:,} 次，命中率 {stats['hit_rate']:.0%}，淘汰 {stats['evictions']:,} 项"""
         from tkinter import messagebox
         messagebox.showinfo("快捷键帮助", help_text)
 
 
 if __name__ == "__main__":
+    import multiprocessing
+    multiprocessing.freeze_support()
+    if Instrumentation.profiling_enabled():
+        Instrumentation.start_profiling()
     root = tk.Tk()
     app = IPv6SubnetCalculator(root)
     root.mainloop()
\ No newline at end of file
@@ -0,0 +1,310 @@
+import os
+import sqlite3
+import threading
+import time
+from address_format import AddressFormatter
+from export_writer import open_input
+
+
+DB_ENV = "IPV6_PLANNER_DB"
+DEFAULT_DB_PATH = os.path.join(os.path.expanduser("~"), ".ipv6_planner", "plans.db")
+IMPORT_BATCH_ROWS = 50000
+QUERY_LIMIT = 100000
+CACHE_KB = 65536
+
+BIAS = 1 << 63
+LOW_MASK = (1 << 64) - 1
+ALL_ONES = (1 << 128) - 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS allocations (
+    id INTEGER PRIMARY KEY,
+    start_hi INTEGER NOT NULL,
+    start_lo INTEGER NOT NULL,
+    end_hi INTEGER NOT NULL,
+    end_lo INTEGER NOT NULL,
+    prefixlen INTEGER NOT NULL,
+    parent_id INTEGER,
+    owner TEXT NOT NULL DEFAULT '',
+    tags TEXT NOT NULL DEFAULT '',
+    created REAL NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_allocations_start ON allocations (start_hi, start_lo, prefixlen);
+CREATE INDEX IF NOT EXISTS idx_allocations_parent ON allocations (parent_id);
+"""
+
+COLUMNS = "id, start_hi, start_lo, prefixlen, parent_id, owner, tags"
+
+
+def split_value(value):
+    return (value >> 64) - BIAS, (value & LOW_MASK) - BIAS
+
+
+def join_value(hi, lo):
+    return ((hi + BIAS) << 64) | (lo + BIAS)
+
+
+class Allocation:
+    __slots__ = ("allocation_id", "start", "prefixlen", "parent_id", "owner", "tags")
+    
+    def __init__(self, allocation_id, start, prefixlen, parent_id, owner, tags):
+        self.allocation_id = allocation_id
+        self.start = start
+        self.prefixlen = prefixlen
+        self.parent_id = parent_id
+        self.owner = owner
+        self.tags = tags
+    
+    @classmethod
+    def from_row(cls, row):
+        allocation_id, start_hi, start_lo, prefixlen, parent_id, owner, tags = row
+        return cls(allocation_id, join_value(start_hi, start_lo), prefixlen, parent_id, owner, tags)
+    
+    @property
+    def end(self):
+        return self.start | (ALL_ONES >> self.prefixlen)
+    
+    def prefix_text(self):
+        return f"{AddressFormatter.compressed(self.start)}/{self.prefixlen}"
+    
+    def row_text(self):
+        text = f"#{self.allocation_id}  {self.prefix_text()}"
+        if self.owner:
+            text += f"  {self.owner}"
+        if self.tags:
+            text += f"  [{self.tags}]"
+        return text
+
+
+class PlanStore:
+    def __init__(self, path=None):
+        self.path = path or os.environ.get(DB_ENV) or DEFAULT_DB_PATH
+        self.local = threading.local()
+        self.connections = []
+        self.lock = threading.Lock()
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        self._connection().executescript(SCHEMA)
+    
+    def _connection(self):
+        connection = getattr(self.local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(f"PRAGMA cache_size=-{CACHE_KB}")
+            self.local.connection = connection
+            with self.lock:
+                self.connections.append(connection)
+        return connection
+    
+    def close(self):
+        with self.lock:
+            connections, self.connections = self.connections, []
+        for connection in connections:
+            connection.close()
+        self.local = threading.local()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
+    
+    @staticmethod
+    def _bounds(start, prefixlen):
+        if not 0 <= prefixlen <= 128:
+            raise ValueError("前缀长度必须在 0-128 之间")
+        start &= ALL_ONES ^ (ALL_ONES >> prefixlen)
+        return start, start | (ALL_ONES >> prefixlen)
+    
+    def count(self):
+        return self._connection().execute("SELECT COUNT(*) FROM allocations").fetchone()[0]
+    
+    def get(self, allocation_id):
+        row = self._connection().execute(f"SELECT {COLUMNS} FROM allocations WHERE id = ?", (allocation_id,)).fetchone()
+        return Allocation.from_row(row) if row else None
+    
+    def find(self, start, prefixlen):
+        start, _ = self._bounds(start, prefixlen)
+        row = self._connection().execute(
+            f"SELECT {COLUMNS} FROM allocations WHERE start_hi = ? AND start_lo = ? AND prefixlen = ?",
+            (*split_value(start), prefixlen)
+        ).fetchone()
+        return Allocation.from_row(row) if row else None
+    
+    def add(self, start, prefixlen, owner="", tags=""):
+        start, end = self._bounds(start, prefixlen)
+        if self.find(start, prefixlen) is not None:
+            raise ValueError(f"{AddressFormatter.compressed(start)}/{prefixlen} 已在规划库中")
+        
+        covering = self.covering(start, max_prefixlen=prefixlen - 1)
+        parent_id = covering[0].allocation_id if covering else None
+        connection = self._connection()
+        with connection:
+            cursor = connection.execute(
+                "INSERT INTO allocations (start_hi, start_lo, end_hi, end_lo, prefixlen, parent_id, owner, tags, created) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (*split_value(start), *split_value(end), prefixlen, parent_id, owner, tags, time.time())
+            )
+            allocation_id = cursor.lastrowid
+            connection.execute(
+                "UPDATE allocations SET parent_id = ? "
+                "WHERE (start_hi, start_lo) BETWEEN (?, ?) AND (?, ?) AND prefixlen > ? AND parent_id IS ?",
+                (allocation_id, *split_value(start), *split_value(end), prefixlen, parent_id)
+            )
+        return allocation_id
+    
+    def remove(self, allocation_id):
+        allocation = self.get(allocation_id)
+        if allocation is None:
+            return False
+        connection = self._connection()
+        with connection:
+            connection.execute("UPDATE allocations SET parent_id = ? WHERE parent_id = ?",
+                               (allocation.parent_id, allocation_id))
+            connection.execute("DELETE FROM allocations WHERE id = ?", (allocation_id,))
+        return True
+    
+    def covering(self, address, max_prefixlen=128):
+        connection = self._connection()
+        allocations = []
+        for prefixlen in range(min(max_prefixlen, 128), -1, -1):
+            start = address & (ALL_ONES ^ (ALL_ONES >> prefixlen))
+            row = connection.execute(
+                f"SELECT {COLUMNS} FROM allocations WHERE start_hi = ? AND start_lo = ? AND prefixlen = ?",
+                (*split_value(start), prefixlen)
+            ).fetchone()
+            if row:
+                allocations.append(Allocation.from_row(row))
+        return allocations
+    
+    def count_within(self, start, prefixlen):
+        start, end = self._bounds(start, prefixlen)
+        return self._connection().execute(
+            "SELECT COUNT(*) FROM allocations WHERE (start_hi, start_lo) BETWEEN (?, ?) AND (?, ?) AND prefixlen >= ?",
+            (*split_value(start), *split_value(end), prefixlen)
+        ).fetchone()[0]
+    
+    def within(self, start, prefixlen, limit=QUERY_LIMIT):
+        start, end = self._bounds(start, prefixlen)
+        rows = self._connection().execute(
+            f"SELECT {COLUMNS} FROM allocations "
+            "WHERE (start_hi, start_lo) BETWEEN (?, ?) AND (?, ?) AND prefixlen >= ? "
+            "ORDER BY start_hi, start_lo, prefixlen LIMIT ?",
+            (*split_value(start), *split_value(end), prefixlen, limit)
+        ).fetchall()
+        return [Allocation.from_row(row) for row in rows]
+    
+    def import_rows(self, rows, should_stop=None, on_progress=None, batch_rows=IMPORT_BATCH_ROWS):
+        connection = self._connection()
+        created = time.time()
+        imported = 0
+        duplicates = 0
+        
+        def flush(batch):
+            nonlocal imported, duplicates
+            with connection:
+                before = connection.total_changes
+                connection.executemany(
+                    "INSERT OR IGNORE INTO allocations (start_hi, start_lo, end_hi, end_lo, prefixlen, owner, tags, created) "
+                    f"VALUES (?, ?, ?, ?, ?, ?, ?, {created})",
+                    batch
+                )
+                inserted = connection.total_changes - before
+            imported += inserted
+            duplicates += len(batch) - inserted
+        
+        low = ALL_ONES
+        high = 0
+        batch = []
+        for start, prefixlen, owner, tags in rows:
+            start, end = self._bounds(start, prefixlen)
+            if start < low:
+                low = start
+            if end > high:
+                high = end
+            batch.append(((start >> 64) - BIAS, (start & LOW_MASK) - BIAS,
+                          (end >> 64) - BIAS, (end & LOW_MASK) - BIAS, prefixlen, owner, tags))
+            if len(batch) >= batch_rows:
+                flush(batch)
+                batch = []
+                if on_progress:
+                    on_progress(imported + duplicates)
+                if should_stop and should_stop():
+                    break
+        else:
+            if batch:
+                flush(batch)
+                if on_progress:
+                    on_progress(imported + duplicates)
+        
+        if imported:
+            self.relink_parents(low, high)
+        return imported, duplicates
+    
+    @staticmethod
+    def parse_line(line):
+        parsed = AddressFormatter.parse_prefix_line(line)
+        if parsed is None:
+            return None
+        start, prefixlen, labels = parsed
+        return start, prefixlen, labels[0] if labels else "", ";".join(labels[1:])
+    
+    def import_file(self, file_path, should_stop=None, on_progress=None):
+        skipped = 0
+        start_time = time.time()
+        
+        def parsed_rows(f):
+            nonlocal skipped
+            parse_line = PlanStore.parse_line
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                try:
+                    parsed = parse_line(line)
+                except ValueError:
+                    parsed = None
+                if parsed is None:
+                    skipped += 1
+                    continue
+                yield parsed
+        
+        with open_input(file_path) as f:
+            imported, duplicates = self.import_rows(parsed_rows(f), should_stop, on_progress)
+        
+        seconds = time.time() - start_time
+        return {
+            "imported": imported,
+            "duplicates": duplicates,
+            "skipped": skipped,
+            "seconds": seconds,
+            "rate": (imported + duplicates) / seconds if seconds > 0 else 0.0,
+        }
+    
+    def relink_parents(self, low=0, high=ALL_ONES):
+        connection = self._connection()
+        updates = []
+        stack = [[allocation.allocation_id, *split_value(allocation.end)]
+                 for allocation in reversed(self.covering(low)) if allocation.start < low]
+        for allocation_id, start_hi, start_lo, end_hi, end_lo, parent_id in connection.execute(
+            "SELECT id, start_hi, start_lo, end_hi, end_lo, parent_id FROM allocations "
+            "WHERE (start_hi, start_lo) BETWEEN (?, ?) AND (?, ?) ORDER BY start_hi, start_lo, prefixlen",
+            (*split_value(low), *split_value(high))
+        ):
+            while stack:
+                top = stack[-1]
+                if top[1] > start_hi or (top[1] == start_hi and top[2] >= start_lo):
+                    break
+                stack.pop()
+            new_parent = stack[-1][0] if stack else None
+            if new_parent != parent_id:
+                updates.append((new_parent, allocation_id))
+            stack.append([allocation_id, end_hi, end_lo])
+        
+        if updates:
+            with connection:
+                connection.executemany("UPDATE allocations SET parent_id = ? WHERE id = ?", updates)
+        return len(updates)
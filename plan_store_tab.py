@@ -0,0 +1,267 @@
+import ipaddress
+import tkinter as tk
+from tkinter import ttk, messagebox
+from utils import UIUtils
+from virtual_list import VirtualListView
+from address_format import AddressFormatter
+from planner_engine import PlannerEngine
+from progress_channel import ProgressChannel
+from job_manager import PRIORITY_INTERACTIVE, PRIORITY_BATCH
+from instrumentation import Instrumentation
+from plan_store import PlanStore, QUERY_LIMIT
+
+
+class PlanStoreTab:
+    def __init__(self, parent, root, log_status_func, job_manager):
+        self.parent = parent
+        self.root = root
+        self.log_status = log_status_func
+        self.job_manager = job_manager
+        self.store = None
+        self.ipv6_entry7 = None
+        self.prefix_entry7 = None
+        self.owner_entry = None
+        self.tags_entry = None
+        self.result_text7 = None
+        self.allocation_list = None
+        self.create_tab()
+    
+    def create_tab(self):
+        frame = ttk.Frame(self.parent, padding="25")
+        frame.pack(fill=tk.BOTH, expand=True)
+        
+        self.ipv6_entry7 = UIUtils.create_input_row(frame, "IPv6 地址:", "2026:db8::", 0, None, placeholder="例如: 2026:db8:1200::")
+        self.prefix_entry7 = UIUtils.create_input_row(frame, "前缀长度:", "40", 1, None, placeholder="0-128")
+        self.owner_entry = UIUtils.create_input_row(frame, "负责人:", "", 2, None)
+        self.tags_entry = UIUtils.create_input_row(frame, "标签:", "", 3, None)
+        UIUtils.create_button_frame(frame, 4, [
+            ("查询包含", self.query_within),
+            ("查询覆盖", self.query_covering),
+            ("添加", self.add_allocation),
+            ("删除", self.remove_allocation),
+            ("批量导入", self.import_allocations),
+            ("复制结果", self.copy_results)
+        ], tooltips=["列出该前缀范围内的全部分配", "列出覆盖该地址的全部分配（由具体到宽泛）", "将该前缀及负责人、标签保存到规划库",
+                     "从规划库删除该前缀", "从文件批量导入前缀（每行: 前缀,负责人,标签...）", "复制查询结果到剪贴板"])
+        self.result_text7 = UIUtils.create_result_display(frame, 5, "result_text7", height=8)
+        self.allocation_list = VirtualListView(frame, height=10)
+        self.allocation_list.grid(row=6, column=0, columnspan=3, sticky=tk.NSEW)
+    
+    def _store(self):
+        if self.store is None:
+            self.store = PlanStore()
+        return self.store
+    
+    def _network(self):
+        network = PlannerEngine.parse_network(self.ipv6_entry7.get(), self.prefix_entry7.get())
+        return int(network.network_address), network.prefixlen
+    
+    def _run_query(self, name, query, show, action="查询"):
+        channel = ProgressChannel(self.root, lambda value: None).start()
+        
+        def query_job(job):
+            try:
+                with Instrumentation.span(name):
+                    result = query()
+                channel.call(lambda: show(result))
+            except Exception as e:
+                error_msg = str(e)
+                channel.call(lambda: messagebox.showerror("错误", f"{action}失败: {error_msg}"))
+                channel.call(lambda: self.log_status(f"{action}失败: {error_msg}", "error"))
+                raise
+            finally:
+                channel.close()
+        
+        try:
+            self.job_manager.submit(name, query_job, PRIORITY_INTERACTIVE)
+        except Exception:
+            channel.close()
+            raise
+    
+    def query_within(self):
+        try:
+            start, prefixlen = self._network()
+            store = self._store()
+            
+            def query():
+                return store.count_within(start, prefixlen), store.within(start, prefixlen)
+            
+            def show(result):
+                total, allocations = result
+                self._show_allocations(f"{AddressFormatter.compressed(start)}/{prefixlen} 范围内的分配", total, allocations)
+            
+            UIUtils.clear_error_highlight(self.ipv6_entry7)
+            self._run_query("store.within", query, show)
+        
+        except (ipaddress.AddressValueError, ValueError) as e:
+            UIUtils.highlight_error(self.ipv6_entry7)
+            messagebox.showerror("错误", f"输入无效: {str(e)}")
+            self.log_status(f"错误: {str(e)}", "error")
+        except Exception as e:
+            messagebox.showerror("错误", f"查询失败: {str(e)}")
+            self.log_status(f"错误: {str(e)}", "error")
+    
+    def query_covering(self):
+        try:
+            address = int(ipaddress.IPv6Address(UIUtils.clean_ipv6_input(self.ipv6_entry7.get())))
+            store = self._store()
+            
+            def show(allocations):
+                self._show_allocations(f"覆盖 {AddressFormatter.compressed(address)} 的分配", len(allocations), allocations)
+            
+            UIUtils.clear_error_highlight(self.ipv6_entry7)
+            self._run_query("store.covering", lambda: store.covering(address), show)
+        
+        except (ipaddress.AddressValueError, ValueError) as e:
+            UIUtils.highlight_error(self.ipv6_entry7)
+            messagebox.showerror("错误", f"输入无效: {str(e)}")
+            self.log_status(f"错误: {str(e)}", "error")
+        except Exception as e:
+            messagebox.showerror("错误", f"查询失败: {str(e)}")
+            self.log_status(f"错误: {str(e)}", "error")
+    
+    def _show_allocations(self, title, total, allocations):
+        self.result_text7.delete(1.0, tk.END)
+        self.result_text7.insert(tk.END, "=" * 60 + "\n")
+        self.result_text7.insert(tk.END, f"{title}\n")
+        self.result_text7.insert(tk.END, "=" * 60 + "\n\n")
+        self.result_text7.insert(tk.END, f"规划库: {self.store.path}\n")
+        self.result_text7.insert(tk.END, f"匹配分配: {total:,}\n")
+        if total > len(allocations):
+            self.result_text7.insert(tk.END, f"列表只显示前 {QUERY_LIMIT:,} 条\n")
+        
+        self.allocation_list.set_source(len(allocations), lambda i: allocations[i].row_text())
+        self.log_status(f"查询完成，共 {total:,} 条分配", "success")
+    
+    def add_allocation(self):
+        try:
+            start, prefixlen = self._network()
+            owner = self.owner_entry.get().strip()
+            tags = self.tags_entry.get().strip()
+            store = self._store()
+            
+            def add():
+                allocation = store.get(store.add(start, prefixlen, owner, tags))
+                parent = store.get(allocation.parent_id) if allocation.parent_id else None
+                return allocation, parent
+            
+            def show(result):
+                allocation, parent = result
+                self.result_text7.delete(1.0, tk.END)
+                self.result_text7.insert(tk.END, f"已添加: {allocation.row_text()}\n")
+                self.result_text7.insert(tk.END, f"上级分配: {parent.row_text() if parent else '无'}\n")
+                self.log_status(f"已保存到规划库: {allocation.prefix_text()}", "success")
+            
+            UIUtils.clear_error_highlight(self.ipv6_entry7)
+            self._run_query("store.add", add, show, action="添加")
+        
+        except (ipaddress.AddressValueError, ValueError) as e:
+            UIUtils.highlight_error(self.ipv6_entry7)
+            messagebox.showerror("错误", f"添加失败: {str(e)}")
+            self.log_status(f"错误: {str(e)}", "error")
+        except Exception as e:
+            messagebox.showerror("错误", f"添加失败: {str(e)}")
+            self.log_status(f"错误: {str(e)}", "error")
+    
+    def remove_allocation(self):
+        try:
+            start, prefixlen = self._network()
+            store = self._store()
+            
+            def confirm(allocation):
+                if allocation is None:
+                    messagebox.showinfo("提示", f"规划库中没有 {AddressFormatter.compressed(start)}/{prefixlen}")
+                    return
+                if not messagebox.askyesno("确认删除", f"确定从规划库删除 {allocation.row_text()} 吗？\n\n其下级分配会归属到它的上级分配"):
+                    return
+                self._run_query("store.remove", lambda: store.remove(allocation.allocation_id),
+                                lambda removed: self.log_status(f"已删除: {allocation.prefix_text()}", "success"),
+                                action="删除")
+            
+            UIUtils.clear_error_highlight(self.ipv6_entry7)
+            self._run_query("store.find", lambda: store.find(start, prefixlen), confirm, action="删除")
+        
+        except (ipaddress.AddressValueError, ValueError) as e:
+            UIUtils.highlight_error(self.ipv6_entry7)
+            messagebox.showerror("错误", f"删除失败: {str(e)}")
+            self.log_status(f"错误: {str(e)}", "error")
+        except Exception as e:
+            messagebox.showerror("错误", f"删除失败: {str(e)}")
+            self.log_status(f"错误: {str(e)}", "error")
+    
+    def import_allocations(self):
+        try:
+            from tkinter import filedialog
+            
+            file_path = filedialog.askopenfilename(
+                filetypes=[("前缀列表", "*.txt *.csv *.gz *.xz *.bz2"), ("所有文件", "*.*")],
+                title="选择要导入的分配表（每行: 前缀,负责人,标签...）"
+            )
+            if not file_path:
+                return
+            
+            if self.job_manager.find_active(file_path) is not None:
+                messagebox.showwarning("警告", "该文件正在导入中，请稍候...")
+                return
+            
+            store = self._store()
+            channel = ProgressChannel(self.root, lambda rows: self.log_status(f"已导入 {rows:,} 行...")).start()
+            
+            def import_job(job):
+                try:
+                    def on_progress(rows):
+                        job.report(rows)
+                        channel.post(rows)
+                    
+                    with Instrumentation.span("store.import"):
+                        stats = store.import_file(file_path, should_stop=job.token, on_progress=on_progress)
+                    if job.token.is_cancelled():
+                        channel.call(lambda: self.log_status(f"导入已取消，已写入 {stats['imported']:,} 条分配", "warning"))
+                    else:
+                        channel.call(lambda: self._display_import(stats, file_path))
+                except Exception as e:
+                    error_msg = str(e)
+                    channel.call(lambda: messagebox.showerror("错误", f"导入失败: {error_msg}"))
+                    channel.call(lambda: self.log_status(f"导入失败: {error_msg}", "error"))
+                    raise
+                finally:
+                    channel.close()
+            
+            try:
+                self.job_manager.submit("导入规划库", import_job, PRIORITY_BATCH, unit="行", key=file_path)
+            except Exception:
+                channel.close()
+                raise
+            self.log_status("正在导入...")
+        
+        except Exception as e:
+            messagebox.showerror("错误", f"导入失败: {str(e)}")
+            self.log_status(f"错误: {str(e)}", "error")
+    
+    def _display_import(self, stats, file_path):
+        self.result_text7.delete(1.0, tk.END)
+        self.result_text7.insert(tk.END, "=" * 60 + "\n")
+        self.result_text7.insert(tk.END, "批量导入\n")
+        self.result_text7.insert(tk.END, "=" * 60 + "\n\n")
+        self.result_text7.insert(tk.END, f"来源文件: {file_path}\n")
+        self.result_text7.insert(tk.END, f"新增分配: {stats['imported']:,}\n")
+        self.result_text7.insert(tk.END, f"已存在: {stats['duplicates']:,}\n")
+        self.result_text7.insert(tk.END, f"无法识别的行: {stats['skipped']:,}\n")
+        self.result_text7.insert(tk.END, f"耗时: {stats['seconds']:.2f} 秒\n")
+        self.result_text7.insert(tk.END, f"速率: {stats['rate']:,.0f} 行/秒\n")
+        self.result_text7.insert(tk.END, f"规划库共 {self.store.count():,} 条分配\n")
+        
+        self.log_status(f"导入完成: {file_path}", "success")
+    
+    def copy_results(self):
+        try:
+            content = self.result_text7.get(1.0, tk.END) + "\n" + self.allocation_list.get_preview_text(unit="条分配")
+            if not content.strip():
+                self.log_status("没有可复制的内容")
+                return
+            
+            self.root.clipboard_clear()
+            self.root.clipboard_append(content)
+            self.log_status("已复制查询结果", "success")
+        except Exception as e:
+            self.log_status(f"复制失败: {str(e)}")
\ No newline at end of file
@@ -0,0 +1,229 @@
+import ipaddress
+import re
+from instrumentation import Instrumentation
+
+
+MAC_PATTERN = re.compile(r'^([0-9A-Fa-f]{2}[:-]){5}[0-9A-Fa-f]{2}$')
+BRACKET_PATTERN = re.compile(r'\[([0-9a-fA-F:%]+)\]')
+
+
+class PlannerEngine:
+    @staticmethod
+    def clean_ipv6_input(input_str):
+        cleaned = input_str.strip()
+        
+        bracket_match = BRACKET_PATTERN.search(cleaned)
+        if bracket_match:
+            cleaned = bracket_match.group(1)
+        
+        cleaned = cleaned.split('/', 1)[0]
+        
+        return cleaned
+    
+    @staticmethod
+    def parse_prefix(prefix):
+        prefix = int(str(prefix).strip())
+        if not 0 <= prefix <= 128:
+            raise ValueError("前缀长度必须在 0-128 之间")
+        return prefix
+    
+    @staticmethod
+    def parse_network(ipv6_input, prefix):
+        with Instrumentation.span("engine.parse"):
+            ipv6_str = PlannerEngine.clean_ipv6_input(ipv6_input)
+            prefix = PlannerEngine.parse_prefix(prefix)
+            return ipaddress.IPv6Network(f"{ipv6_str}/{prefix}", strict=False)
+    
+    @staticmethod
+    def host_count(network):
+        if network.prefixlen == 127:
+            return 2
+        if network.prefixlen == 128:
+            return 1
+        return network.num_addresses - 2 if network.num_addresses > 2 else 0
+    
+    @staticmethod
+    def host_address(network, index):
+        if network.prefixlen == 128:
+            return network.network_address
+        return network.network_address + index
+    
+    @staticmethod
+    def basic_info(ipv6_input, prefix):
+        with Instrumentation.span("engine.parse"):
+            ipv6_str = PlannerEngine.clean_ipv6_input(ipv6_input)
+            prefix = PlannerEngine.parse_prefix(prefix)
+            
+            network = ipaddress.IPv6Network(f"{ipv6_str}/{prefix}", strict=False)
+            input_address = ipaddress.IPv6Address(ipv6_str)
+        
+        return {
+            "input_address": input_address,
+            "network": network,
+            "network_address": network.network_address,
+            "broadcast_address": network.broadcast_address,
+            "prefix": prefix,
+            "total_addresses": network.num_addresses,
+        }
+    
+    @staticmethod
+    def host_addresses(ipv6_input, prefix, limit=100, stop_check=None):
+        network = PlannerEngine.parse_network(ipv6_input, prefix)
+        prefix = network.prefixlen
+        total_hosts = PlannerEngine.host_count(network)
+        
+        if prefix == 127:
+            hosts = [network.network_address + 1, network.network_address + 2]
+        elif prefix == 128:
+            hosts = [network.network_address]
+        else:
+            hosts = []
+            for i in range(1, min(limit, network.num_addresses - 1) + 1):
+                if stop_check and stop_check():
+                    return None
+                hosts.append(network.network_address + i)
+        
+        return {
+            "network": network,
+            "prefix": prefix,
+            "total_hosts": total_hosts,
+            "hosts": hosts,
+        }
+    
+    @staticmethod
+    def division_prefix(current_prefix, subnet_count):
+        if subnet_count <= 0:
+            raise ValueError("划分网段数量必须大于 0")
+        
+        new_prefix = current_prefix
+        max_subnets = 1
+        while max_subnets < subnet_count and new_prefix < 128:
+            new_prefix += 1
+            max_subnets = 2 ** (new_prefix - current_prefix)
+        
+        if new_prefix == 128 and max_subnets < subnet_count:
+            raise ValueError("无法划分这么多子网，已达到最大前缀长度 /128")
+        
+        return new_prefix, max_subnets
+    
+    @staticmethod
+    def _check_subnet_prefix(network, new_prefix):
+        if not network.prefixlen <= new_prefix <= 128:
+            raise ValueError(f"子网前缀必须在 /{network.prefixlen} 到 /128 之间")
+        return 1 << (new_prefix - network.prefixlen)
+    
+    @staticmethod
+    def nth_subnet(network, new_prefix, index):
+        total = PlannerEngine._check_subnet_prefix(network, new_prefix)
+        if not 1 <= index <= total:
+            raise ValueError(f"子网序号必须在 1 到 {total:,} 之间")
+        network_int = int(network.network_address) + ((index - 1) << (128 - new_prefix))
+        return ipaddress.IPv6Network((network_int, new_prefix))
+    
+    @staticmethod
+    def subnet_index(network, new_prefix, subnet):
+        PlannerEngine._check_subnet_prefix(network, new_prefix)
+        if isinstance(subnet, ipaddress.IPv6Network):
+            address_int = int(subnet.network_address)
+        else:
+            address_int = int(ipaddress.IPv6Address(subnet))
+        if not int(network.network_address) <= address_int <= int(network.broadcast_address):
+            raise ValueError(f"{subnet} 不属于 {network}")
+        return ((address_int - int(network.network_address)) >> (128 - new_prefix)) + 1
+    
+    @staticmethod
+    def subnet_slice(network, new_prefix, start_index, end_index):
+        total = PlannerEngine._check_subnet_prefix(network, new_prefix)
+        if not 1 <= start_index <= end_index <= total:
+            raise ValueError(f"子网序号范围必须在 1 到 {total:,} 之间")
+        base = int(network.network_address)
+        shift = 128 - new_prefix
+        return [
+            ipaddress.IPv6Network((base + ((index - 1) << shift), new_prefix))
+            for index in range(start_index, end_index + 1)
+        ]
+    
+    @staticmethod
+    def subnet_division(ipv6_input, current_prefix, subnet_count, limit=100):
+        network = PlannerEngine.parse_network(ipv6_input, current_prefix)
+        subnet_count = int(str(subnet_count).strip())
+        new_prefix, max_subnets = PlannerEngine.division_prefix(network.prefixlen, subnet_count)
+        
+        subnets = []
+        if limit > 0:
+            subnets = PlannerEngine.subnet_slice(network, new_prefix, 1, min(limit, max_subnets))
+        
+        return {
+            "network": network,
+            "current_prefix": network.prefixlen,
+            "new_prefix": new_prefix,
+            "max_subnets": max_subnets,
+            "subnet_count": subnet_count,
+            "subnets": subnets,
+        }
+    
+    @staticmethod
+    def subnet_membership(ipv6_input, prefix):
+        with Instrumentation.span("engine.parse"):
+            ipv6_str = PlannerEngine.clean_ipv6_input(ipv6_input)
+            prefix = PlannerEngine.parse_prefix(prefix)
+            
+            address = ipaddress.IPv6Address(ipv6_str)
+            network = ipaddress.IPv6Network(f"{ipv6_str}/{prefix}", strict=False)
+        
+        if prefix == 127:
+            available_hosts = 2
+        elif prefix == 128:
+            available_hosts = 0
+        else:
+            available_hosts = network.num_addresses - 2
+        
+        address_offset = int(address) - int(network.network_address)
+        
+        return {
+            "address": address,
+            "network": network,
+            "prefix": prefix,
+            "network_address": network.network_address,
+            "broadcast_address": network.broadcast_address,
+            "available_hosts": available_hosts,
+            "host_bits": 128 - prefix,
+            "address_index": address_offset + 1,
+        }
+    
+    @staticmethod
+    def eui64(mac_input, prefix_input):
+        mac_input = mac_input.strip()
+        
+        if not MAC_PATTERN.match(mac_input):
+            raise ValueError("MAC 地址格式无效，请使用 XX:XX:XX:XX:XX:XX 或 XX-XX-XX-XX-XX-XX 格式")
+        
+        mac_str = mac_input.replace(":", "").replace("-", "")
+        if len(mac_str) != 12:
+            raise ValueError("MAC 地址必须是12位十六进制数字 (例如: 001122334455)")
+        
+        eui64 = mac_str[:6] + "FFFE" + mac_str[6:]
+        
+        mac_bytes = bytearray(bytes.fromhex(eui64))
+        mac_bytes[0] = mac_bytes[0] ^ 0x02
+        eui64 = mac_bytes.hex()
+        
+        eui64_formatted = ":".join([eui64[i:i+4] for i in range(0, len(eui64), 4)])
+        
+        prefix = prefix_input.strip()
+        if not prefix.endswith("/64"):
+            raise ValueError("前缀必须包含 /64 例如: 2026:db8::/64")
+        
+        prefix_without_len = prefix.split("/")[0]
+        
+        if prefix_without_len.endswith("::"):
+            ipv6_address = prefix_without_len + eui64_formatted
+        else:
+            ipv6_address = prefix_without_len + "::" + eui64_formatted
+        
+        return {
+            "mac": mac_input,
+            "eui64": eui64_formatted,
+            "prefix": prefix_without_len,
+            "address": ipaddress.IPv6Address(ipv6_address),
+        }
@@ -0,0 +1,118 @@
+import time
+from export_writer import BufferedExportWriter, open_input
+from address_format import AddressFormatter
+
+
+ALL_ONES = (1 << 128) - 1
+CHUNK_LINES = 65536
+
+
+class PrefixAggregator:
+    @staticmethod
+    def parse_prefix(line):
+        parsed = AddressFormatter.parse_prefix_line(line)
+        return None if parsed is None else parsed[:2]
+    
+    @staticmethod
+    def read_keys(file_path, should_stop=None, on_progress=None):
+        keys = []
+        skipped = 0
+        parse_prefix = PrefixAggregator.parse_prefix
+        with open_input(file_path) as f:
+            for line_number, line in enumerate(f, 1):
+                if line.startswith("#"):
+                    continue
+                try:
+                    parsed = parse_prefix(line)
+                except ValueError:
+                    parsed = None
+                if parsed is None:
+                    if line.strip():
+                        skipped += 1
+                    continue
+                start, length = parsed
+                keys.append(((start & (ALL_ONES ^ (ALL_ONES >> length))) << 8) | length)
+                
+                if line_number % CHUNK_LINES == 0:
+                    if on_progress:
+                        on_progress(len(keys))
+                    if should_stop and should_stop():
+                        break
+        return keys, skipped
+    
+    @staticmethod
+    def merged_ranges(keys):
+        keys.sort()
+        range_start = None
+        range_end = -2
+        for key in keys:
+            start = key >> 8
+            end = start | (ALL_ONES >> (key & 0xFF))
+            if start <= range_end + 1:
+                if end > range_end:
+                    range_end = end
+                continue
+            if range_start is not None:
+                yield range_start, range_end
+            range_start = start
+            range_end = end
+        if range_start is not None:
+            yield range_start, range_end
+    
+    @staticmethod
+    def range_blocks(start, end):
+        while start <= end:
+            size = start & -start or 1 << 128
+            while size > end - start + 1:
+                size >>= 1
+            yield start, 129 - size.bit_length()
+            start += size
+    
+    @staticmethod
+    def aggregate(keys):
+        for start, end in PrefixAggregator.merged_ranges(keys):
+            yield from PrefixAggregator.range_blocks(start, end)
+    
+    @staticmethod
+    def aggregate_networks(networks):
+        keys = [(int(network.network_address) << 8) | network.prefixlen for network in networks]
+        return list(PrefixAggregator.aggregate(keys))
+    
+    @staticmethod
+    def aggregate_file(input_path, output_path, should_stop=None, on_progress=None):
+        start_time = time.time()
+        keys, skipped = PrefixAggregator.read_keys(input_path, should_stop, on_progress)
+        inputs = len(keys)
+        if should_stop and should_stop():
+            return None
+        read_seconds = time.time() - start_time
+        
+        outputs = 0
+        addresses = 0
+        compressed = AddressFormatter.compressed
+        with BufferedExportWriter(output_path) as writer:
+            rows = []
+            for start, length in PrefixAggregator.aggregate(keys):
+                rows.append(f"{compressed(start)}/{length}\n")
+                addresses += 1 << (128 - length)
+                if len(rows) >= CHUNK_LINES:
+                    writer.write_text("".join(rows))
+                    outputs += len(rows)
+                    rows = []
+                    if should_stop and should_stop():
+                        break
+            if rows:
+                writer.write_text("".join(rows))
+                outputs += len(rows)
+        
+        elapsed = time.time() - start_time
+        return {
+            "inputs": inputs,
+            "outputs": outputs,
+            "skipped": skipped,
+            "addresses": addresses,
+            "read_seconds": read_seconds,
+            "merge_seconds": elapsed - read_seconds,
+            "seconds": elapsed,
+            "rate": inputs / elapsed if elapsed > 0 else 0,
+        }
@@ -0,0 +1,209 @@
+import ipaddress
+import sys
+import time
+from export_writer import BufferedExportWriter, open_input
+from address_format import AddressFormatter
+
+
+class PrefixTrie:
+    def __init__(self):
+        self.keys = [0]
+        self.shifts = [128]
+        self.values = [-1]
+        self.children = [-1, -1]
+        self.prefixes = []
+        self.labels = []
+    
+    def __len__(self):
+        return len(self.prefixes)
+    
+    def _new_node(self, key, length, value):
+        self.keys.append(key)
+        self.shifts.append(128 - length)
+        self.values.append(value)
+        self.children.append(-1)
+        self.children.append(-1)
+        return len(self.keys) - 1
+    
+    def _add_prefix(self, key, length, label):
+        self.prefixes.append((key, length))
+        self.labels.append(label)
+        return len(self.prefixes) - 1
+    
+    def insert(self, network, label=""):
+        network = ipaddress.IPv6Network(network, strict=False)
+        self.insert_prefix(int(network.network_address), network.prefixlen, label)
+    
+    def insert_prefix(self, key, length, label=""):
+        key &= ((1 << 128) - 1) ^ ((1 << (128 - length)) - 1)
+        children = self.children
+        node = 0
+        while True:
+            node_length = 128 - self.shifts[node]
+            if node_length == length:
+                if self.values[node] == -1:
+                    self.values[node] = self._add_prefix(key, length, label)
+                else:
+                    self.labels[self.values[node]] = label
+                return
+            
+            slot = 2 * node + ((key >> (127 - node_length)) & 1)
+            child = children[slot]
+            if child == -1:
+                children[slot] = self._new_node(key, length, self._add_prefix(key, length, label))
+                return
+            
+            child_key = self.keys[child]
+            child_length = 128 - self.shifts[child]
+            common = min(length, child_length, 128 - (child_key ^ key).bit_length())
+            if common == child_length:
+                node = child
+                continue
+            
+            value = self._add_prefix(key, length, label)
+            if common == length:
+                new_node = self._new_node(key, length, value)
+                children[2 * new_node + ((child_key >> (127 - length)) & 1)] = child
+                children[slot] = new_node
+            else:
+                split_key = key & ~((1 << (128 - common)) - 1)
+                split_node = self._new_node(split_key, common, -1)
+                leaf = self._new_node(key, length, value)
+                children[2 * split_node + ((child_key >> (127 - common)) & 1)] = child
+                children[2 * split_node + ((key >> (127 - common)) & 1)] = leaf
+                children[slot] = split_node
+            return
+    
+    def lookup(self, address):
+        keys = self.keys
+        shifts = self.shifts
+        values = self.values
+        children = self.children
+        
+        best = values[0]
+        node = 0
+        shift = 128
+        while shift:
+            child = children[2 * node + ((address >> (shift - 1)) & 1)]
+            if child < 0:
+                break
+            shift = shifts[child]
+            if (address ^ keys[child]) >> shift:
+                break
+            node = child
+            if values[node] >= 0:
+                best = values[node]
+        return best
+    
+    def match(self, address):
+        value = self.lookup(int(address))
+        if value == -1:
+            return None
+        key, length = self.prefixes[value]
+        return ipaddress.IPv6Network((key, length)), self.labels[value]
+    
+    def node_count(self):
+        return len(self.keys)
+    
+    def memory_bytes(self):
+        columns = (self.keys, self.shifts, self.values, self.children, self.prefixes, self.labels)
+        total = sum(sys.getsizeof(column) for column in columns)
+        total += sum(sys.getsizeof(key) for key in self.keys)
+        total += sum(sys.getsizeof(prefix) for prefix in self.prefixes)
+        total += sum(sys.getsizeof(label) for label in self.labels)
+        return total
+
+
+class LongestPrefixMatcher:
+    @staticmethod
+    def parse_prefix_line(line):
+        parsed = AddressFormatter.parse_prefix_line(line)
+        if parsed is None:
+            return None
+        start, length, labels = parsed
+        return start, length, labels[0] if labels else ""
+    
+    @staticmethod
+    def build_from_file(file_path):
+        trie = PrefixTrie()
+        skipped = 0
+        start_time = time.time()
+        with open_input(file_path) as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                try:
+                    parsed = LongestPrefixMatcher.parse_prefix_line(line)
+                except ValueError:
+                    parsed = None
+                if parsed is None:
+                    skipped += 1
+                    continue
+                trie.insert_prefix(*parsed)
+        stats = {
+            "prefixes": len(trie),
+            "nodes": trie.node_count(),
+            "skipped": skipped,
+            "build_seconds": time.time() - start_time,
+            "memory_bytes": trie.memory_bytes(),
+        }
+        return trie, stats
+    
+    @staticmethod
+    def resolve_file(trie, addresses_path, output_path, should_stop=None, on_progress=None, chunk_lines=65536):
+        prefixes = trie.prefixes
+        labels = trie.labels
+        lookup = trie.lookup
+        
+        prefix_texts = {}
+        resolved = 0
+        matched = 0
+        invalid = 0
+        start_time = time.time()
+        with open_input(addresses_path) as source, \
+                BufferedExportWriter(output_path, encoding="utf-8-sig", translate_newlines=False) as writer:
+            writer.write_text("地址,最长匹配前缀,标签\r\n")
+            rows = []
+            for line in source:
+                fields = line.replace(",", " ").split()
+                if not fields:
+                    continue
+                address_text = fields[0].strip("[]")
+                try:
+                    address = AddressFormatter.parse(address_text)
+                except ValueError:
+                    invalid += 1
+                    continue
+                
+                value = lookup(address)
+                if value == -1:
+                    rows.append(f"{address_text},,\r\n")
+                else:
+                    prefix_text = prefix_texts.get(value)
+                    if prefix_text is None:
+                        key, length = prefixes[value]
+                        prefix_text = f"{AddressFormatter.compressed(key)}/{length},{labels[value]}"
+                        prefix_texts[value] = prefix_text
+                    rows.append(f"{address_text},{prefix_text}\r\n")
+                    matched += 1
+                resolved += 1
+                
+                if len(rows) >= chunk_lines:
+                    writer.write_text("".join(rows))
+                    rows = []
+                    if on_progress:
+                        on_progress(resolved)
+                    if should_stop and should_stop():
+                        break
+            if rows:
+                writer.write_text("".join(rows))
+        
+        elapsed = time.time() - start_time
+        return {
+            "resolved": resolved,
+            "matched": matched,
+            "invalid": invalid,
+            "lookup_seconds": elapsed,
+            "rate": resolved / elapsed if elapsed > 0 else 0,
+        }
@@ -0,0 +1,57 @@
+import queue
+
+
+FRAME_INTERVAL_MS = 50
+
+_PROGRESS = 0
+_CALL = 1
+
+
+class ProgressChannel:
+    def __init__(self, root, on_progress, interval_ms=FRAME_INTERVAL_MS):
+        self.root = root
+        self.on_progress = on_progress
+        self.interval_ms = interval_ms
+        self.events = queue.SimpleQueue()
+        self.closed = False
+        self.pending = None
+    
+    def start(self):
+        self.pending = self.root.after(self.interval_ms, self._drain)
+        return self
+    
+    def post(self, value):
+        self.events.put((_PROGRESS, value))
+    
+    def call(self, callback):
+        self.events.put((_CALL, callback))
+    
+    def close(self):
+        self.events.put((_CALL, self._stop))
+    
+    def _stop(self):
+        self.closed = True
+    
+    def _drain(self):
+        self.pending = None
+        latest = None
+        has_progress = False
+        try:
+            while True:
+                try:
+                    kind, value = self.events.get_nowait()
+                except queue.Empty:
+                    break
+                if kind == _PROGRESS:
+                    latest = value
+                    has_progress = True
+                    continue
+                if has_progress:
+                    has_progress = False
+                    self.on_progress(latest)
+                value()
+            if has_progress:
+                self.on_progress(latest)
+        finally:
+            if not self.closed:
+                self.pending = self.root.after(self.interval_ms, self._drain)
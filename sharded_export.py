@@ -0,0 +1,146 @@
+import multiprocessing
+import os
+import shutil
+import time
+from address_format import AddressFormatter
+from instrumentation import Instrumentation
+from export_writer import AddressExporter, BufferedExportWriter, ExportCheckpoint, compress_bytes, split_compression
+
+
+SHARD_MIN_ADDRESSES = 1000000
+SHARD_MIN_SIZE = 250000
+SHARDS_PER_WORKER = 4
+POLL_INTERVAL = 0.1
+
+_progress_counter = None
+_stop_event = None
+
+
+def _init_worker(progress_counter, stop_event):
+    global _progress_counter, _stop_event
+    _progress_counter = progress_counter
+    _stop_event = stop_event
+
+
+def _export_shard(part_path, network_int, first_index, count, compression):
+    reported = [0]
+    
+    def on_progress(done):
+        with _progress_counter.get_lock():
+            _progress_counter.value += done - reported[0]
+        reported[0] = done
+    
+    with BufferedExportWriter(part_path, compression=compression) as writer:
+        lines = AddressFormatter.numbered_lines(first_index, network_int + first_index, count)
+        return AddressExporter.pump_lines(writer, lines, count, _stop_event.is_set, on_progress)
+
+
+def append_file(target, source_path):
+    with open(source_path, 'rb') as source:
+        remaining = os.fstat(source.fileno()).st_size
+        if hasattr(os, "copy_file_range"):
+            try:
+                while remaining > 0:
+                    copied = os.copy_file_range(source.fileno(), target.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+                return
+            except OSError:
+                pass
+        shutil.copyfileobj(source, target, 16 * 1024 * 1024)
+
+
+class ShardedExporter:
+    @staticmethod
+    def default_workers():
+        return max(1, os.cpu_count() or 1)
+    
+    @staticmethod
+    def plan_shards(start_index, end_index, workers):
+        count = end_index - start_index + 1
+        shard_count = max(1, min(workers * SHARDS_PER_WORKER, count // SHARD_MIN_SIZE))
+        base, extra = divmod(count, shard_count)
+        shards = []
+        first = start_index
+        for n in range(shard_count):
+            size = base + (1 if n < extra else 0)
+            shards.append((first, size))
+            first += size
+        return shards
+    
+    @staticmethod
+    def export_hosts(file_path, network, start_index, end_index, total_hosts, workers=None,
+                     should_stop=None, on_progress=None, resume_from=None):
+        workers = workers or ShardedExporter.default_workers()
+        network_int = int(network.network_address)
+        first_index = start_index if resume_from is None else resume_from["next_index"]
+        already = first_index - start_index
+        shards = ShardedExporter.plan_shards(first_index, end_index, workers)
+        part_paths = [f"{file_path}.part{n}" for n in range(len(shards))]
+        compression = split_compression(file_path)[1]
+        checkpoint = ExportCheckpoint(file_path, {
+            "kind": "hosts",
+            "network": str(network),
+            "start_index": start_index,
+            "end_index": end_index,
+            "total_hosts": total_hosts,
+            "format": "txt",
+        })
+        
+        context = multiprocessing.get_context("spawn")
+        progress_counter = context.Value('Q', 0)
+        stop_event = context.Event()
+        
+        exported = already
+        try:
+            with context.Pool(min(workers, len(shards)), initializer=_init_worker,
+                              initargs=(progress_counter, stop_event)) as pool:
+                pending = [
+                    pool.apply_async(_export_shard, (part_path, network_int, shard_start, size, compression))
+                    for part_path, (shard_start, size) in zip(part_paths, shards)
+                ]
+                
+                if resume_from is None:
+                    checkpoint.remove()
+                    target = open(file_path, 'wb', buffering=0)
+                    header = AddressExporter.host_header(network, start_index, end_index, total_hosts)
+                    target.write(compress_bytes(header.replace("\n", os.linesep).encode("utf-8"), compression))
+                else:
+                    target = open(file_path, 'r+b', buffering=0)
+                    target.truncate(resume_from["byte_offset"])
+                    target.seek(0, os.SEEK_END)
+                
+                with target:
+                    for n, result in enumerate(pending):
+                        while not result.ready():
+                            if should_stop and should_stop():
+                                stop_event.set()
+                            if on_progress:
+                                with Instrumentation.span("export.progress"):
+                                    on_progress(already + progress_counter.value)
+                            time.sleep(POLL_INTERVAL)
+                        
+                        done = result.get()
+                        with Instrumentation.span("export.append"):
+                            append_file(target, part_paths[n])
+                        os.remove(part_paths[n])
+                        exported += done
+                        checkpoint.save(start_index + exported, target.tell())
+                        if done < shards[n][1]:
+                            break
+                        if should_stop and should_stop():
+                            stop_event.set()
+                
+                for result in pending:
+                    result.wait()
+            
+            if on_progress and not stop_event.is_set():
+                on_progress(already + progress_counter.value)
+            if exported == end_index - start_index + 1:
+                checkpoint.remove()
+            return exported
+        finally:
+            for part_path in part_paths:
+                if os.path.exists(part_path):
+                    os.remove(part_path)
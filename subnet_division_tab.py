@@ -1,25 +1,40 @@
 import ipaddress
 import tkinter as tk
-from tkinter import ttk, messagebox, filedialog
+from tkinter import ttk, messagebox
+import time
 from utils import UIUtils
+from virtual_list import VirtualListView
+from address_format import AddressFormatter
+from planner_engine import PlannerEngine
+from result_cache import ResultCache
+from live_recalc import LiveRecalculator
+from progress_channel import ProgressChannel
+from job_manager import PRIORITY_BATCH, PRIORITY_EXPORT
+from instrumentation import Instrumentation
+
+
+MAX_FREE_BLOCKS_SHOWN = 16
 
 
 class SubnetDivisionTab:
-    def __init__(self, notebook, root, log_status_func):
-        self.notebook = notebook
+    def __init__(self, parent, root, log_status_func, result_cache, job_manager):
+        self.parent = parent
         self.root = root
         self.log_status = log_status_func
+        self.result_cache = result_cache
+        self.job_manager = job_manager
         self.ipv6_entry2 = None
         self.current_prefix_entry = None
         self.subnet_count_entry = None
         self.result_text2 = None
+        self.subnet_list = None
+        self.live = None
+        self.vlsm_plan = None
+        self.vlsm_requests_text = None
         self.create_tab()
     
     def create_tab(self):
-        tab2 = ttk.Frame(self.notebook)
-        self.notebook.add(tab2, text="子网划分")
-        
-        frame = ttk.Frame(tab2, padding="25")
+        frame = ttk.Frame(self.parent, padding="25")
         frame.pack(fill=tk.BOTH, expand=True)
         
         self.ipv6_entry2 = UIUtils.create_input_row(frame, "IPv6 地址:", "2026:db8::", 0, None, placeholder="例如: 2026:db8::")
@@ -28,66 +43,28 @@ class SubnetDivisionTab:
         UIUtils.create_button_frame(frame, 3, [
             ("计算", self.calculate_subnet_division),
             ("复制结果", self.copy_subnet_division),
-            ("导出完整列表", self.export_subnets)
-        ], tooltips=["计算子网划分", "复制计算结果到剪贴板", "导出所有子网到文件"])
-        self.result_text2 = UIUtils.create_result_display(frame, 4, "result_text2")
+            ("导出完整列表", self.export_subnets),
+            ("继续导出", self.resume_export),
+            ("VLSM 分配", self.vlsm_dialog),
+            ("导出分配结果", self.export_vlsm),
+            ("空闲空间", self.find_free_space)
+        ], tooltips=["计算子网划分", "复制计算结果到剪贴板", "导出全部或指定范围的子网到文件", "从断点继续中断的导出",
+                     "按数量和前缀长度混合分配子网", "将 VLSM 分配结果导出为 CSV",
+                     "根据已分配子网列表计算剩余空闲块，并查询下一个空闲 /N"])
+        self.result_text2 = UIUtils.create_result_display(frame, 4, "result_text2", height=8)
+        self.subnet_list = VirtualListView(frame, height=10)
+        self.subnet_list.grid(row=5, column=0, columnspan=3, sticky=tk.NSEW)
+        
+        self.live = LiveRecalculator(self.root, lambda inputs, is_stale: self._compute_division(*inputs),
+                                     self._show_division, self._show_live_error, jobs=self.job_manager)
+        self.live.watch([self.ipv6_entry2, self.current_prefix_entry, self.subnet_count_entry])
     
     def calculate_subnet_division(self):
         try:
-            ipv6_str = UIUtils.clean_ipv6_input(self.ipv6_entry2.get())
-            current_prefix = int(self.current_prefix_entry.get().strip())
-            subnet_count = int(self.subnet_count_entry.get().strip())
-            
-            if not 0 <= current_prefix <= 128:
-                raise ValueError("前缀长度必须在 0-128 之间")
-            if subnet_count <= 0:
-                raise ValueError("划分网段数量必须大于 0")
-            
-            network = ipaddress.IPv6Network(f"{ipv6_str}/{current_prefix}", strict=False)
-            
-            new_prefix = current_prefix
-            max_subnets = 1
-            while max_subnets < subnet_count and new_prefix < 128:
-                new_prefix += 1
-                max_subnets = 2 ** (new_prefix - current_prefix)
-            
-            if new_prefix == 128 and max_subnets < subnet_count:
-                raise ValueError("无法划分这么多子网，已达到最大前缀长度 /128")
-            
-            subnets_iterator = network.subnets(new_prefix=new_prefix)
-            first_100_subnets = []
-            for i, subnet in enumerate(subnets_iterator):
-                if i < 100:
-                    first_100_subnets.append(subnet)
-                else:
-                    break
-            
-            self.result_text2.delete(1.0, tk.END)
-            self.result_text2.insert(tk.END, "=" * 60 + "\n")
-            self.result_text2.insert(tk.END, "计算\n")
-            self.result_text2.insert(tk.END, "=" * 60 + "\n\n")
-            self.result_text2.insert(tk.END, f"原网络: {network.exploded}\n")
-            self.result_text2.insert(tk.END, f"原前缀: /{current_prefix}\n")
-            self.result_text2.insert(tk.END, "新前缀: ")
-            self.result_text2.insert(tk.END, f"/{new_prefix}\n", "highlight")
-            self.result_text2.insert(tk.END, f"可划分子网总数: {max_subnets:,}\n")
-            self.result_text2.insert(tk.END, f"请求划分数量: {subnet_count}\n\n")
-            self.result_text2.insert(tk.END, "-" * 60 + "\n")
-            self.result_text2.insert(tk.END, "前 100 个子网段:\n")
-            self.result_text2.insert(tk.END, "-" * 60 + "\n\n")
-            
-            for i, subnet in enumerate(first_100_subnets):
-                self.result_text2.insert(tk.END, f"{i+1}. ")
-                self.result_text2.insert(tk.END, f"{subnet.exploded}\n", "subnet")
-            
-            self.result_text2.tag_config("highlight", foreground="#0066CC", font=('Arial', 10, 'bold'))
-            self.result_text2.tag_config("subnet", foreground="#009900")
-            
-            if max_subnets > 100:
-                self.result_text2.insert(tk.END, f"\n... 还有 {max_subnets - 100:,} 个子网未显示\n")
-                self.result_text2.insert(tk.END, f"点击\"导出完整列表\"按钮可导出所有 {max_subnets:,} 个子网\n")
-            
-            self.log_status(f"计算完成，共 {max_subnets:,} 个子网", "success")
+            self.live.cancel()
+            self._show_division(self._compute_division(
+                self.ipv6_entry2.get(), self.current_prefix_entry.get(), self.subnet_count_entry.get()
+            ))
             
         except (ipaddress.AddressValueError, ValueError) as e:
             UIUtils.highlight_error(self.ipv6_entry2)
@@ -98,31 +75,73 @@ class SubnetDivisionTab:
             messagebox.showerror("错误", f"计算失败: {str(e)}")
             self.log_status(f"错误: {str(e)}", "error")
     
+    def _compute_division(self, ipv6_input, prefix_input, count_input):
+        with Instrumentation.span("division.compute"):
+            key = ResultCache.make_key("subnet_division", ipv6_input, prefix_input, count_input)
+            return self.result_cache.get_or_compute(key, lambda: self._division_result(ipv6_input, prefix_input, count_input))
+    
+    def _show_division(self, result):
+        (network_int, new_prefix, max_subnets, segments), cached = result
+        with Instrumentation.span("division.render"):
+            UIUtils.clear_error_highlight(self.ipv6_entry2)
+            UIUtils.render_segments(self.result_text2, segments)
+            self.result_text2.tag_config("highlight", foreground="#0066CC", font=('Arial', 10, 'bold'))
+            
+            shift = 128 - new_prefix
+            self.subnet_list.set_source(
+                max_subnets,
+                lambda i: f"{i + 1}. {AddressFormatter.exploded(network_int + (i << shift))}/{new_prefix}"
+            )
+        
+        self.log_status(f"计算完成{'（缓存）' if cached else ''}，共 {max_subnets:,} 个子网", "success")
+    
+    def _show_live_error(self, error_msg):
+        UIUtils.highlight_error(self.ipv6_entry2)
+        self.log_status(f"错误: {error_msg}", "error")
+    
+    def _division_result(self, ipv6_input, prefix_input, count_input):
+        result = PlannerEngine.subnet_division(ipv6_input, prefix_input, count_input, limit=0)
+        
+        network = result["network"]
+        current_prefix = result["current_prefix"]
+        new_prefix = result["new_prefix"]
+        max_subnets = result["max_subnets"]
+        subnet_count = result["subnet_count"]
+        
+        segments = [
+            ("=" * 60 + "\n",),
+            ("计算\n",),
+            ("=" * 60 + "\n\n",),
+            (f"原网络: {network.exploded}\n",),
+            (f"原前缀: /{current_prefix}\n",),
+            ("新前缀: ",),
+            (f"/{new_prefix}\n", "highlight"),
+            (f"可划分子网总数: {max_subnets:,}\n",),
+            (f"请求划分数量: {subnet_count}\n\n",),
+            ("-" * 60 + "\n",),
+            ("下方列表可滚动查看全部子网段，或输入行号直接跳转\n",),
+        ]
+        return int(network.network_address), new_prefix, max_subnets, segments
+    
     def export_subnets(self):
         try:
-            ipv6_str = UIUtils.clean_ipv6_input(self.ipv6_entry2.get())
-            current_prefix = int(self.current_prefix_entry.get().strip())
-            subnet_count = int(self.subnet_count_entry.get().strip())
-            
-            if not 0 <= current_prefix <= 128:
-                raise ValueError("前缀长度必须在 0-128 之间")
-            if subnet_count <= 0:
-                raise ValueError("划分网段数量必须大于 0")
-            
-            network = ipaddress.IPv6Network(f"{ipv6_str}/{current_prefix}", strict=False)
-            
-            new_prefix = current_prefix
-            max_subnets = 1
-            while max_subnets < subnet_count and new_prefix < 128:
-                new_prefix += 1
-                max_subnets = 2 ** (new_prefix - current_prefix)
+            from tkinter import filedialog
             
-            if new_prefix == 128 and max_subnets < subnet_count:
-                raise ValueError("无法划分这么多子网，已达到最大前缀长度 /128")
+            network = PlannerEngine.parse_network(self.ipv6_entry2.get(), self.current_prefix_entry.get())
+            subnet_count = int(self.subnet_count_entry.get().strip())
+            new_prefix, max_subnets = PlannerEngine.division_prefix(network.prefixlen, subnet_count)
             
             file_path = filedialog.asksaveasfilename(
                 defaultextension=".csv",
-                filetypes=[("CSV 文件", "*.csv"), ("文本文件", "*.txt"), ("所有文件", "*.*")],
+                filetypes=[
+                    ("CSV 文件", "*.csv"),
+                    ("文本文件", "*.txt"),
+                    ("Gzip 压缩 CSV", "*.csv.gz"),
+                    ("XZ 压缩 CSV", "*.csv.xz"),
+                    ("BZ2 压缩 CSV", "*.csv.bz2"),
+                    ("Gzip 压缩文本", "*.txt.gz"),
+                    ("所有文件", "*.*")
+                ],
                 title="保存子网列表"
             )
             
@@ -137,14 +156,49 @@ class SubnetDivisionTab:
     def _export_subnets_preview(self, network, new_prefix, max_subnets, file_path):
         preview_dialog = tk.Toplevel(self.root)
         preview_dialog.title("导出预览")
-        preview_dialog.geometry("600x400")
+        preview_dialog.geometry("600x650")
         preview_dialog.transient(self.root)
         preview_dialog.grab_set()
         
         main_frame = ttk.Frame(preview_dialog)
         main_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
         
-        ttk.Label(main_frame, text=f"即将导出 {max_subnets:,} 个子网", font=('Arial', 10, 'bold')).pack(pady=5)
+        ttk.Label(main_frame, text=f"可划分子网总数: {max_subnets:,}", font=('Arial', 10, 'bold')).pack(pady=5)
+        
+        ttk.Label(main_frame, text="选择导出方式:", font=('Arial', 10, 'bold')).pack(pady=5)
+        
+        export_var = tk.StringVar(value="all")
+        
+        ttk.Radiobutton(main_frame, text="导出全部子网", variable=export_var, value="all").pack(anchor=tk.W, pady=2)
+        
+        ttk.Radiobutton(main_frame, text="导出前 N 个子网", variable=export_var, value="first_n").pack(anchor=tk.W, pady=2)
+        first_n_frame = ttk.Frame(main_frame)
+        first_n_frame.pack(anchor=tk.W, pady=2, padx=20)
+        ttk.Label(first_n_frame, text="N = ").pack(side=tk.LEFT)
+        first_n_entry = ttk.Entry(first_n_frame, width=15)
+        first_n_entry.insert(0, "1000")
+        first_n_entry.pack(side=tk.LEFT)
+        
+        ttk.Radiobutton(main_frame, text="导出后 N 个子网", variable=export_var, value="last_n").pack(anchor=tk.W, pady=2)
+        last_n_frame = ttk.Frame(main_frame)
+        last_n_frame.pack(anchor=tk.W, pady=2, padx=20)
+        ttk.Label(last_n_frame, text="N = ").pack(side=tk.LEFT)
+        last_n_entry = ttk.Entry(last_n_frame, width=15)
+        last_n_entry.insert(0, "1000")
+        last_n_entry.pack(side=tk.LEFT)
+        
+        ttk.Radiobutton(main_frame, text="从第 N 个子网到第 N 个子网", variable=export_var, value="range").pack(anchor=tk.W, pady=2)
+        range_frame = ttk.Frame(main_frame)
+        range_frame.pack(anchor=tk.W, pady=2, padx=20)
+        ttk.Label(range_frame, text="从第 ").pack(side=tk.LEFT)
+        range_start_entry = ttk.Entry(range_frame, width=12)
+        range_start_entry.insert(0, "1")
+        range_start_entry.pack(side=tk.LEFT, padx=2)
+        ttk.Label(range_frame, text=" 个到第 ").pack(side=tk.LEFT, padx=2)
+        range_end_entry = ttk.Entry(range_frame, width=12)
+        range_end_entry.insert(0, "1000")
+        range_end_entry.pack(side=tk.LEFT, padx=2)
+        ttk.Label(range_frame, text=" 个").pack(side=tk.LEFT)
         
         preview_text = tk.Text(main_frame, height=12, wrap=tk.WORD, font=('Arial', 9))
         preview_text.pack(fill=tk.BOTH, expand=True, pady=10)
@@ -153,20 +207,66 @@ class SubnetDivisionTab:
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         preview_text.config(yscrollcommand=scrollbar.set)
         
-        for i, subnet in enumerate(network.subnets(new_prefix=new_prefix), 1):
-            if i > 10:
-                preview_text.insert(tk.END, f"\n... 还有 {max_subnets - 10:,} 个子网 ...\n")
-                break
-            preview_text.insert(tk.END, f"{i}. {subnet.exploded}\n")
+        def get_range():
+            export_type = export_var.get()
+            if export_type == "all":
+                return 1, max_subnets
+            if export_type == "first_n":
+                count = int(first_n_entry.get().strip())
+                if count <= 0:
+                    raise ValueError("请输入大于 0 的数字")
+                return 1, min(count, max_subnets)
+            if export_type == "last_n":
+                count = int(last_n_entry.get().strip())
+                if count <= 0:
+                    raise ValueError("请输入大于 0 的数字")
+                return max(1, max_subnets - count + 1), max_subnets
+            start_index = int(range_start_entry.get().strip())
+            end_index = int(range_end_entry.get().strip())
+            if start_index <= 0 or end_index <= 0:
+                raise ValueError("请输入大于 0 的数字")
+            if start_index > end_index:
+                raise ValueError("起始子网不能大于结束子网")
+            if end_index > max_subnets:
+                raise ValueError(f"结束子网不能超过可划分子网总数 {max_subnets:,}")
+            return start_index, end_index
         
-        preview_text.config(state=tk.DISABLED)
+        def refresh_preview(*args):
+            preview_text.config(state=tk.NORMAL)
+            preview_text.delete(1.0, tk.END)
+            try:
+                start_index, end_index = get_range()
+            except ValueError as e:
+                preview_text.insert(tk.END, f"范围无效: {str(e)}\n")
+                preview_text.config(state=tk.DISABLED)
+                return
+            
+            count = end_index - start_index + 1
+            preview_text.insert(tk.END, f"即将导出第 {start_index:,} 个到第 {end_index:,} 个，共 {count:,} 个子网\n\n")
+            preview_end = min(end_index, start_index + 9)
+            subnets = PlannerEngine.subnet_slice(network, new_prefix, start_index, preview_end)
+            for i, subnet in enumerate(subnets, start_index):
+                preview_text.insert(tk.END, f"{i}. {subnet.exploded}\n")
+            if count > 10:
+                preview_text.insert(tk.END, f"\n... 还有 {count - 10:,} 个子网 ...\n")
+            preview_text.config(state=tk.DISABLED)
+        
+        export_var.trace_add("write", refresh_preview)
+        for entry in (first_n_entry, last_n_entry, range_start_entry, range_end_entry):
+            entry.bind('<KeyRelease>', refresh_preview)
+        refresh_preview()
         
         button_frame = ttk.Frame(main_frame)
         button_frame.pack(pady=10)
         
         def do_export():
+            try:
+                start_index, end_index = get_range()
+            except ValueError as e:
+                messagebox.showerror("错误", f"请输入有效的数字: {str(e)}")
+                return
             preview_dialog.destroy()
-            self._do_export_subnets(network, new_prefix, max_subnets, file_path)
+            self._do_export_subnets(network, new_prefix, start_index, end_index, file_path)
         
         def cancel_export():
             preview_dialog.destroy()
@@ -174,47 +274,452 @@ class SubnetDivisionTab:
         ttk.Button(button_frame, text="确认导出", command=do_export).pack(side=tk.LEFT, padx=5)
         ttk.Button(button_frame, text="取消", command=cancel_export).pack(side=tk.LEFT, padx=5)
     
-    def _do_export_subnets(self, network, new_prefix, max_subnets, file_path):
+    def resume_export(self):
+        try:
+            from tkinter import filedialog
+            from export_writer import ExportCheckpoint
+            
+            file_path = filedialog.askopenfilename(
+                filetypes=[
+                    ("子网列表", "*.csv *.txt *.csv.gz *.csv.xz *.csv.bz2 *.txt.gz"),
+                    ("所有文件", "*.*")
+                ],
+                title="选择未完成的子网导出文件"
+            )
+            if not file_path:
+                return
+            
+            state = ExportCheckpoint.load(file_path)
+            if state is None or state.get("kind") != "subnets":
+                messagebox.showwarning("警告", "未找到该文件的子网导出断点信息")
+                return
+            
+            network = ipaddress.IPv6Network(state["network"])
+            start_index = state["start_index"]
+            end_index = state["end_index"]
+            count = end_index - start_index + 1
+            done = state["next_index"] - start_index
+            
+            confirm = messagebox.askyesno(
+                "继续导出",
+                f"网络: {network.exploded}\n"
+                f"子网前缀: /{state['new_prefix']}\n"
+                f"导出范围: 第 {start_index:,} 个到第 {end_index:,} 个\n"
+                f"已完成: {done:,} / {count:,} ({done / count * 100:.1f}%)\n\n"
+                f"将截断文件到最后一个断点并从第 {state['next_index']:,} 个子网继续导出，是否继续？"
+            )
+            if not confirm:
+                return
+            
+            self._do_export_subnets(network, state["new_prefix"], start_index, end_index, file_path, state)
+            
+        except Exception as e:
+            messagebox.showerror("错误", f"继续导出失败: {str(e)}")
+            self.log_status(f"继续导出失败: {str(e)}", "error")
+    
+    def _do_export_subnets(self, network, new_prefix, start_index, end_index, file_path, resume_from=None):
         try:
-            self.log_status("正在导出，请稍候...")
-            self.root.update()
-            
-            if file_path.endswith('.csv'):
-                import csv
-                with open(file_path, 'w', newline='', encoding='utf-8-sig') as f:
-                    writer = csv.writer(f)
-                    writer.writerow(['序号', '网络地址', '前缀长度', '子网结束地址', '完整表示'])
+            from export_writer import AddressExporter
+            
+            if self.job_manager.find_active(file_path) is not None:
+                messagebox.showwarning("警告", "该文件正在导出中，请稍候...")
+                return
+            
+            count = end_index - start_index + 1
+            initial = 0 if resume_from is None else resume_from["next_index"] - start_index
+            
+            progress_dialog = tk.Toplevel(self.root)
+            progress_dialog.title(f"导出进度 - {network}")
+            progress_dialog.geometry("450x250")
+            progress_dialog.transient(self.root)
+            progress_dialog.protocol("WM_DELETE_WINDOW", progress_dialog.withdraw)
+            
+            frame = ttk.Frame(progress_dialog, padding="20")
+            frame.pack(fill=tk.BOTH, expand=True)
+            
+            ttk.Label(frame, text="正在导出子网...", font=('Arial', 10, 'bold')).pack(pady=10)
+            
+            progress_var = tk.DoubleVar()
+            progress_bar = ttk.Progressbar(frame, variable=progress_var, maximum=100, length=380)
+            progress_bar.pack(pady=10)
+            
+            progress_label = ttk.Label(frame, text="排队中...")
+            progress_label.pack(pady=5)
+            
+            stats_label = ttk.Label(frame, text="")
+            stats_label.pack(pady=5)
+            
+            start_time = time.time()
+            
+            def show_progress(exported):
+                percent = (exported / count) * 100
+                progress_var.set(percent)
+                
+                elapsed = time.time() - start_time
+                if exported > initial and elapsed > 0:
+                    rate = (exported - initial) / elapsed
+                    remaining = (count - exported) / rate if rate > 0 else 0
+                    remaining_str = f"{int(remaining)}秒" if remaining < 60 else f"{int(remaining/60)}分{int(remaining%60)}秒"
+                    stats_label.config(text=f"速率: {rate:.0f} 子网/秒 | 已用: {int(elapsed)}秒 | 剩余: {remaining_str}")
+                
+                progress_label.config(text=f"已导出 {exported:,} / {count:,} ({percent:.1f}%)")
+            
+            channel = ProgressChannel(self.root, show_progress).start()
+            
+            def export_job(job):
+                try:
+                    def on_progress(exported):
+                        job.report(exported)
+                        channel.post(exported)
+                    
+                    with Instrumentation.span("subnets.export"):
+                        exported = AddressExporter.export_subnets(
+                            file_path, network, new_prefix, start_index, end_index,
+                            should_stop=job.token,
+                            on_progress=on_progress,
+                            resume_from=resume_from
+                        )
+                    
+                    channel.call(progress_dialog.destroy)
                     
-                    for i, subnet in enumerate(network.subnets(new_prefix=new_prefix), 1):
-                        writer.writerow([
-                            i,
-                            str(subnet.network_address),
-                            subnet.prefixlen,
-                            str(subnet.broadcast_address),
-                            str(subnet)
-                        ])
-                        
-                        if i % 100000 == 0:
-                            self.log_status(f"已导出 {i:,} 个子网...")
-                            self.root.update()
-            else:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    for i, subnet in enumerate(network.subnets(new_prefix=new_prefix), 1):
-                        f.write(f"{i}. {subnet.exploded}\n")
-                        
-                        if i % 100000 == 0:
-                            self.log_status(f"已导出 {i:,} 个子网...")
-                            self.root.update()
-            
-            messagebox.showinfo("成功", f"已导出 {max_subnets:,} 个子网到:\n{file_path}")
-            self.log_status(f"导出成功: {file_path}", "success")
+                    if job.token.is_cancelled():
+                        channel.call(lambda: messagebox.showinfo("已停止", f"导出已停止，已导出 {exported:,} 个子网到:\n{file_path}\n\n可使用“继续导出”从断点继续"))
+                        channel.call(lambda: self.log_status("导出已停止"))
+                    else:
+                        channel.call(lambda: messagebox.showinfo("成功", f"已导出 {count:,} 个子网到:\n{file_path}"))
+                        channel.call(lambda: self.log_status(f"导出成功: {file_path}", "success"))
+                    
+                except Exception as e:
+                    error_msg = str(e)
+                    channel.call(progress_dialog.destroy)
+                    channel.call(lambda: messagebox.showerror("错误", f"导出失败: {error_msg}"))
+                    channel.call(lambda: self.log_status(f"导出失败: {error_msg}", "error"))
+                    raise
+                finally:
+                    channel.close()
+            
+            try:
+                job = self.job_manager.submit(f"导出子网 {network} → /{new_prefix}", export_job, PRIORITY_EXPORT,
+                                              total=count, done=initial, unit="子网", key=file_path)
+            except Exception:
+                channel.close()
+                progress_dialog.destroy()
+                raise
+            
+            ttk.Button(frame, text="停止导出", command=job.cancel).pack(pady=10)
+            
         except Exception as e:
             messagebox.showerror("错误", f"导出失败: {str(e)}")
             self.log_status(f"导出失败: {str(e)}", "error")
     
+    def vlsm_dialog(self):
+        dialog = tk.Toplevel(self.root)
+        dialog.title("VLSM 分配")
+        dialog.geometry("520x380")
+        dialog.transient(self.root)
+        
+        frame = ttk.Frame(dialog, padding="20")
+        frame.pack(fill=tk.BOTH, expand=True)
+        
+        ttk.Label(frame, text=f"在 {self.ipv6_entry2.get()}/{self.current_prefix_entry.get()} 中分配以下子网:",
+                  font=('Arial', 10, 'bold')).pack(anchor=tk.W)
+        ttk.Label(frame, text="格式: [标签:] 数量 × /前缀，多个请求用换行、逗号或分号分隔").pack(anchor=tk.W, pady=(0, 5))
+        
+        request_text = tk.Text(frame, height=10, width=60, font=('Consolas', 10))
+        request_text.pack(fill=tk.BOTH, expand=True)
+        request_text.insert(tk.END, self.vlsm_requests_text or "核心: 3 × /48\n汇聚: 200 × /56\n接入: 40,000 × /64")
+        
+        def load_file():
+            from tkinter import filedialog
+            
+            file_path = filedialog.askopenfilename(
+                filetypes=[("文本文件", "*.txt *.csv"), ("所有文件", "*.*")],
+                title="选择分配请求文件"
+            )
+            if not file_path:
+                return
+            try:
+                with open(file_path, 'r', encoding='utf-8-sig', errors='replace') as f:
+                    content = f.read()
+                request_text.delete(1.0, tk.END)
+                request_text.insert(tk.END, content)
+            except OSError as e:
+                messagebox.showerror("错误", f"读取文件失败: {str(e)}", parent=dialog)
+        
+        def do_allocate():
+            self.vlsm_requests_text = request_text.get(1.0, tk.END)
+            if self.allocate_vlsm(self.vlsm_requests_text):
+                dialog.destroy()
+        
+        button_frame = ttk.Frame(frame)
+        button_frame.pack(pady=(10, 0))
+        ttk.Button(button_frame, text="从文件读取", command=load_file).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="分配", command=do_allocate).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="取消", command=dialog.destroy).pack(side=tk.LEFT, padx=5)
+    
+    def allocate_vlsm(self, requests_text):
+        try:
+            from vlsm_allocator import VLSMAllocator
+            
+            network = PlannerEngine.parse_network(self.ipv6_entry2.get(), self.current_prefix_entry.get())
+            requests = VLSMAllocator.parse_requests(requests_text)
+            total = sum(count for _, _, count in requests)
+            
+            channel = ProgressChannel(self.root, lambda value: None).start()
+            
+            def allocate_job(job):
+                try:
+                    with Instrumentation.span("vlsm.plan"):
+                        plan = VLSMAllocator.plan(network, requests, should_stop=job.token)
+                    if plan is None:
+                        channel.call(lambda: self.log_status("VLSM 分配已取消", "warning"))
+                    else:
+                        job.report(plan.total)
+                        channel.call(lambda: self._show_vlsm_plan(plan))
+                except Exception as e:
+                    error_msg = str(e)
+                    channel.call(lambda: messagebox.showerror("错误", f"VLSM 分配失败: {error_msg}"))
+                    channel.call(lambda: self.log_status(f"VLSM 分配失败: {error_msg}", "error"))
+                    raise
+                finally:
+                    channel.close()
+            
+            try:
+                self.job_manager.submit(f"VLSM 分配 {network}", allocate_job, PRIORITY_BATCH, total=total, unit="子网")
+            except Exception:
+                channel.close()
+                raise
+            self.live.cancel()
+            self.log_status(f"正在分配 {total:,} 个子网...")
+            return True
+        
+        except (ipaddress.AddressValueError, ValueError) as e:
+            messagebox.showerror("错误", f"输入无效: {str(e)}")
+            self.log_status(f"错误: {str(e)}", "error")
+        except Exception as e:
+            messagebox.showerror("错误", f"VLSM 分配失败: {str(e)}")
+            self.log_status(f"错误: {str(e)}", "error")
+        return False
+    
+    def _show_vlsm_plan(self, plan):
+        self.vlsm_plan = plan
+        allocated = plan.allocated_addresses()
+        
+        segments = [
+            ("=" * 60 + "\n",),
+            ("VLSM 分配\n",),
+            ("=" * 60 + "\n\n",),
+            (f"待分配网络: {plan.network}\n",),
+            (f"分配子网数: {plan.total:,}\n",),
+            (f"空间利用率: {allocated / plan.network.num_addresses:.2%}\n\n",),
+        ]
+        for prefix, count in plan.summary_by_prefix():
+            segments.append((f"/{prefix}", "highlight"))
+            segments.append((f": {count:,} 个\n",))
+        segments.append((f"\n剩余空闲块 ({len(plan.free_blocks):,} 个):\n",))
+        for block in plan.free_blocks[:MAX_FREE_BLOCKS_SHOWN]:
+            segments.append((f"  {block}\n",))
+        if len(plan.free_blocks) > MAX_FREE_BLOCKS_SHOWN:
+            segments.append((f"  ... 另有 {len(plan.free_blocks) - MAX_FREE_BLOCKS_SHOWN:,} 个\n",))
+        segments.append(("-" * 60 + "\n",))
+        segments.append(("下方列表按前缀从大到小列出全部分配结果，可使用“导出分配结果”保存为 CSV\n",))
+        
+        UIUtils.clear_error_highlight(self.ipv6_entry2)
+        UIUtils.render_segments(self.result_text2, segments)
+        self.result_text2.tag_config("highlight", foreground="#0066CC", font=('Arial', 10, 'bold'))
+        self.subnet_list.set_source(plan.total, plan.row_text)
+        self.log_status(f"VLSM 分配完成，共 {plan.total:,} 个子网", "success")
+    
+    def export_vlsm(self):
+        try:
+            from tkinter import filedialog
+            from export_writer import AddressExporter
+            
+            plan = self.vlsm_plan
+            if plan is None:
+                messagebox.showinfo("提示", "请先使用“VLSM 分配”生成分配结果")
+                return
+            
+            file_path = filedialog.asksaveasfilename(
+                defaultextension=".csv",
+                filetypes=[("CSV 文件", "*.csv"), ("文本文件", "*.txt"), ("Gzip 压缩 CSV", "*.csv.gz"), ("所有文件", "*.*")],
+                title="导出 VLSM 分配结果"
+            )
+            if not file_path:
+                return
+            
+            if self.job_manager.find_active(file_path) is not None:
+                messagebox.showwarning("警告", "该文件正在导出中，请稍候...")
+                return
+            
+            channel = ProgressChannel(self.root, lambda exported: self.log_status(f"已导出 {exported:,} / {plan.total:,} 个子网...")).start()
+            
+            def export_job(job):
+                try:
+                    def on_progress(exported):
+                        job.report(exported)
+                        channel.post(exported)
+                    
+                    with Instrumentation.span("vlsm.export"):
+                        exported = AddressExporter.export_allocations(file_path, plan, should_stop=job.token, on_progress=on_progress)
+                    
+                    if job.token.is_cancelled():
+                        channel.call(lambda: self.log_status(f"导出已停止，已导出 {exported:,} 个子网", "warning"))
+                    else:
+                        channel.call(lambda: messagebox.showinfo("成功", f"已导出 {exported:,} 个子网到:\n{file_path}"))
+                        channel.call(lambda: self.log_status(f"导出成功: {file_path}", "success"))
+                except Exception as e:
+                    error_msg = str(e)
+                    channel.call(lambda: messagebox.showerror("错误", f"导出失败: {error_msg}"))
+                    channel.call(lambda: self.log_status(f"导出失败: {error_msg}", "error"))
+                    raise
+                finally:
+                    channel.close()
+            
+            try:
+                self.job_manager.submit(f"导出 VLSM 分配 {plan.network}", export_job, PRIORITY_EXPORT,
+                                        total=plan.total, unit="子网", key=file_path)
+            except Exception:
+                channel.close()
+                raise
+            self.log_status("正在导出 VLSM 分配结果...")
+        
+        except Exception as e:
+            messagebox.showerror("错误", f"导出失败: {str(e)}")
+            self.log_status(f"导出失败: {str(e)}", "error")
+
+    def find_free_space(self):
+        try:
+            from tkinter import filedialog
+            from free_space import FreeSpaceIndex
+            
+            network = PlannerEngine.parse_network(self.ipv6_entry2.get(), self.current_prefix_entry.get())
+            
+            file_path = filedialog.askopenfilename(
+                filetypes=[("前缀列表", "*.txt *.csv *.gz *.xz *.bz2"), ("所有文件", "*.*")],
+                title=f"选择 {network} 中已分配的子网列表"
+            )
+            if not file_path:
+                return
+            
+            channel = ProgressChannel(self.root, lambda loaded: self.log_status(f"已读取 {loaded:,} 个已分配前缀...")).start()
+            
+            def index_job(job):
+                try:
+                    def on_progress(loaded):
+                        job.report(loaded)
+                        channel.post(loaded)
+                    
+                    with Instrumentation.span("free_space.build"):
+                        index, loaded, skipped = FreeSpaceIndex.from_file(
+                            int(network.network_address), network.prefixlen, file_path,
+                            should_stop=job.token, on_progress=on_progress
+                        )
+                    if job.token.is_cancelled():
+                        channel.call(lambda: self.log_status("空闲空间计算已取消", "warning"))
+                    else:
+                        job.report(loaded)
+                        channel.call(lambda: self._show_free_space(index, loaded, skipped))
+                except Exception as e:
+                    error_msg = str(e)
+                    channel.call(lambda: messagebox.showerror("错误", f"空闲空间计算失败: {error_msg}"))
+                    channel.call(lambda: self.log_status(f"空闲空间计算失败: {error_msg}", "error"))
+                    raise
+                finally:
+                    channel.close()
+            
+            try:
+                self.job_manager.submit(f"空闲空间 {network}", index_job, PRIORITY_BATCH, unit="前缀")
+            except Exception:
+                channel.close()
+                raise
+            self.live.cancel()
+            self.log_status("正在计算空闲空间...")
+        
+        except (ipaddress.AddressValueError, ValueError) as e:
+            UIUtils.highlight_error(self.ipv6_entry2)
+            messagebox.showerror("错误", f"输入无效: {str(e)}")
+            self.log_status(f"错误: {str(e)}", "error")
+        except Exception as e:
+            messagebox.showerror("错误", f"空闲空间计算失败: {str(e)}")
+            self.log_status(f"错误: {str(e)}", "error")
+    
+    def _show_free_space(self, index, loaded, skipped):
+        total = index.parent_end - index.parent_start + 1
+        largest = index.largest_free_block()
+        
+        segments = [
+            ("=" * 60 + "\n",),
+            ("空闲空间\n",),
+            ("=" * 60 + "\n\n",),
+            (f"上级前缀: {AddressFormatter.compressed(index.parent_start)}/{index.parent_prefixlen}\n",),
+            (f"已分配前缀: {loaded:,} (跳过无效行 {skipped:,})\n",),
+            (f"已用地址: {index.allocated_addresses / total:.2%}\n",),
+            (f"空闲区间: {len(index.gap_starts):,}\n",),
+            (f"空闲 CIDR 块: {index.block_count:,}\n",),
+            ("最大空闲块: ",),
+        ]
+        if largest:
+            segments.append((f"{AddressFormatter.compressed(largest[0])}/{largest[1]}\n", "highlight"))
+        else:
+            segments.append(("无（已全部分配）\n", "highlight"))
+        segments.append(("-" * 60 + "\n",))
+        segments.append(("下方列表为按地址排序的最少对齐空闲块，可在弹出窗口中查询下一个空闲 /N\n",))
+        
+        UIUtils.clear_error_highlight(self.ipv6_entry2)
+        UIUtils.render_segments(self.result_text2, segments)
+        self.result_text2.tag_config("highlight", foreground="#0066CC", font=('Arial', 10, 'bold'))
+        self.subnet_list.set_source(index.block_count, index.block_text)
+        self.log_status(f"空闲空间计算完成，共 {index.block_count:,} 个空闲块", "success")
+        
+        if largest:
+            self._free_space_query_dialog(index, largest[1])
+    
+    def _free_space_query_dialog(self, index, largest_prefixlen):
+        dialog = tk.Toplevel(self.root)
+        dialog.title("查找空闲子网")
+        dialog.geometry("460x220")
+        dialog.transient(self.root)
+        
+        frame = ttk.Frame(dialog, padding="20")
+        frame.pack(fill=tk.BOTH, expand=True)
+        
+        ttk.Label(frame, text="前缀长度:").grid(row=0, column=0, sticky=tk.W, pady=5)
+        prefix_var = tk.StringVar(value=str(max(largest_prefixlen, 64)))
+        ttk.Entry(frame, textvariable=prefix_var, width=10).grid(row=0, column=1, sticky=tk.W, pady=5)
+        
+        ttk.Label(frame, text="从地址开始:").grid(row=1, column=0, sticky=tk.W, pady=5)
+        after_var = tk.StringVar(value=AddressFormatter.compressed(index.parent_start))
+        ttk.Entry(frame, textvariable=after_var, width=42).grid(row=1, column=1, sticky=tk.W, pady=5)
+        
+        result_label = ttk.Label(frame, text="", font=('Arial', 10, 'bold'), foreground="#0066CC")
+        result_label.grid(row=2, column=0, columnspan=2, pady=10)
+        
+        def find_next():
+            try:
+                prefixlen = PlannerEngine.parse_prefix(prefix_var.get())
+                after_text = UIUtils.clean_ipv6_input(after_var.get())
+                after = AddressFormatter.parse(after_text) if after_text else index.parent_end + 1
+                with Instrumentation.span("free_space.next"):
+                    start = index.next_free(prefixlen, after)
+                if start is None:
+                    result_label.config(text=f"之后没有空闲的 /{prefixlen}")
+                    return
+                result_label.config(text=f"{AddressFormatter.compressed(start)}/{prefixlen}")
+                following = start + (1 << (128 - prefixlen))
+                after_var.set(AddressFormatter.compressed(following) if following <= index.parent_end else "")
+                self.log_status(f"下一个空闲 /{prefixlen}: {AddressFormatter.compressed(start)}/{prefixlen}", "success")
+            except (ipaddress.AddressValueError, ValueError) as e:
+                result_label.config(text=f"输入无效: {str(e)}")
+        
+        button_frame = ttk.Frame(frame)
+        button_frame.grid(row=3, column=0, columnspan=2)
+        ttk.Button(button_frame, text="查找下一个", command=find_next).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="关闭", command=dialog.destroy).pack(side=tk.LEFT, padx=5)
+
     def copy_subnet_division(self):
         try:
-            content = self.result_text2.get(1.0, tk.END)
+            content = self.result_text2.get(1.0, tk.END) + "\n" + self.subnet_list.get_preview_text()
             if not content.strip():
                 self.log_status("没有可复制的内容")
                 return
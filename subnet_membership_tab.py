@@ -2,77 +2,346 @@ import ipaddress
 import tkinter as tk
 from tkinter import ttk, messagebox
 from utils import UIUtils
+from result_cache import ResultCache
+from live_recalc import LiveRecalculator
+from progress_channel import ProgressChannel
+from job_manager import PRIORITY_BATCH
+from instrumentation import Instrumentation
+from planner_engine import PlannerEngine
 
 
 class SubnetMembershipTab:
-    def __init__(self, notebook, root, log_status_func):
-        self.notebook = notebook
+    def __init__(self, parent, root, log_status_func, result_cache, job_manager):
+        self.parent = parent
         self.root = root
         self.log_status = log_status_func
+        self.result_cache = result_cache
+        self.job_manager = job_manager
         self.ipv6_entry5 = None
         self.prefix_entry5 = None
         self.result_text5 = None
+        self.live = None
         self.create_tab()
     
     def create_tab(self):
-        tab4 = ttk.Frame(self.notebook)
-        self.notebook.add(tab4, text="所属子网")
-        
-        frame = ttk.Frame(tab4, padding="25")
+        frame = ttk.Frame(self.parent, padding="25")
         frame.pack(fill=tk.BOTH, expand=True)
         
         self.ipv6_entry5 = UIUtils.create_input_row(frame, "IPv6 地址:", "2026:db8::1", 0, None, placeholder="例如: 2026:db8::1")
         self.prefix_entry5 = UIUtils.create_input_row(frame, "前缀长度:", "64", 1, None, placeholder="0-128")
-        UIUtils.create_button_frame(frame, 2, [("计算", self.calculate_subnet_membership), ("复制结果", self.copy_subnet_membership)], 
-                               tooltips=["计算所属子网", "复制计算结果到剪贴板"])
+        UIUtils.create_button_frame(frame, 2, [
+            ("计算", self.calculate_subnet_membership),
+            ("复制结果", self.copy_subnet_membership),
+            ("批量最长前缀匹配", self.bulk_lookup),
+            ("冲突检查", self.check_conflicts),
+            ("前缀汇总", self.aggregate_prefixes)
+        ], tooltips=["计算所属子网", "复制计算结果到剪贴板", "加载分配表，将地址文件批量匹配到最具体的已分配前缀并导出 CSV",
+                     "合并多个分配表，找出重复和相互包含的前缀并导出 CSV", "将前缀列表合并为最少的汇总路由前缀"])
         self.result_text5 = UIUtils.create_result_display(frame, 3, "result_text5")
+        
+        self.live = LiveRecalculator(self.root, lambda inputs, is_stale: self._compute_membership(*inputs),
+                                     self._show_membership, self._show_live_error, jobs=self.job_manager)
+        self.live.watch([self.ipv6_entry5, self.prefix_entry5])
     
     def calculate_subnet_membership(self):
         try:
-            ipv6_str = UIUtils.clean_ipv6_input(self.ipv6_entry5.get())
-            prefix = int(self.prefix_entry5.get().strip())
+            self.live.cancel()
+            self._show_membership(self._compute_membership(self.ipv6_entry5.get(), self.prefix_entry5.get()))
+            
+        except (ipaddress.AddressValueError, ValueError) as e:
+            UIUtils.highlight_error(self.ipv6_entry5)
+            messagebox.showerror("错误", f"输入无效: {str(e)}")
+            self.log_status(f"错误: {str(e)}", "error")
+        except Exception as e:
+            UIUtils.highlight_error(self.ipv6_entry5)
+            messagebox.showerror("错误", f"计算失败: {str(e)}")
+            self.log_status(f"错误: {str(e)}", "error")
+    
+    def _compute_membership(self, ipv6_input, prefix_input):
+        with Instrumentation.span("membership.compute"):
+            key = ResultCache.make_key("subnet_membership", ipv6_input, prefix_input)
+            return self.result_cache.get_or_compute(key, lambda: self._membership_segments(ipv6_input, prefix_input))
+    
+    def _show_membership(self, result):
+        segments, cached = result
+        with Instrumentation.span("membership.render"):
+            UIUtils.clear_error_highlight(self.ipv6_entry5)
+            UIUtils.render_segments(self.result_text5, segments)
+        
+        self.log_status("计算完成（缓存）" if cached else "计算完成", "success")
+    
+    def _show_live_error(self, error_msg):
+        UIUtils.highlight_error(self.ipv6_entry5)
+        self.log_status(f"错误: {error_msg}", "error")
+    
+    def _membership_segments(self, ipv6_input, prefix_input):
+        info = PlannerEngine.subnet_membership(ipv6_input, prefix_input)
+        
+        address = info["address"]
+        network = info["network"]
+        prefix = info["prefix"]
+        
+        return [
+            ("=" * 60 + "\n",),
+            ("所属子网计算\n",),
+            ("=" * 60 + "\n\n",),
+            (f"输入地址: {address.exploded}\n",),
+            (f"网络地址: {network.network_address.exploded}\n",),
+            (f"子网掩码: /{prefix}\n",),
+            (f"子网范围: {network.network_address.exploded} - {network.broadcast_address.exploded}\n",),
+            (f"可用主机数: {info['available_hosts']:,}\n",),
+            (f"主机位数: {info['host_bits']} 位\n",),
+            (f"子网编号: {network.network_address.exploded}\n",),
+            (f"\n该地址在子网中的序号: 第 {info['address_index']:,} 个地址\n",),
+        ]
+    
+    def bulk_lookup(self):
+        try:
+            from tkinter import filedialog
             
-            if not 0 <= prefix <= 128:
-                raise ValueError("前缀长度必须在 0-128 之间")
+            prefix_path = filedialog.askopenfilename(
+                filetypes=[("前缀列表", "*.txt *.csv *.gz *.xz *.bz2"), ("所有文件", "*.*")],
+                title="选择分配表（每行一个前缀，可附带标签）"
+            )
+            if not prefix_path:
+                return
             
-            address = ipaddress.IPv6Address(ipv6_str)
-            network = ipaddress.IPv6Network(f"{ipv6_str}/{prefix}", strict=False)
+            address_path = filedialog.askopenfilename(
+                filetypes=[("日志/地址文件", "*.txt *.log *.csv *.gz *.xz *.bz2"), ("所有文件", "*.*")],
+                title="选择地址文件（每行第一个字段为 IPv6 地址）"
+            )
+            if not address_path:
+                return
             
-            self.result_text5.delete(1.0, tk.END)
-            self.result_text5.insert(tk.END, "=" * 60 + "\n")
-            self.result_text5.insert(tk.END, "所属子网计算\n")
-            self.result_text5.insert(tk.END, "=" * 60 + "\n\n")
-            self.result_text5.insert(tk.END, f"输入地址: {address.exploded}\n")
-            self.result_text5.insert(tk.END, f"网络地址: {network.network_address.exploded}\n")
-            self.result_text5.insert(tk.END, f"子网掩码: /{prefix}\n")
-            self.result_text5.insert(tk.END, f"子网范围: {network.network_address.exploded} - {network.broadcast_address.exploded}\n")
+            output_path = filedialog.asksaveasfilename(
+                defaultextension=".csv",
+                filetypes=[("CSV 文件", "*.csv"), ("Gzip 压缩 CSV", "*.csv.gz"), ("所有文件", "*.*")],
+                title="保存匹配结果"
+            )
+            if not output_path:
+                return
             
-            if prefix == 127:
-                available_hosts = 2
-            elif prefix == 128:
-                available_hosts = 0
-            else:
-                available_hosts = network.num_addresses - 2
-            self.result_text5.insert(tk.END, f"可用主机数: {available_hosts:,}\n")
+            if self.job_manager.find_active(output_path) is not None:
+                messagebox.showwarning("警告", "该文件正在写入中，请稍候...")
+                return
             
-            self.result_text5.insert(tk.END, f"主机位数: {128 - prefix} 位\n")
-            self.result_text5.insert(tk.END, f"子网编号: {network.network_address.exploded}\n")
+            channel = ProgressChannel(self.root, lambda resolved: self.log_status(f"已匹配 {resolved:,} 个地址...")).start()
             
-            address_offset = int(address) - int(network.network_address)
-            address_index = address_offset + 1
-            self.result_text5.insert(tk.END, f"\n该地址在子网中的序号: 第 {address_index:,} 个地址\n")
+            def lookup_job(job):
+                try:
+                    from prefix_trie import LongestPrefixMatcher
+                    
+                    def on_progress(resolved):
+                        job.report(resolved)
+                        channel.post(resolved)
+                    
+                    channel.call(lambda: self.log_status("正在构建前缀索引..."))
+                    with Instrumentation.span("lpm.build"):
+                        trie, build_stats = LongestPrefixMatcher.build_from_file(prefix_path)
+                    
+                    with Instrumentation.span("lpm.resolve"):
+                        lookup_stats = LongestPrefixMatcher.resolve_file(trie, address_path, output_path,
+                                                                         should_stop=job.token, on_progress=on_progress)
+                    if job.token.is_cancelled():
+                        channel.call(lambda: self.log_status("批量匹配已取消", "warning"))
+                    else:
+                        channel.call(lambda: self._display_bulk_lookup(build_stats, lookup_stats, output_path))
+                except Exception as e:
+                    error_msg = str(e)
+                    channel.call(lambda: messagebox.showerror("错误", f"批量匹配失败: {error_msg}"))
+                    channel.call(lambda: self.log_status(f"批量匹配失败: {error_msg}", "error"))
+                    raise
+                finally:
+                    channel.close()
             
-            self.log_status("计算完成", "success")
+            try:
+                self.job_manager.submit("批量最长前缀匹配", lookup_job, PRIORITY_BATCH, unit="地址", key=output_path)
+            except Exception:
+                channel.close()
+                raise
+            self.log_status("正在批量匹配...")
             
-        except (ipaddress.AddressValueError, ValueError) as e:
-            UIUtils.highlight_error(self.ipv6_entry5)
-            messagebox.showerror("错误", f"输入无效: {str(e)}")
+        except Exception as e:
+            messagebox.showerror("错误", f"批量匹配失败: {str(e)}")
             self.log_status(f"错误: {str(e)}", "error")
+    
+    def _display_bulk_lookup(self, build_stats, lookup_stats, output_path):
+        memory_mb = build_stats["memory_bytes"] / 1024 / 1024
+        
+        self.result_text5.delete(1.0, tk.END)
+        self.result_text5.insert(tk.END, "=" * 60 + "\n")
+        self.result_text5.insert(tk.END, "批量最长前缀匹配\n")
+        self.result_text5.insert(tk.END, "=" * 60 + "\n\n")
+        self.result_text5.insert(tk.END, "前缀索引 (Patricia 树):\n")
+        self.result_text5.insert(tk.END, f"  前缀数量: {build_stats['prefixes']:,}\n")
+        self.result_text5.insert(tk.END, f"  节点数量: {build_stats['nodes']:,}\n")
+        self.result_text5.insert(tk.END, f"  跳过无效行: {build_stats['skipped']:,}\n")
+        self.result_text5.insert(tk.END, f"  构建耗时: {build_stats['build_seconds']:.2f} 秒\n")
+        self.result_text5.insert(tk.END, f"  估算内存: {memory_mb:.1f} MB\n\n")
+        self.result_text5.insert(tk.END, "地址匹配:\n")
+        self.result_text5.insert(tk.END, f"  已处理地址: {lookup_stats['resolved']:,}\n")
+        self.result_text5.insert(tk.END, f"  命中前缀: {lookup_stats['matched']:,}\n")
+        self.result_text5.insert(tk.END, f"  无效地址行: {lookup_stats['invalid']:,}\n")
+        self.result_text5.insert(tk.END, f"  匹配耗时: {lookup_stats['lookup_seconds']:.2f} 秒\n")
+        self.result_text5.insert(tk.END, f"  匹配速率: {lookup_stats['rate']:,.0f} 地址/秒\n\n")
+        self.result_text5.insert(tk.END, f"结果文件: {output_path}\n")
+        
+        self.log_status(f"批量匹配完成: {output_path}", "success")
+    
+    def check_conflicts(self):
+        try:
+            from tkinter import filedialog
+            
+            prefix_paths = filedialog.askopenfilenames(
+                filetypes=[("前缀列表", "*.txt *.csv *.gz *.xz *.bz2"), ("所有文件", "*.*")],
+                title="选择要合并检查的分配表（可多选，每行一个前缀，可附带标签）"
+            )
+            if not prefix_paths:
+                return
+            
+            output_path = filedialog.asksaveasfilename(
+                defaultextension=".csv",
+                filetypes=[("CSV 文件", "*.csv"), ("Gzip 压缩 CSV", "*.csv.gz"), ("所有文件", "*.*")],
+                title="保存冲突报告"
+            )
+            if not output_path:
+                return
+            
+            if self.job_manager.find_active(output_path) is not None:
+                messagebox.showwarning("警告", "该文件正在写入中，请稍候...")
+                return
+            
+            channel = ProgressChannel(self.root, lambda loaded: self.log_status(f"已读取 {loaded:,} 个前缀...")).start()
+            
+            def conflict_job(job):
+                try:
+                    from conflict_checker import ConflictChecker
+                    
+                    def on_progress(loaded):
+                        job.report(loaded)
+                        channel.post(loaded)
+                    
+                    with Instrumentation.span("conflict.check"):
+                        stats = ConflictChecker.check_files(prefix_paths, output_path, should_stop=job.token, on_progress=on_progress)
+                    if stats is None or job.token.is_cancelled():
+                        channel.call(lambda: self.log_status("冲突检查已取消", "warning"))
+                    else:
+                        job.report(stats["prefixes"])
+                        channel.call(lambda: self._display_conflicts(stats, output_path))
+                except Exception as e:
+                    error_msg = str(e)
+                    channel.call(lambda: messagebox.showerror("错误", f"冲突检查失败: {error_msg}"))
+                    channel.call(lambda: self.log_status(f"冲突检查失败: {error_msg}", "error"))
+                    raise
+                finally:
+                    channel.close()
+            
+            try:
+                self.job_manager.submit("前缀冲突检查", conflict_job, PRIORITY_BATCH, unit="前缀", key=output_path)
+            except Exception:
+                channel.close()
+                raise
+            self.log_status("正在检查前缀冲突...")
+        
         except Exception as e:
-            UIUtils.highlight_error(self.ipv6_entry5)
-            messagebox.showerror("错误", f"计算失败: {str(e)}")
+            messagebox.showerror("错误", f"冲突检查失败: {str(e)}")
             self.log_status(f"错误: {str(e)}", "error")
     
+    def _display_conflicts(self, stats, output_path):
+        self.result_text5.delete(1.0, tk.END)
+        self.result_text5.insert(tk.END, "=" * 60 + "\n")
+        self.result_text5.insert(tk.END, "前缀冲突检查\n")
+        self.result_text5.insert(tk.END, "=" * 60 + "\n\n")
+        self.result_text5.insert(tk.END, f"分配表数量: {stats['sources']}\n")
+        self.result_text5.insert(tk.END, f"前缀数量: {stats['prefixes']:,}\n")
+        self.result_text5.insert(tk.END, f"跳过无效行: {stats['skipped']:,}\n\n")
+        self.result_text5.insert(tk.END, f"重复前缀: {stats['duplicates']:,}\n")
+        self.result_text5.insert(tk.END, f"包含关系: {stats['contained']:,}\n")
+        self.result_text5.insert(tk.END, f"跨分配表冲突: {stats['cross_source']:,}\n")
+        self.result_text5.insert(tk.END, f"最大嵌套深度: {stats['max_depth']}\n\n")
+        self.result_text5.insert(tk.END, f"读取耗时: {stats['load_seconds']:.2f} 秒\n")
+        self.result_text5.insert(tk.END, f"排序与扫描耗时: {stats['sweep_seconds']:.2f} 秒\n")
+        self.result_text5.insert(tk.END, f"总耗时: {stats['seconds']:.2f} 秒\n\n")
+        self.result_text5.insert(tk.END, f"冲突报告: {output_path}\n")
+        
+        self.log_status(f"冲突检查完成: {output_path}", "success")
+
+    def aggregate_prefixes(self):
+        try:
+            from tkinter import filedialog
+            
+            input_path = filedialog.askopenfilename(
+                filetypes=[("前缀列表", "*.txt *.csv *.gz *.xz *.bz2"), ("所有文件", "*.*")],
+                title="选择要汇总的前缀列表（如子网划分导出的 CSV/TXT）"
+            )
+            if not input_path:
+                return
+            
+            output_path = filedialog.asksaveasfilename(
+                defaultextension=".txt",
+                filetypes=[("文本文件", "*.txt"), ("Gzip 压缩文本", "*.txt.gz"), ("XZ 压缩文本", "*.txt.xz"),
+                           ("BZ2 压缩文本", "*.txt.bz2"), ("所有文件", "*.*")],
+                title="保存汇总后的前缀"
+            )
+            if not output_path:
+                return
+            
+            if self.job_manager.find_active(output_path) is not None:
+                messagebox.showwarning("警告", "该文件正在写入中，请稍候...")
+                return
+            
+            channel = ProgressChannel(self.root, lambda loaded: self.log_status(f"已读取 {loaded:,} 个前缀...")).start()
+            
+            def aggregate_job(job):
+                try:
+                    from prefix_aggregator import PrefixAggregator
+                    
+                    def on_progress(loaded):
+                        job.report(loaded)
+                        channel.post(loaded)
+                    
+                    with Instrumentation.span("aggregate.file"):
+                        stats = PrefixAggregator.aggregate_file(input_path, output_path, should_stop=job.token, on_progress=on_progress)
+                    if stats is None or job.token.is_cancelled():
+                        channel.call(lambda: self.log_status("前缀汇总已取消", "warning"))
+                    else:
+                        job.report(stats["inputs"])
+                        channel.call(lambda: self._display_aggregation(stats, output_path))
+                except Exception as e:
+                    error_msg = str(e)
+                    channel.call(lambda: messagebox.showerror("错误", f"前缀汇总失败: {error_msg}"))
+                    channel.call(lambda: self.log_status(f"前缀汇总失败: {error_msg}", "error"))
+                    raise
+                finally:
+                    channel.close()
+            
+            try:
+                self.job_manager.submit("前缀汇总", aggregate_job, PRIORITY_BATCH, unit="前缀", key=output_path)
+            except Exception:
+                channel.close()
+                raise
+            self.log_status("正在汇总前缀...")
+        
+        except Exception as e:
+            messagebox.showerror("错误", f"前缀汇总失败: {str(e)}")
+            self.log_status(f"错误: {str(e)}", "error")
+    
+    def _display_aggregation(self, stats, output_path):
+        self.result_text5.delete(1.0, tk.END)
+        self.result_text5.insert(tk.END, "=" * 60 + "\n")
+        self.result_text5.insert(tk.END, "前缀汇总\n")
+        self.result_text5.insert(tk.END, "=" * 60 + "\n\n")
+        self.result_text5.insert(tk.END, f"输入前缀: {stats['inputs']:,}\n")
+        self.result_text5.insert(tk.END, f"跳过无效行: {stats['skipped']:,}\n")
+        self.result_text5.insert(tk.END, f"汇总后前缀: {stats['outputs']:,}\n")
+        self.result_text5.insert(tk.END, f"覆盖地址数: {stats['addresses']:,}\n\n")
+        self.result_text5.insert(tk.END, f"读取耗时: {stats['read_seconds']:.2f} 秒\n")
+        self.result_text5.insert(tk.END, f"排序与合并耗时: {stats['merge_seconds']:.2f} 秒\n")
+        self.result_text5.insert(tk.END, f"处理速率: {stats['rate']:,.0f} 前缀/秒\n\n")
+        self.result_text5.insert(tk.END, f"结果文件: {output_path}\n")
+        
+        self.log_status(f"前缀汇总完成: {stats['inputs']:,} → {stats['outputs']:,}", "success")
+
     def copy_subnet_membership(self):
         try:
             content = self.result_text5.get(1.0, tk.END)
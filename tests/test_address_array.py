@@ -0,0 +1,52 @@
+import ipaddress
+import random
+import unittest
+import address_array
+from address_array import IPv6Array
+
+
+def random_values(rng, count):
+    values = []
+    for _ in range(count):
+        value = 0
+        for _ in range(8):
+            value = (value << 16) | rng.choice([0, 0, 0, 1, 0x10, 0xabc, 0xffff, rng.getrandbits(16)])
+        values.append(value)
+    return values + [0, 1, (1 << 128) - 1, 1 << 112, 0xFFFF << 32, (0xFFFF << 32) | 0x01020304]
+
+
+@unittest.skipIf(address_array.np is None, "需要 numpy")
+class IPv6ArrayTest(unittest.TestCase):
+    def setUp(self):
+        self.values = random_values(random.Random(9), 5000)
+        self.array = IPv6Array.from_ints(self.values)
+    
+    def test_compressed_matches_ipaddress(self):
+        self.assertEqual(self.array.compressed(), [str(ipaddress.IPv6Address(v)) for v in self.values])
+    
+    def test_exploded_matches_ipaddress(self):
+        self.assertEqual(self.array.exploded(), [ipaddress.IPv6Address(v).exploded for v in self.values])
+    
+    def test_add_carries_into_high_half(self):
+        start = (0x20260db8 << 96) | ((1 << 64) - 3)
+        self.assertEqual(IPv6Array.from_range(start, 6).to_ints(), [start + i for i in range(6)])
+        self.assertEqual(IPv6Array.from_range(start, 4, 1 << 70).to_ints(), [start + (i << 70) for i in range(4)])
+    
+    def test_mask_and_contains(self):
+        network = ipaddress.IPv6Network("2026:db8::/32")
+        expected = [int(ipaddress.IPv6Network((v, 32), strict=False).network_address) for v in self.values]
+        self.assertEqual(self.array.mask(32).to_ints(), expected)
+        inside = IPv6Array.from_ints([int(network.network_address) + 5, int(network.broadcast_address) + 1])
+        self.assertEqual(inside.contains(network).tolist(), [True, False])
+    
+    def test_sort_matches_python(self):
+        self.assertEqual(self.array.sort().to_ints(), sorted(self.values))
+    
+    def test_empty_array(self):
+        empty = IPv6Array.from_ints([])
+        self.assertEqual(empty.compressed(), [])
+        self.assertEqual(empty.exploded(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import ipaddress
+import random
+import unittest
+from itertools import islice
+from address_format import AddressFormatter
+
+
+def sample_values(rng, count):
+    values = []
+    for _ in range(count):
+        value = 0
+        for _ in range(8):
+            value = (value << 16) | rng.choice([0, 0, 0, 1, 0x10, 0xabc, 0xffff, rng.getrandbits(16)])
+        values.append(value)
+    return values + [0, 1, (1 << 128) - 1, 1 << 112, 0xFFFF << 32, (0xFFFF << 32) | 0x01020304]
+
+
+class AddressFormatterTest(unittest.TestCase):
+    def setUp(self):
+        self.values = sample_values(random.Random(2), 3000)
+    
+    def test_exploded_and_compressed_match_ipaddress(self):
+        for value in self.values:
+            address = ipaddress.IPv6Address(value)
+            self.assertEqual(AddressFormatter.exploded(value), address.exploded)
+            self.assertEqual(AddressFormatter.compressed(value), str(address))
+    
+    def test_parse_round_trips(self):
+        for value in self.values:
+            address = ipaddress.IPv6Address(value)
+            self.assertEqual(AddressFormatter.parse(address.exploded), value)
+            self.assertEqual(AddressFormatter.parse(str(address)), value)
+            self.assertEqual(AddressFormatter.parse(str(address).upper()), value)
+    
+    def test_parse_rejects_invalid(self):
+        for text in ("1::2::3", "1:2:3:4:5:6:7", "1:2:3:4:5:6:7:8:9", "12345::", "g::1", ""):
+            with self.assertRaises(ValueError):
+                AddressFormatter.parse(text)
+    
+    def test_parse_prefix_line_layouts(self):
+        base = int(ipaddress.IPv6Address("2026:db8::"))
+        parse = AddressFormatter.parse_prefix_line
+        self.assertEqual(parse("2026:db8::/48"), (base, 48, []))
+        self.assertEqual(parse("2026:db8::/48\t张三\tA B"), (base, 48, ["张三", "A B"]))
+        self.assertEqual(parse("张三, 2026:db8::/48"), (base, 48, ["张三"]))
+        self.assertEqual(parse("12. 2026:0db8:0000:0000:0000:0000:0000:0000/64"), (base, 64, []))
+        self.assertEqual(parse("3. 2026:0db8:0000:0000:0000:0000:0000:0000/56  核心"), (base, 56, ["核心"]))
+        self.assertEqual(parse("7,2026:db8::,60,2026:db8:0:f:ffff:ffff:ffff:ffff,2026:db8::/60"), (base, 60, []))
+        self.assertEqual(parse("7,核心,2026:db8::,60,2026:db8::ff,2026:db8::/60"), (base, 60, ["核心"]))
+        self.assertEqual(parse("A/B, 2026:db8::/48"), (base, 48, ["A/B"]))
+        self.assertIsNone(parse("2026:db8::"))
+        self.assertIsNone(parse("序号,网络地址,前缀长度,子网结束地址,完整表示"))
+        for bad in ("2026:db8::/129", "2026:db8:::/48"):
+            with self.assertRaises(ValueError):
+                parse(bad)
+    
+    def test_iterators_match_ipaddress(self):
+        for start, step in ((0x20260db8 << 96 | 0xFFF0, 1), ((1 << 64) - 5, 1), (0x20260db8 << 96, 1 << 80), (7, 3)):
+            expected = [ipaddress.IPv6Address(start + i * step) for i in range(40)]
+            self.assertEqual(list(AddressFormatter.iter_exploded(start, 40, step)), [a.exploded for a in expected])
+            self.assertEqual(list(AddressFormatter.iter_compressed(start, 40, step)), [str(a) for a in expected])
+    
+    def test_iter_exploded_crosses_group_boundary(self):
+        start = (0x20260db8 << 96) | 0x1FFFE
+        self.assertEqual(list(islice(AddressFormatter.iter_exploded(start, 70000), 3, 5)),
+                         [ipaddress.IPv6Address(start + 3).exploded, ipaddress.IPv6Address(start + 4).exploded])
+    
+    def test_numbered_lines(self):
+        lines = list(AddressFormatter.numbered_lines(9, 0x20260db8 << 96 | 9, 2, suffix="/128"))
+        self.assertEqual(lines, ["9. 2026:0db8:0000:0000:0000:0000:0000:0009/128\n",
+                                 "10. 2026:0db8:0000:0000:0000:0000:0000:000a/128\n"])
+
+
+if __name__ == "__main__":
+    unittest.main()
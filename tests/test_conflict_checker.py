@@ -0,0 +1,98 @@
+import bz2
+import csv
+import ipaddress
+import os
+import random
+import shutil
+import tempfile
+import unittest
+from conflict_checker import PrefixTable, ConflictChecker, KIND_DUPLICATE, KIND_CONTAINED
+from export_writer import AddressExporter
+
+
+ALL_ONES = (1 << 128) - 1
+
+
+def brute_force_conflicts(table):
+    order = ConflictChecker.sorted_order(table)
+    position = {index: n for n, index in enumerate(order)}
+    expected = {}
+    for inner in range(len(table)):
+        best = None
+        for outer in range(len(table)):
+            if outer == inner:
+                continue
+            length = table.lengths[outer]
+            if length > table.lengths[inner] or table.starts[inner] & (ALL_ONES ^ (ALL_ONES >> length)) != table.starts[outer]:
+                continue
+            if length == table.lengths[inner] and position[outer] > position[inner]:
+                continue
+            if best is None or (length, -position[outer]) > (table.lengths[best], -position[best]):
+                best = outer
+        if best is not None:
+            kind = KIND_DUPLICATE if table.lengths[best] == table.lengths[inner] else KIND_CONTAINED
+            expected[inner] = (kind, best)
+    return expected
+
+
+class ConflictCheckerTest(unittest.TestCase):
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        shutil.rmtree(self.work_dir)
+    
+    def test_find_conflicts_matches_brute_force(self):
+        rng = random.Random(22)
+        table = PrefixTable()
+        base = 0x20260db8 << 96
+        for _ in range(400):
+            length = rng.choice([32, 40, 44, 48, 52, 56, 64])
+            table.add(base | rng.getrandbits(20) << 72, length, "", rng.randrange(2))
+        
+        conflicts, max_depth = ConflictChecker.find_conflicts(table)
+        found = {inner: (kind, outer) for kind, outer, inner, _ in conflicts}
+        self.assertEqual(len(found), len(conflicts))
+        self.assertEqual(found, brute_force_conflicts(table))
+        self.assertGreaterEqual(max_depth, 2)
+    
+    def test_check_compressed_files(self):
+        first = os.path.join(self.work_dir, "a.txt")
+        with open(first, 'w', encoding='utf-8') as f:
+            f.write("2026:db8::/32,core\n2026:db8:1::/48,lan\n")
+        second = os.path.join(self.work_dir, "b.txt.bz2")
+        with bz2.open(second, "wt", encoding="utf-8") as f:
+            f.write("2026:db8:1::/48,dup\n2026:db9::/32,other\n")
+        output = os.path.join(self.work_dir, "conflicts.csv")
+        
+        stats = ConflictChecker.check_files([first, second], output)
+        self.assertEqual((stats["prefixes"], stats["duplicates"], stats["contained"], stats["cross_source"]), (4, 1, 1, 1))
+        with open(output, 'r', encoding='utf-8-sig', newline='') as f:
+            rows = f.read().split("\r\n")
+        self.assertEqual(rows[1], "包含,2026:db8::/32,core,a.txt,1,2026:db8:1::/48,lan,a.txt,2,是,1")
+        self.assertEqual(rows[2], "重复,2026:db8:1::/48,lan,a.txt,2,2026:db8:1::/48,dup,b.txt.bz2,1,否,2")
+    
+    def test_subnet_exports_and_quoted_fields(self):
+        network = ipaddress.IPv6Network("2026:db8::/48")
+        first = os.path.join(self.work_dir, 'team "a", core.txt')
+        AddressExporter.export_subnets(first, network, 56, 1, 4)
+        second = os.path.join(self.work_dir, "team-b.csv")
+        AddressExporter.export_subnets(second, network, 56, 4, 5)
+        third = os.path.join(self.work_dir, "wide.txt")
+        with open(third, 'w', encoding='utf-8') as f:
+            f.write('2026:db8::/48  核心 "A"\n')
+        output = os.path.join(self.work_dir, "conflicts.csv")
+        
+        stats = ConflictChecker.check_files([first, second, third], output)
+        self.assertEqual((stats["prefixes"], stats["skipped"], stats["duplicates"], stats["contained"]), (7, 1, 1, 5))
+        with open(output, 'r', encoding='utf-8-sig', newline='') as f:
+            rows = list(csv.reader(f))
+        self.assertTrue(all(len(row) == len(rows[0]) for row in rows))
+        self.assertEqual(rows[1][1:5], ["2026:db8::/48", '核心 "A"', "wide.txt", "1"])
+        duplicate = next(row for row in rows if row[0] == "重复")
+        self.assertEqual(duplicate[1:], ["2026:db8:0:300::/56", "", 'team "a", core.txt', "4",
+                                         "2026:db8:0:300::/56", "", "team-b.csv", "2", "否", "2"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import ipaddress
+import lzma
+import os
+import shutil
+import tempfile
+import unittest
+from eui64_batch import EUI64Converter, EUI64Index
+from planner_engine import PlannerEngine
+
+
+class EUI64ConverterTest(unittest.TestCase):
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        shutil.rmtree(self.work_dir)
+    
+    def test_interface_id_matches_single_conversion(self):
+        for mac_text in ("00:11:22:33:44:55", "02:00:00:00:00:01", "ff:ff:ff:ff:ff:ff", "00:00:00:00:00:00"):
+            mac = EUI64Converter.mac_to_int(mac_text)
+            expected = PlannerEngine.eui64(mac_text, "2026:db8::/64")["address"]
+            self.assertEqual(EUI64Converter.interface_id(mac), int(expected) & ((1 << 64) - 1))
+            self.assertEqual(EUI64Converter.mac_from_address(expected), mac)
+            self.assertEqual(EUI64Converter.mac_text(mac), mac_text)
+            iid = int(expected) & ((1 << 64) - 1)
+            self.assertEqual(EUI64Converter.interface_id_text(iid),
+                             ":".join(f"{(iid >> shift) & 0xFFFF:x}" for shift in (48, 32, 16, 0)))
+    
+    def test_non_eui64_address_has_no_mac(self):
+        self.assertIsNone(EUI64Converter.mac_from_address(ipaddress.IPv6Address("2026:db8::1")))
+    
+    def test_parse_prefixes(self):
+        prefixes = EUI64Converter.parse_prefixes("2026:db8::/64, 2026:db8:1::5/64; 2026:db8::/64")
+        self.assertEqual([str(p) for p in prefixes], ["2026:db8::/64", "2026:db8:1::/64"])
+        with self.assertRaises(ValueError):
+            EUI64Converter.parse_prefixes("2026:db8::/48")
+        with self.assertRaises(ValueError):
+            EUI64Converter.parse_prefixes(" ")
+    
+    def test_convert_compressed_file_and_reverse_lookup(self):
+        macs_path = os.path.join(self.work_dir, "macs.log.xz")
+        with lzma.open(macs_path, "wt", encoding="utf-8") as f:
+            f.write("# inventory\nsw1 00-11-22-33-44-55 up\n0011.2233.4466\n00:11:22:33:44:55\nno mac here\n")
+        output_path = os.path.join(self.work_dir, "slaac.csv")
+        prefixes = EUI64Converter.parse_prefixes("2026:db8::/64 ::/64")
+        index = EUI64Index()
+        
+        stats = EUI64Converter.convert_file(macs_path, prefixes, output_path, index)
+        self.assertEqual((stats["macs"], stats["duplicates"], stats["invalid"], stats["addresses"]), (2, 1, 1, 4))
+        with open(output_path, 'r', encoding='utf-8-sig', newline='') as f:
+            rows = [row.split(",") for row in f.read().split("\r\n")[1:-1]]
+        for mac_text, network_text, iid_text, address_text in rows:
+            expected = PlannerEngine.eui64(mac_text, "2026:db8::/64")["address"]
+            address = ipaddress.IPv6Address(address_text)
+            self.assertEqual(str(address), address_text)
+            self.assertIn(address, ipaddress.IPv6Network(network_text))
+            self.assertEqual(int(address) & ((1 << 64) - 1), int(expected) & ((1 << 64) - 1))
+        
+        self.assertEqual(len(index), 2)
+        mac, line_number = index.lookup(ipaddress.IPv6Address("2026:db8:ffff::211:22ff:fe33:4466"))
+        self.assertEqual((EUI64Converter.mac_text(mac), line_number), ("00:11:22:33:44:66", 3))
+
+
+if __name__ == "__main__":
+    unittest.main()
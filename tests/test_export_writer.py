@@ -0,0 +1,183 @@
+import bz2
+import gzip
+import ipaddress
+import lzma
+import os
+import shutil
+import tempfile
+import unittest
+from export_writer import BufferedExportWriter, AddressExporter, ExportCheckpoint, split_compression
+
+
+class RecordingWriter:
+    def __init__(self):
+        self.chunks = []
+    
+    def write_text(self, text):
+        self.chunks.append(text)
+
+
+def stop_after(chunks):
+    calls = []
+    
+    def should_stop():
+        calls.append(1)
+        return len(calls) > chunks
+    return should_stop
+
+
+class ExportWriterTest(unittest.TestCase):
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        shutil.rmtree(self.work_dir)
+    
+    def path(self, name):
+        return os.path.join(self.work_dir, name)
+    
+    def read(self, name):
+        with open(self.path(name), 'r', encoding='utf-8') as f:
+            return f.read()
+    
+    def test_pump_lines_counts_lines_actually_produced(self):
+        writer = RecordingWriter()
+        progress = []
+        lines = (f"{i}\n" for i in range(10))
+        done = AddressExporter.pump_lines(writer, lines, 25, on_progress=progress.append, chunk_lines=4)
+        self.assertEqual(done, 10)
+        self.assertEqual(progress, [4, 8, 10])
+        self.assertEqual("".join(writer.chunks), "".join(f"{i}\n" for i in range(10)))
+    
+    def test_pump_lines_stops_between_chunks(self):
+        writer = RecordingWriter()
+        lines = (f"{i}\n" for i in range(100))
+        done = AddressExporter.pump_lines(writer, lines, 100, should_stop=lambda: len(writer.chunks) >= 2,
+                                          chunk_lines=10)
+        self.assertEqual(done, 20)
+    
+    def test_buffered_writer_preserves_order(self):
+        with BufferedExportWriter(self.path("out.txt"), translate_newlines=False, max_pending=1) as writer:
+            for i in range(1000):
+                writer.write_text(f"{i}\n")
+        self.assertEqual(self.read("out.txt"), "".join(f"{i}\n" for i in range(1000)))
+    
+    def test_export_hosts_matches_ipaddress(self):
+        network = ipaddress.IPv6Network("2026:db8::/120")
+        done = AddressExporter.export_hosts(self.path("hosts.txt"), network, 10, 40, 254)
+        self.assertEqual(done, 31)
+        body = self.read("hosts.txt").split("=" * 60 + "\n\n", 1)[1]
+        expected = "".join(f"{i}. {(network.network_address + i).exploded}\n" for i in range(10, 41))
+        self.assertEqual(body, expected)
+    
+    def test_export_subnets_matches_ipaddress(self):
+        network = ipaddress.IPv6Network("2026:db8::/48")
+        subnets = list(network.subnets(new_prefix=60))
+        done = AddressExporter.export_subnets(self.path("subnets.csv"), network, 60, 3, 4000)
+        self.assertEqual(done, 3998)
+        with open(self.path("subnets.csv"), 'r', encoding='utf-8-sig', newline='') as f:
+            rows = f.read().split("\r\n")
+        self.assertEqual(rows[0], "序号,网络地址,前缀长度,子网结束地址,完整表示")
+        expected = [f"{i},{subnets[i - 1].network_address},60,{subnets[i - 1].broadcast_address},{subnets[i - 1]}"
+                    for i in range(3, 4001)]
+        self.assertEqual(rows[1:-1], expected)
+        
+        AddressExporter.export_subnets(self.path("subnets.txt"), network, 60, 4095, 4096)
+        self.assertEqual(self.read("subnets.txt"), f"4095. {subnets[4094].network_address.exploded}/60\n"
+                                                   f"4096. {subnets[4095].network_address.exploded}/60\n")
+
+
+class CheckpointResumeTest(unittest.TestCase):
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        self.network = ipaddress.IPv6Network("2026:db8::/64")
+    
+    def tearDown(self):
+        shutil.rmtree(self.work_dir)
+    
+    def read_bytes(self, path):
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rb") as f:
+            return f.read()
+    
+    def resume(self, export, path):
+        state = ExportCheckpoint.load(path)
+        self.assertIsNotNone(state)
+        export(path, resume_from=state)
+        self.assertIsNone(ExportCheckpoint.load(path))
+    
+    def check_resume(self, name, export):
+        full = os.path.join(self.work_dir, "full-" + name)
+        export(full)
+        self.assertFalse(os.path.exists(ExportCheckpoint.sidecar_path(full)))
+        
+        path = os.path.join(self.work_dir, name)
+        done = export(path, should_stop=stop_after(1))
+        self.assertEqual(done, 65536)
+        state = ExportCheckpoint.load(path)
+        self.assertEqual(state["next_index"], state["start_index"] + 65536)
+        self.resume(export, path)
+        self.assertEqual(self.read_bytes(path), self.read_bytes(full))
+    
+    def test_resume_hosts(self):
+        def export(path, **kwargs):
+            return AddressExporter.export_hosts(path, self.network, 5, 150004, 2 ** 64 - 2, **kwargs)
+        self.check_resume("hosts.txt", export)
+        self.check_resume("hosts.txt.gz", export)
+    
+    def test_resume_sampled_hosts(self):
+        def export(path, **kwargs):
+            return AddressExporter.export_hosts(path, self.network, 1, 150000, 2 ** 64 - 2, sample_seed=7, **kwargs)
+        self.check_resume("sample.txt.gz", export)
+    
+    def test_resume_subnets_csv(self):
+        def export(path, **kwargs):
+            return AddressExporter.export_subnets(path, self.network, 84, 1, 150000, **kwargs)
+        self.check_resume("subnets.csv", export)
+        self.check_resume("subnets.csv.gz", export)
+    
+    def test_truncated_file_rejected(self):
+        path = os.path.join(self.work_dir, "hosts.txt")
+        AddressExporter.export_hosts(path, self.network, 1, 150000, 2 ** 64 - 2, should_stop=stop_after(1))
+        with open(path, "r+b") as f:
+            f.truncate(100)
+        with self.assertRaises(ValueError):
+            ExportCheckpoint.load(path)
+
+
+class CompressedExportTest(unittest.TestCase):
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        shutil.rmtree(self.work_dir)
+    
+    def test_split_compression(self):
+        self.assertEqual(split_compression("hosts.txt.GZ"), ("hosts.txt", "gzip"))
+        self.assertEqual(split_compression("hosts.txt.xz"), ("hosts.txt", "xz"))
+        self.assertEqual(split_compression("hosts.csv.bz2"), ("hosts.csv", "bz2"))
+        self.assertEqual(split_compression("hosts.txt"), ("hosts.txt", None))
+    
+    def test_compressed_round_trip(self):
+        network = ipaddress.IPv6Network("2026:db8::/64")
+        plain = os.path.join(self.work_dir, "hosts.txt")
+        AddressExporter.export_hosts(plain, network, 1, 20000, 2 ** 64 - 2)
+        with open(plain, 'rb') as f:
+            expected = f.read()
+        for suffix, module in ((".gz", gzip), (".xz", lzma), (".bz2", bz2)):
+            path = plain + suffix
+            AddressExporter.export_hosts(path, network, 1, 20000, 2 ** 64 - 2)
+            with module.open(path, "rb") as f:
+                self.assertEqual(f.read(), expected, suffix)
+            self.assertLess(os.path.getsize(path), len(expected))
+    
+    def test_bom_written_once_inside_compressed_stream(self):
+        path = os.path.join(self.work_dir, "table.csv.gz")
+        with BufferedExportWriter(path, encoding="utf-8-sig", translate_newlines=False) as writer:
+            writer.write_text("前缀,标签\r\n")
+        with gzip.open(path, "rb") as f:
+            self.assertEqual(f.read(), "\ufeff前缀,标签\r\n".encode("utf-8"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import ipaddress
+import os
+import random
+import shutil
+import tempfile
+import unittest
+from export_writer import AddressExporter
+from free_space import FreeSpaceIndex, gap_shape
+
+
+PARENT = int(ipaddress.IPv6Address("2026:db8::100"))
+PARENT_PREFIX = 120
+
+
+class BruteForce:
+    def __init__(self, allocations):
+        self.used = set()
+        for start, prefixlen in allocations:
+            self.used.update(range(start, start + (1 << (128 - prefixlen))))
+    
+    def is_free(self, start, prefixlen):
+        end = start + (1 << (128 - prefixlen))
+        return PARENT <= start and end <= PARENT + 256 and not any(a in self.used for a in range(start, end))
+    
+    def next_free(self, prefixlen, after):
+        size = 1 << (128 - prefixlen)
+        candidate = -(-max(after, PARENT) // size) * size
+        while candidate < PARENT + 256:
+            if self.is_free(candidate, prefixlen):
+                return candidate
+            candidate += size
+        return None
+    
+    def free_blocks(self):
+        free = [ipaddress.IPv6Address(a) for a in range(PARENT, PARENT + 256) if a not in self.used]
+        networks = ipaddress.collapse_addresses(ipaddress.IPv6Network(address) for address in free)
+        return [(int(network.network_address), network.prefixlen) for network in networks]
+
+
+class FreeSpaceIndexTest(unittest.TestCase):
+    def random_allocations(self, rng):
+        allocations = []
+        for _ in range(rng.randint(0, 12)):
+            prefixlen = rng.randint(118, 128)
+            start = (PARENT - 512 + rng.randrange(1280)) & ~((1 << (128 - prefixlen)) - 1)
+            allocations.append((start, prefixlen))
+        return allocations
+    
+    def test_matches_brute_force(self):
+        rng = random.Random(2026)
+        for _ in range(200):
+            allocations = self.random_allocations(rng)
+            index = FreeSpaceIndex(PARENT + 7, PARENT_PREFIX, [(start << 8) | p for start, p in allocations])
+            brute = BruteForce(allocations)
+            
+            blocks = brute.free_blocks()
+            self.assertEqual(list(index.free_blocks()), blocks)
+            self.assertEqual(index.block_count, len(blocks))
+            self.assertEqual([index.block(i) for i in range(len(blocks))], blocks)
+            self.assertEqual(index.free_addresses, sum(1 << (128 - p) for _, p in blocks))
+            
+            for prefixlen in range(PARENT_PREFIX, 129):
+                for after in (None, PARENT + rng.randrange(256)):
+                    expected = brute.next_free(prefixlen, PARENT if after is None else after)
+                    self.assertEqual(index.next_free(prefixlen, after), expected, (allocations, prefixlen, after))
+            
+            for _ in range(30):
+                prefixlen = rng.randint(PARENT_PREFIX, 128)
+                start = (PARENT + rng.randrange(256)) & ~((1 << (128 - prefixlen)) - 1)
+                self.assertEqual(index.is_free(start, prefixlen), brute.is_free(start, prefixlen))
+            
+            if blocks:
+                prefixlen = min(p for _, p in blocks)
+                self.assertEqual(index.largest_free_block(), (brute.next_free(prefixlen, PARENT), prefixlen))
+            else:
+                self.assertIsNone(index.largest_free_block())
+    
+    def test_gap_shape(self):
+        for start in range(0, 64):
+            for end in range(start, 64):
+                blocks = list(ipaddress.summarize_address_range(ipaddress.IPv6Address(start),
+                                                                ipaddress.IPv6Address(end)))
+                self.assertEqual(gap_shape(start, end), (min(b.prefixlen for b in blocks), len(blocks)))
+    
+    def test_from_subnet_export(self):
+        work_dir = tempfile.mkdtemp()
+        try:
+            network = ipaddress.IPv6Network("2026:db8::/48")
+            path = os.path.join(work_dir, "subnets.txt.bz2")
+            AddressExporter.export_subnets(path, network, 56, 1, 3)
+            index, loaded, skipped = FreeSpaceIndex.from_file(int(network.network_address), 48, path)
+            self.assertEqual((loaded, skipped), (3, 0))
+            self.assertEqual(index.next_free(56), int(ipaddress.IPv6Address("2026:db8:0:300::")))
+            self.assertEqual(index.largest_free_block(), (int(ipaddress.IPv6Address("2026:db8:0:8000::")), 49))
+        finally:
+            shutil.rmtree(work_dir)
+    
+    def test_prefix_outside_parent_rejected(self):
+        index = FreeSpaceIndex(PARENT, PARENT_PREFIX, [])
+        self.assertEqual(index.largest_free_block(), (PARENT, PARENT_PREFIX))
+        with self.assertRaises(ValueError):
+            index.next_free(PARENT_PREFIX - 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+import gzip
+import ipaddress
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+import host_sampler
+from host_sampler import FeistelPermutation, HostSampler
+from export_writer import AddressExporter, ExportCheckpoint
+
+
+class FeistelPermutationTest(unittest.TestCase):
+    def test_bijection_on_small_domains(self):
+        for domain in (1, 2, 3, 10, 254, 1000, 4097):
+            for seed in ("a", 42):
+                permutation = FeistelPermutation(domain, seed)
+                values = permutation.block(0, domain)
+                self.assertEqual(sorted(values), list(range(domain)))
+                self.assertEqual(values[:100], [permutation(i) for i in range(min(domain, 100))])
+    
+    def test_same_seed_same_order(self):
+        first = FeistelPermutation(2 ** 64 - 2, "seed").block(0, 1000)
+        self.assertEqual(first, FeistelPermutation(2 ** 64 - 2, "seed").block(0, 1000))
+        self.assertNotEqual(first, FeistelPermutation(2 ** 64 - 2, "other").block(0, 1000))
+    
+    def test_large_domains_stay_in_range_without_repeats(self):
+        for domain in (2 ** 64 - 2, 2 ** 80 - 2, 2 ** 126 - 2):
+            values = FeistelPermutation(domain, "x").block(10 ** 6, 5000)
+            self.assertEqual(len(set(values)), 5000)
+            self.assertLess(max(values), domain)
+    
+    def test_out_of_range_index_rejected(self):
+        with self.assertRaises(ValueError):
+            FeistelPermutation(10, "x")(10)
+        with self.assertRaises(ValueError):
+            FeistelPermutation(0, "x")
+
+
+@unittest.skipIf(host_sampler.np is None, "需要 numpy")
+class VectorizedSamplerTest(unittest.TestCase):
+    def python_blocks(self, *args):
+        with mock.patch.object(host_sampler, "np", None):
+            return b"".join(data for _, data in HostSampler.numbered_blocks(*args, block_size=97))
+    
+    def test_vectorized_matches_python_path(self):
+        network_int = 0x20260db8 << 96
+        for first_position, count in ((1, 500), (95, 30), (99990, 40)):
+            args = (network_int, 2 ** 64 - 2, "seed", first_position, count)
+            blocks = list(HostSampler.numbered_blocks(*args, block_size=97))
+            self.assertEqual(sum(size for size, _ in blocks), count)
+            self.assertEqual(b"".join(data for _, data in blocks), self.python_blocks(*args))
+    
+    def test_vectorized_permutation_matches_scalar(self):
+        for domain, start in ((2 ** 64 - 2, 12345), (2 ** 80 - 2, 2 ** 40 - 150), (2 ** 127 + 5, 2 ** 64 - 150),
+                              (2 ** 128 - 2, 2 ** 64 - 150), (2 ** 128 - 2, 2 ** 127 - 150), (1000, 700)):
+            permutation = FeistelPermutation(domain, "seed")
+            self.assertTrue(permutation.vectorized)
+            values = permutation.block(start, 300)
+            self.assertEqual(values, [permutation(i) for i in range(start, start + 300)], domain)
+    
+    def test_wide_networks_take_vectorized_path(self):
+        for prefix in (48, 0):
+            host_bits = 128 - prefix
+            args = ((0x20260db8 << 96) >> host_bits << host_bits, 2 ** host_bits - 2, "seed", 2 ** 40 - 20, 300)
+            blocks = list(HostSampler.numbered_blocks(*args, block_size=97))
+            self.assertEqual(b"".join(data for _, data in blocks), self.python_blocks(*args))
+
+
+class SampleExportTest(unittest.TestCase):
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        self.network = ipaddress.IPv6Network("2026:db8::/64")
+        self.total = 2 ** 64 - 2
+    
+    def tearDown(self):
+        shutil.rmtree(self.work_dir)
+    
+    def path(self, name):
+        return os.path.join(self.work_dir, name)
+    
+    def body(self, text):
+        return text.split("=" * 60 + "\n\n", 1)[1].splitlines()
+    
+    def test_sample_lines_are_distinct_hosts(self):
+        AddressExporter.export_hosts(self.path("sample.txt"), self.network, 1, 5000, self.total, sample_seed="7")
+        with open(self.path("sample.txt"), 'r', encoding='utf-8') as f:
+            lines = self.body(f.read())
+        self.assertEqual(len(lines), 5000)
+        addresses = set()
+        for number, line in enumerate(lines, 1):
+            prefix, text = line.split(". ")
+            self.assertEqual(int(prefix), number)
+            address = ipaddress.IPv6Address(text)
+            self.assertEqual(text, address.exploded)
+            self.assertIn(address, self.network)
+            self.assertNotIn(address, (self.network.network_address, self.network.broadcast_address))
+            addresses.add(address)
+        self.assertEqual(len(addresses), 5000)
+    
+    def test_interrupted_compressed_sample_resumes_identically(self):
+        AddressExporter.export_hosts(self.path("full.txt"), self.network, 1, 200000, self.total, sample_seed="7")
+        
+        calls = []
+        def stop():
+            calls.append(1)
+            return len(calls) > 2
+        partial = self.path("resumed.txt.gz")
+        AddressExporter.export_hosts(partial, self.network, 1, 200000, self.total, should_stop=stop, sample_seed="7")
+        state = ExportCheckpoint.load(partial)
+        self.assertEqual(state["sample_seed"], "7")
+        self.assertLess(state["next_index"], 200001)
+        
+        done = AddressExporter.export_hosts(partial, self.network, 1, 200000, self.total, resume_from=state,
+                                            sample_seed=state["sample_seed"])
+        self.assertEqual(done, 200000)
+        self.assertFalse(os.path.exists(ExportCheckpoint.sidecar_path(partial)))
+        with gzip.open(partial, "rt", encoding="utf-8") as f, open(self.path("full.txt"), 'r', encoding='utf-8') as g:
+            self.assertEqual(f.read(), g.read())
+    
+    def test_sample_larger_than_network_rejected(self):
+        network = ipaddress.IPv6Network("2026:db8::/120")
+        with self.assertRaises(ValueError):
+            AddressExporter.export_hosts(self.path("x.txt"), network, 1, 255, 254, sample_seed="1")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import threading
+import time
+import unittest
+from job_manager import JobManager, PRIORITY_INTERACTIVE, PRIORITY_BATCH, PRIORITY_EXPORT
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.time() + timeout
+    while not condition():
+        if time.time() > deadline:
+            raise AssertionError("等待超时")
+        time.sleep(0.01)
+
+
+class JobManagerTest(unittest.TestCase):
+    def setUp(self):
+        self.manager = JobManager(max_workers=2)
+        self.gate = threading.Event()
+    
+    def tearDown(self):
+        self.gate.set()
+        self.manager.shutdown()
+    
+    def block_bulk_slot(self):
+        job = self.manager.submit("blocker", lambda job: self.gate.wait(), PRIORITY_EXPORT)
+        wait_for(lambda: job.state == "running")
+        return job
+    
+    def test_bulk_jobs_run_in_priority_order(self):
+        self.block_bulk_slot()
+        order = []
+        export = self.manager.submit("export", lambda job: order.append("export"), PRIORITY_EXPORT)
+        batch = self.manager.submit("batch", lambda job: order.append("batch"), PRIORITY_BATCH)
+        self.gate.set()
+        wait_for(lambda: not export.is_active() and not batch.is_active())
+        self.assertEqual(order, ["batch", "export"])
+    
+    def test_interactive_job_bypasses_full_bulk_slots(self):
+        self.block_bulk_slot()
+        job = self.manager.submit("interactive", lambda job: None, PRIORITY_INTERACTIVE)
+        wait_for(lambda: job.state != "queued" and job.state != "running")
+        self.assertEqual(job.state, "done")
+    
+    def test_cancelled_queued_job_runs_body_with_token_set(self):
+        self.block_bulk_slot()
+        seen = []
+        job = self.manager.submit("queued", lambda job: seen.append(job.token.is_cancelled()), PRIORITY_EXPORT)
+        time.sleep(0.1)
+        self.assertEqual(job.state, "queued")
+        
+        self.assertTrue(self.manager.cancel(job.job_id))
+        wait_for(lambda: not job.is_active())
+        self.assertEqual(seen, [True])
+        self.assertEqual(job.state, "cancelled")
+    
+    def test_failed_job_records_error(self):
+        def fail(job):
+            raise ValueError("boom")
+        job = self.manager.submit("fail", fail, PRIORITY_BATCH)
+        wait_for(lambda: not job.is_active())
+        self.assertEqual(job.state, "failed")
+        self.assertEqual(job.error, "boom")
+    
+    def test_duplicate_key_rejected_while_active(self):
+        self.manager.submit("first", lambda job: self.gate.wait(), PRIORITY_EXPORT, key="out.txt")
+        with self.assertRaises(ValueError):
+            self.manager.submit("second", lambda job: None, PRIORITY_EXPORT, key="out.txt")
+
+
+if __name__ == "__main__":
+    unittest.main()
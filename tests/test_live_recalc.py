@@ -0,0 +1,121 @@
+import threading
+import time
+import unittest
+from job_manager import JobManager
+from live_recalc import LiveRecalculator
+
+
+class FakeRoot:
+    def __init__(self):
+        self.thread = threading.current_thread()
+        self.callbacks = {}
+        self.next_id = 0
+    
+    def after(self, delay_ms, callback):
+        if threading.current_thread() is not self.thread:
+            raise AssertionError("after() 只能在界面线程调用")
+        self.next_id += 1
+        self.callbacks[self.next_id] = callback
+        return self.next_id
+    
+    def after_cancel(self, callback_id):
+        self.callbacks.pop(callback_id, None)
+    
+    def pump(self, until, timeout=5.0):
+        deadline = time.time() + timeout
+        while not until():
+            if time.time() > deadline:
+                raise AssertionError("等待超时")
+            callbacks = list(self.callbacks.values())
+            self.callbacks.clear()
+            for callback in callbacks:
+                callback()
+            time.sleep(0.01)
+
+
+class FakeEntry:
+    def __init__(self, value):
+        self.value = value
+    
+    def get(self):
+        return self.value
+
+
+class LiveRecalculatorTest(unittest.TestCase):
+    def setUp(self):
+        self.root = FakeRoot()
+        self.manager = JobManager(max_workers=2)
+    
+    def tearDown(self):
+        self.manager.shutdown()
+    
+    def make(self, compute, results, errors):
+        live = LiveRecalculator(self.root, compute, results.append, errors.append, jobs=self.manager)
+        live.entries = [FakeEntry("2026:db8::")]
+        return live
+    
+    def test_result_delivered_on_ui_thread(self):
+        results, errors = [], []
+        delivered_on = []
+        live = self.make(lambda inputs, is_stale: inputs[0].upper(), results, errors)
+        live.on_result = lambda value: (results.append(value), delivered_on.append(threading.current_thread()))
+        live.run_now()
+        self.root.pump(lambda: results)
+        self.assertEqual(results, ["2026:DB8::"])
+        self.assertEqual(delivered_on, [self.root.thread])
+        self.root.pump(lambda: not self.root.callbacks)
+    
+    def test_error_delivered_to_error_callback(self):
+        results, errors = [], []
+        
+        def compute(inputs, is_stale):
+            raise ValueError("无效地址")
+        
+        self.make(compute, results, errors).run_now()
+        self.root.pump(lambda: errors)
+        self.assertEqual(errors, ["无效地址"])
+        self.assertEqual(results, [])
+    
+    def test_stale_result_dropped(self):
+        results, errors = [], []
+        started = threading.Event()
+        release = threading.Event()
+        
+        def compute(inputs, is_stale):
+            started.set()
+            release.wait()
+            return inputs[0]
+        
+        live = self.make(compute, results, errors)
+        live.run_now()
+        started.wait(5)
+        live.cancel()
+        release.set()
+        time.sleep(0.2)
+        self.root.pump(lambda: not self.root.callbacks)
+        self.assertEqual(results, [])
+    
+    def test_overlapping_runs_share_one_channel(self):
+        results, errors = [], []
+        release = threading.Event()
+        
+        def compute(inputs, is_stale):
+            release.wait(5)
+            return None if is_stale() else inputs[0]
+        
+        live = self.make(compute, results, errors)
+        live.run_now()
+        channel = live.channel
+        live.entries = [FakeEntry("2026:db8:1::")]
+        live.run_now()
+        self.assertIs(live.channel, channel)
+        self.assertEqual(live.active, 2)
+        release.set()
+        self.root.pump(lambda: live.channel is None)
+        self.assertEqual(results, ["2026:db8:1::"])
+        self.assertTrue(channel.closed)
+        self.assertEqual(self.root.callbacks, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import gzip
+import ipaddress
+import os
+import random
+import shutil
+import tempfile
+import unittest
+from export_writer import AddressExporter
+from plan_store import PlanStore
+
+
+BASE = int(ipaddress.IPv6Address("2026:db8::"))
+
+
+def contains(outer, inner):
+    (outer_start, outer_prefix), (inner_start, inner_prefix) = outer, inner
+    return outer_prefix <= inner_prefix and inner_start >> (128 - outer_prefix) == outer_start >> (128 - outer_prefix)
+
+
+class PlanStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        self.store = PlanStore(os.path.join(self.work_dir, "plans.db"))
+        rng = random.Random(2026)
+        prefixes = set()
+        while len(prefixes) < 400:
+            prefixlen = rng.randint(40, 64)
+            start = (BASE + (rng.getrandbits(32) << 64)) & ~((1 << (128 - prefixlen)) - 1)
+            prefixes.add((start, prefixlen))
+        self.prefixes = sorted(prefixes)
+        self.rng = rng
+    
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.work_dir)
+    
+    def expected_parents(self):
+        parents = {}
+        for prefix in self.prefixes:
+            covering = [other for other in self.prefixes if other != prefix and contains(other, prefix)]
+            parents[prefix] = max(covering, key=lambda other: other[1]) if covering else None
+        return parents
+    
+    def check_store(self):
+        self.assertEqual(self.store.count(), len(self.prefixes))
+        ids = {prefix: self.store.find(*prefix).allocation_id for prefix in self.prefixes}
+        for prefix, parent in self.expected_parents().items():
+            self.assertEqual(self.store.find(*prefix).parent_id, ids[parent] if parent else None, prefix)
+        
+        for _ in range(50):
+            start, prefixlen = self.rng.choice(self.prefixes)
+            query = (start, max(0, prefixlen - self.rng.randint(0, 8)))
+            expected = sorted(prefix for prefix in self.prefixes if contains(query, prefix))
+            self.assertEqual([(a.start, a.prefixlen) for a in self.store.within(*query)], expected)
+            self.assertEqual(self.store.count_within(*query), len(expected))
+            
+            address = start | self.rng.getrandbits(128 - prefixlen)
+            expected = sorted((prefix for prefix in self.prefixes if contains(prefix, (address, 128))),
+                              key=lambda prefix: -prefix[1])
+            self.assertEqual([(a.start, a.prefixlen) for a in self.store.covering(address)], expected)
+    
+    def test_add_in_random_order_links_parents(self):
+        for start, prefixlen in self.rng.sample(self.prefixes, len(self.prefixes)):
+            self.store.add(start, prefixlen)
+        self.check_store()
+        with self.assertRaises(ValueError):
+            self.store.add(*self.prefixes[0])
+    
+    def test_remove_relinks_children(self):
+        for prefix in self.prefixes:
+            self.store.add(*prefix)
+        for prefix in self.rng.sample(self.prefixes, 100):
+            self.assertTrue(self.store.remove(self.store.find(*prefix).allocation_id))
+            self.prefixes.remove(prefix)
+        self.check_store()
+    
+    def test_import_file_matches_add(self):
+        path = os.path.join(self.work_dir, "plan.csv.gz")
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            f.write("# 分配表\n")
+            for start, prefixlen in self.prefixes:
+                f.write(f"{ipaddress.IPv6Address(start)}/{prefixlen},运维,核心,北京\n")
+            f.write("not a prefix\n")
+            f.write(f"{ipaddress.IPv6Address(self.prefixes[0][0])}/{self.prefixes[0][1]}\n")
+        
+        stats = self.store.import_file(path)
+        self.assertEqual((stats["imported"], stats["duplicates"], stats["skipped"]), (len(self.prefixes), 1, 1))
+        allocation = self.store.find(*self.prefixes[0])
+        self.assertEqual((allocation.owner, allocation.tags), ("运维", "核心;北京"))
+        self.check_store()
+    
+    def test_import_subnet_exports(self):
+        network = ipaddress.IPv6Network("2026:db8::/48")
+        subnets = [(int(subnet.network_address), 56) for subnet in list(network.subnets(new_prefix=56))[:4]]
+        for name, header_lines in (("subnets.txt", 0), ("subnets.csv", 1)):
+            path = os.path.join(self.work_dir, name)
+            AddressExporter.export_subnets(path, network, 56, 1, 4)
+            with PlanStore(os.path.join(self.work_dir, name + ".db")) as store:
+                stats = store.import_file(path)
+                self.assertEqual((stats["imported"], stats["skipped"]), (4, header_lines), name)
+                allocations = store.within(int(network.network_address), 48)
+                self.assertEqual([(a.start, a.prefixlen, a.owner) for a in allocations],
+                                 [(start, prefixlen, "") for start, prefixlen in subnets])
+    
+    def test_parse_line_variants(self):
+        expected = (BASE, 48, "", "")
+        self.assertEqual(PlanStore.parse_line("2026:db8::/48"), expected)
+        self.assertEqual(PlanStore.parse_line("2026:db8::/48\t张三\tA\tB"), (BASE, 48, "张三", "A;B"))
+        self.assertEqual(PlanStore.parse_line("张三, 2026:db8::/48"), (BASE, 48, "张三", ""))
+        self.assertEqual(PlanStore.parse_line("1. 2026:0db8:0000:0000:0000:0000:0000:0000/48  张三"), (BASE, 48, "张三", ""))
+        self.assertIsNone(PlanStore.parse_line("no prefix here"))
+        with self.assertRaises(ValueError):
+            PlanStore.parse_line("2026:db8::/129")
+
+
+if __name__ == "__main__":
+    unittest.main()
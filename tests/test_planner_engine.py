@@ -0,0 +1,92 @@
+import ipaddress
+import unittest
+from itertools import islice
+from planner_engine import PlannerEngine
+
+
+class PlannerEngineTest(unittest.TestCase):
+    def test_clean_ipv6_input(self):
+        self.assertEqual(PlannerEngine.clean_ipv6_input("  2026:db8::1/64 "), "2026:db8::1")
+        self.assertEqual(PlannerEngine.clean_ipv6_input("http://[2026:db8::1]:8080/"), "2026:db8::1")
+    
+    def test_parse_prefix_range(self):
+        self.assertEqual(PlannerEngine.parse_prefix(" 64 "), 64)
+        for bad in ("-1", "129", "abc"):
+            with self.assertRaises(ValueError):
+                PlannerEngine.parse_prefix(bad)
+    
+    def test_basic_info_matches_ipaddress(self):
+        info = PlannerEngine.basic_info("2026:db8:1:2::5", "48")
+        network = ipaddress.IPv6Network("2026:db8:1::/48")
+        self.assertEqual(info["network"], network)
+        self.assertEqual(info["broadcast_address"], network.broadcast_address)
+        self.assertEqual(info["total_addresses"], 2 ** 80)
+    
+    def test_host_addresses_match_ipaddress_hosts(self):
+        result = PlannerEngine.host_addresses("2026:db8::", "120", limit=300)
+        network = ipaddress.IPv6Network("2026:db8::/120")
+        self.assertEqual(result["total_hosts"], 254)
+        self.assertEqual(result["hosts"], list(islice(network.hosts(), 300)))
+    
+    def test_point_to_point_and_single_host(self):
+        p2p = PlannerEngine.host_addresses("2026:db8::", "127")
+        self.assertEqual(p2p["total_hosts"], 2)
+        self.assertEqual([str(h) for h in p2p["hosts"]], ["2026:db8::1", "2026:db8::2"])
+        single = PlannerEngine.host_addresses("2026:db8::9", "128")
+        self.assertEqual((single["total_hosts"], single["hosts"]), (1, [ipaddress.IPv6Address("2026:db8::9")]))
+    
+    def test_host_addresses_stop_check(self):
+        self.assertIsNone(PlannerEngine.host_addresses("2026:db8::", "64", stop_check=lambda: True))
+    
+    def test_division_prefix(self):
+        self.assertEqual(PlannerEngine.division_prefix(48, 1), (48, 1))
+        self.assertEqual(PlannerEngine.division_prefix(48, 3), (50, 4))
+        self.assertEqual(PlannerEngine.division_prefix(48, 256), (56, 256))
+        with self.assertRaises(ValueError):
+            PlannerEngine.division_prefix(127, 4)
+        with self.assertRaises(ValueError):
+            PlannerEngine.division_prefix(48, 0)
+    
+    def test_subnet_indexing_matches_ipaddress_subnets(self):
+        network = ipaddress.IPv6Network("2026:db8::/48")
+        subnets = list(network.subnets(new_prefix=56))
+        self.assertEqual(PlannerEngine.subnet_slice(network, 56, 1, 256), subnets)
+        self.assertEqual(PlannerEngine.subnet_slice(network, 56, 100, 102), subnets[99:102])
+        for index in (1, 17, 256):
+            subnet = PlannerEngine.nth_subnet(network, 56, index)
+            self.assertEqual(subnet, subnets[index - 1])
+            self.assertEqual(PlannerEngine.subnet_index(network, 56, subnet), index)
+            self.assertEqual(PlannerEngine.subnet_index(network, 56, subnet.broadcast_address), index)
+    
+    def test_subnet_indexing_rejects_out_of_range(self):
+        network = ipaddress.IPv6Network("2026:db8::/48")
+        with self.assertRaises(ValueError):
+            PlannerEngine.nth_subnet(network, 56, 257)
+        with self.assertRaises(ValueError):
+            PlannerEngine.subnet_slice(network, 40, 1, 1)
+        with self.assertRaises(ValueError):
+            PlannerEngine.subnet_index(network, 56, "2026:db9::")
+    
+    def test_nth_subnet_of_huge_division(self):
+        network = ipaddress.IPv6Network("2026:db8::/32")
+        last = PlannerEngine.nth_subnet(network, 128, 2 ** 96)
+        self.assertEqual(last, ipaddress.IPv6Network(f"{network.broadcast_address}/128"))
+    
+    def test_subnet_membership(self):
+        result = PlannerEngine.subnet_membership("2026:db8::1:5", "112")
+        self.assertEqual(result["network"], ipaddress.IPv6Network("2026:db8::1:0/112"))
+        self.assertEqual(result["address_index"], 6)
+        self.assertEqual(result["available_hosts"], 65534)
+    
+    def test_eui64(self):
+        result = PlannerEngine.eui64("00:11:22:33:44:55", "2026:db8::/64")
+        self.assertEqual(result["eui64"], "0211:22ff:fe33:4455")
+        self.assertEqual(result["address"], ipaddress.IPv6Address("2026:db8::211:22ff:fe33:4455"))
+        with self.assertRaises(ValueError):
+            PlannerEngine.eui64("00:11:22:33:44", "2026:db8::/64")
+        with self.assertRaises(ValueError):
+            PlannerEngine.eui64("00:11:22:33:44:55", "2026:db8::/48")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import gzip
+import ipaddress
+import os
+import random
+import shutil
+import tempfile
+import unittest
+from export_writer import AddressExporter
+from prefix_aggregator import PrefixAggregator
+
+
+def random_networks(rng, count):
+    base = int(ipaddress.IPv6Address("2026:db8::"))
+    networks = []
+    for _ in range(count):
+        prefixlen = rng.randint(100, 128)
+        start = (base | rng.getrandbits(24)) & ~((1 << (128 - prefixlen)) - 1)
+        networks.append(ipaddress.IPv6Network((start, prefixlen)))
+    return networks
+
+
+def as_tuples(networks):
+    return [(int(network.network_address), network.prefixlen) for network in networks]
+
+
+class PrefixAggregatorTest(unittest.TestCase):
+    def test_matches_collapse_addresses(self):
+        rng = random.Random(2026)
+        for _ in range(30):
+            networks = random_networks(rng, rng.randint(1, 300))
+            self.assertEqual(PrefixAggregator.aggregate_networks(networks),
+                             as_tuples(ipaddress.collapse_addresses(networks)))
+    
+    def test_range_blocks_cover_range_exactly(self):
+        rng = random.Random(7)
+        for _ in range(200):
+            start = rng.getrandbits(128)
+            end = min(start + rng.getrandbits(rng.randint(0, 80)), (1 << 128) - 1)
+            blocks = list(PrefixAggregator.range_blocks(start, end))
+            expected = ipaddress.summarize_address_range(ipaddress.IPv6Address(start), ipaddress.IPv6Address(end))
+            self.assertEqual(blocks, as_tuples(expected))
+    
+    def test_whole_space_and_zero_start(self):
+        self.assertEqual(list(PrefixAggregator.range_blocks(0, (1 << 128) - 1)), [(0, 0)])
+        keys = [(0 << 8) | 128, (1 << 8) | 128, (2 << 8) | 127, (8 << 8) | 126]
+        self.assertEqual(list(PrefixAggregator.merged_ranges(keys)), [(0, 3), (8, 11)])
+        self.assertEqual(list(PrefixAggregator.aggregate(keys)), [(0, 126), (8, 126)])
+        self.assertEqual(list(PrefixAggregator.merged_ranges([])), [])
+    
+    def test_parse_prefix(self):
+        base = int(ipaddress.IPv6Address("2026:db8::"))
+        self.assertEqual(PrefixAggregator.parse_prefix("核心, 2026:DB8::/48, 北京"), (base, 48))
+        self.assertIsNone(PrefixAggregator.parse_prefix("2026:db8::"))
+        with self.assertRaises(ValueError):
+            PrefixAggregator.parse_prefix("2026:db8::/129")
+    
+    def test_aggregate_compressed_file(self):
+        work_dir = tempfile.mkdtemp()
+        try:
+            networks = random_networks(random.Random(3), 5000)
+            input_path = os.path.join(work_dir, "prefixes.txt.gz")
+            with gzip.open(input_path, "wt", encoding="utf-8") as f:
+                f.write("# 分配表\n")
+                f.writelines(f"{network},标签\n" for network in networks)
+                f.write("垃圾行\n")
+            output_path = os.path.join(work_dir, "merged.txt")
+            stats = PrefixAggregator.aggregate_file(input_path, output_path)
+            
+            expected = list(ipaddress.collapse_addresses(networks))
+            self.assertEqual((stats["inputs"], stats["outputs"], stats["skipped"]), (5000, len(expected), 1))
+            self.assertEqual(stats["addresses"], sum(network.num_addresses for network in expected))
+            with open(output_path, 'r', encoding='utf-8') as f:
+                self.assertEqual(f.read().splitlines(), [str(network) for network in expected])
+        finally:
+            shutil.rmtree(work_dir)
+    
+    def test_aggregate_subnet_export(self):
+        work_dir = tempfile.mkdtemp()
+        try:
+            network = ipaddress.IPv6Network("2026:db8::/48")
+            input_path = os.path.join(work_dir, "subnets.txt.xz")
+            AddressExporter.export_subnets(input_path, network, 56, 1, 256)
+            output_path = os.path.join(work_dir, "merged.txt")
+            stats = PrefixAggregator.aggregate_file(input_path, output_path)
+            self.assertEqual((stats["inputs"], stats["outputs"], stats["skipped"]), (256, 1, 0))
+            with open(output_path, 'r', encoding='utf-8') as f:
+                self.assertEqual(f.read(), "2026:db8::/48\n")
+        finally:
+            shutil.rmtree(work_dir)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import gzip
+import ipaddress
+import os
+import random
+import shutil
+import tempfile
+import unittest
+from export_writer import AddressExporter
+from prefix_trie import PrefixTrie, LongestPrefixMatcher
+
+
+def linear_match(prefixes, address):
+    best = None
+    for key, length in prefixes:
+        if address >> (128 - length) == key >> (128 - length) and (best is None or length > best[1]):
+            best = (key, length)
+    return best
+
+
+class PrefixTrieTest(unittest.TestCase):
+    def random_prefixes(self, rng, count):
+        base = 0x20260db8 << 96
+        prefixes = set()
+        while len(prefixes) < count:
+            length = rng.choice([0, 16, 32, 40, 44, 48, 52, 56, 60, 64, 96, 127, 128])
+            key = (base | rng.getrandbits(96)) & (((1 << 128) - 1) ^ ((1 << (128 - length)) - 1))
+            prefixes.add((key, length))
+        return sorted(prefixes)
+    
+    def test_lookup_matches_linear_scan(self):
+        rng = random.Random(7)
+        prefixes = self.random_prefixes(rng, 300)
+        trie = PrefixTrie()
+        for key, length in rng.sample(prefixes, len(prefixes)):
+            trie.insert_prefix(key, length, f"{key:x}/{length}")
+        
+        probes = [key for key, _ in prefixes] + [key | (1 << (128 - length)) - 1 for key, length in prefixes]
+        probes += [(0x20260db8 << 96) | rng.getrandbits(96) for _ in range(2000)]
+        probes += [rng.getrandbits(128) for _ in range(500)]
+        for address in probes:
+            expected = linear_match(prefixes, address)
+            value = trie.lookup(address)
+            if expected is None:
+                self.assertEqual(value, -1)
+            else:
+                self.assertEqual(trie.prefixes[value], expected)
+                self.assertEqual(trie.labels[value], f"{expected[0]:x}/{expected[1]}")
+    
+    def test_reinsert_updates_label(self):
+        trie = PrefixTrie()
+        trie.insert("2026:db8::/32", "old")
+        trie.insert("2026:db8::/32", "new")
+        self.assertEqual(len(trie), 1)
+        self.assertEqual(trie.match(ipaddress.IPv6Address("2026:db8::1")),
+                         (ipaddress.IPv6Network("2026:db8::/32"), "new"))
+        self.assertIsNone(trie.match(ipaddress.IPv6Address("2026:db9::1")))
+
+
+class LongestPrefixMatcherTest(unittest.TestCase):
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        shutil.rmtree(self.work_dir)
+    
+    def test_resolve_compressed_files(self):
+        prefix_path = os.path.join(self.work_dir, "prefixes.txt.gz")
+        with gzip.open(prefix_path, "wt", encoding="utf-8") as f:
+            f.write("# 分配表\n2026:db8::/32,site\n2026:db8:1::/48,lan\nnot a prefix\n")
+        address_path = os.path.join(self.work_dir, "addresses.log.gz")
+        with gzip.open(address_path, "wt", encoding="utf-8") as f:
+            f.write("2026:db8:1::5 GET /\n2026:db8:2::5\n2026:db9::1\nbogus\n")
+        output_path = os.path.join(self.work_dir, "result.csv")
+        
+        trie, stats = LongestPrefixMatcher.build_from_file(prefix_path)
+        self.assertEqual((stats["prefixes"], stats["skipped"]), (2, 1))
+        result = LongestPrefixMatcher.resolve_file(trie, address_path, output_path)
+        self.assertEqual((result["resolved"], result["matched"], result["invalid"]), (3, 2, 1))
+        with open(output_path, 'r', encoding='utf-8-sig', newline='') as f:
+            self.assertEqual(f.read().split("\r\n")[1:4], [
+                "2026:db8:1::5,2026:db8:1::/48,lan",
+                "2026:db8:2::5,2026:db8::/32,site",
+                "2026:db9::1,,",
+            ])
+    
+    def test_build_from_subnet_exports(self):
+        network = ipaddress.IPv6Network("2026:db8::/48")
+        for name, header_lines in (("subnets.txt", 0), ("subnets.csv.gz", 1)):
+            path = os.path.join(self.work_dir, name)
+            AddressExporter.export_subnets(path, network, 56, 1, 4)
+            trie, stats = LongestPrefixMatcher.build_from_file(path)
+            self.assertEqual((stats["prefixes"], stats["skipped"]), (4, header_lines), name)
+            self.assertEqual(trie.match(ipaddress.IPv6Address("2026:db8:0:3ff::1")),
+                             (ipaddress.IPv6Network("2026:db8:0:300::/56"), ""))
+
+
+if __name__ == "__main__":
+    unittest.main()
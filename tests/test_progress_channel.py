@@ -0,0 +1,63 @@
+import threading
+import unittest
+from progress_channel import ProgressChannel
+
+
+class FakeRoot:
+    def __init__(self):
+        self.callbacks = []
+    
+    def after(self, delay_ms, callback):
+        self.callbacks.append(callback)
+        return len(self.callbacks)
+    
+    def tick(self):
+        callbacks = self.callbacks
+        self.callbacks = []
+        for callback in callbacks:
+            callback()
+
+
+class ProgressChannelTest(unittest.TestCase):
+    def setUp(self):
+        self.root = FakeRoot()
+        self.events = []
+        self.channel = ProgressChannel(self.root, lambda value: self.events.append(("progress", value))).start()
+    
+    def test_progress_coalesced_to_latest(self):
+        for value in range(1000):
+            self.channel.post(value)
+        self.assertEqual(self.events, [])
+        self.root.tick()
+        self.assertEqual(self.events, [("progress", 999)])
+        self.root.tick()
+        self.assertEqual(len(self.events), 1)
+    
+    def test_calls_keep_order_with_progress(self):
+        self.channel.post(1)
+        self.channel.post(2)
+        self.channel.call(lambda: self.events.append(("call", "a")))
+        self.channel.post(3)
+        self.channel.call(lambda: self.events.append(("call", "b")))
+        self.root.tick()
+        self.assertEqual(self.events, [("progress", 2), ("call", "a"), ("progress", 3), ("call", "b")])
+    
+    def test_posts_from_worker_thread(self):
+        worker = threading.Thread(target=lambda: [self.channel.post(value) for value in range(10000)])
+        worker.start()
+        worker.join()
+        self.root.tick()
+        self.assertEqual(self.events, [("progress", 9999)])
+    
+    def test_close_stops_polling_after_final_drain(self):
+        self.channel.post(5)
+        self.channel.close()
+        self.channel.post(6)
+        self.root.tick()
+        self.assertEqual(self.events, [("progress", 5), ("progress", 6)])
+        self.assertEqual(self.root.callbacks, [])
+        self.assertIsNone(self.channel.pending)
+
+
+if __name__ == "__main__":
+    unittest.main()
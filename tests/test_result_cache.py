@@ -0,0 +1,56 @@
+import unittest
+from result_cache import ResultCache
+
+
+class ResultCacheTest(unittest.TestCase):
+    def test_key_normalizes_address_spelling(self):
+        self.assertEqual(ResultCache.make_key("basic", "2026:0DB8:0::1/64", " 64 "),
+                         ResultCache.make_key("basic", "[2026:db8::1]", "64"))
+        self.assertNotEqual(ResultCache.make_key("basic", "2026:db8::1", "64"),
+                            ResultCache.make_key("basic", "2026:db8::1", "48"))
+    
+    def test_least_recently_used_entry_evicted(self):
+        cache = ResultCache(max_bytes=300)
+        cache.put("a", "A", size=100)
+        cache.put("b", "B", size=100)
+        cache.put("c", "C", size=100)
+        self.assertEqual(cache.get("a"), "A")
+        cache.put("d", "D", size=100)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual([cache.get(key) for key in "acd"], ["A", "C", "D"])
+        self.assertEqual(cache.stats()["evictions"], 1)
+        self.assertLessEqual(cache.current_bytes, 300)
+    
+    def test_replacing_entry_updates_size(self):
+        cache = ResultCache(max_bytes=1000)
+        cache.put("a", "A", size=600)
+        cache.put("a", "A2", size=100)
+        self.assertEqual(cache.current_bytes, 100)
+        self.assertEqual(cache.get("a"), "A2")
+    
+    def test_oversized_value_not_cached(self):
+        cache = ResultCache(max_bytes=10)
+        cache.put("big", "x", size=11)
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.current_bytes, 0)
+    
+    def test_shrinking_limit_evicts(self):
+        cache = ResultCache(max_bytes=1000)
+        for key in "abcd":
+            cache.put(key, key, size=200)
+        cache.set_max_bytes(450)
+        self.assertEqual(list(cache.entries), ["c", "d"])
+    
+    def test_get_or_compute_counts_hits(self):
+        cache = ResultCache()
+        calls = []
+        compute = lambda: calls.append(1) or [1, 2, 3]
+        self.assertEqual(cache.get_or_compute("k", compute), ([1, 2, 3], False))
+        self.assertEqual(cache.get_or_compute("k", compute), ([1, 2, 3], True))
+        self.assertEqual(len(calls), 1)
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
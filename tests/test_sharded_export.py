@@ -0,0 +1,47 @@
+import gzip
+import ipaddress
+import os
+import shutil
+import tempfile
+import unittest
+from export_writer import AddressExporter
+from sharded_export import ShardedExporter, SHARD_MIN_SIZE
+
+
+class ShardedExportTest(unittest.TestCase):
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        self.network = ipaddress.IPv6Network("2026:db8::/64")
+        self.total = 2 ** 64 - 2
+    
+    def tearDown(self):
+        shutil.rmtree(self.work_dir)
+    
+    def path(self, name):
+        return os.path.join(self.work_dir, name)
+    
+    def test_plan_shards_covers_range(self):
+        shards = ShardedExporter.plan_shards(11, 11 + 10 * SHARD_MIN_SIZE + 6, 2)
+        self.assertEqual(len(shards), 8)
+        self.assertEqual(shards[0][0], 11)
+        for (first, size), (following, _) in zip(shards, shards[1:]):
+            self.assertEqual(first + size, following)
+        self.assertEqual(sum(size for _, size in shards), 10 * SHARD_MIN_SIZE + 7)
+        self.assertEqual(ShardedExporter.plan_shards(1, 10, 4), [(1, 10)])
+    
+    def test_sharded_output_matches_sequential(self):
+        end_index = 2 * SHARD_MIN_SIZE + 1234
+        start_index = 1 << 40
+        AddressExporter.export_hosts(self.path("sequential.txt"), self.network, start_index, start_index + end_index,
+                                     self.total)
+        done = ShardedExporter.export_hosts(self.path("sharded.txt.gz"), self.network, start_index,
+                                            start_index + end_index, self.total, workers=2)
+        self.assertEqual(done, end_index + 1)
+        with gzip.open(self.path("sharded.txt.gz"), "rt", encoding="utf-8") as f, \
+                open(self.path("sequential.txt"), 'r', encoding='utf-8') as g:
+            self.assertEqual(f.read(), g.read())
+        self.assertEqual(sorted(os.listdir(self.work_dir)), ["sequential.txt", "sharded.txt.gz"])
+
+
+if __name__ == "__main__":
+    unittest.main()
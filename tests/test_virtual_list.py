@@ -0,0 +1,27 @@
+import unittest
+from types import SimpleNamespace
+from virtual_list import VirtualListView
+
+
+class PreviewTextTest(unittest.TestCase):
+    def preview(self, total, **kwargs):
+        view = SimpleNamespace(total=total, row_provider=lambda i: f"{i + 1}. row")
+        return VirtualListView.get_preview_text(view, **kwargs)
+    
+    def test_preview_independent_of_scroll_position(self):
+        text = self.preview(250, unit="个地址")
+        lines = text.splitlines()
+        self.assertEqual(lines[0], "1. row")
+        self.assertEqual(lines[99], "100. row")
+        self.assertEqual(lines[-1], "... 还有 150 个地址未显示")
+    
+    def test_short_list_copied_in_full(self):
+        self.assertEqual(self.preview(2), "1. row\n2. row\n")
+    
+    def test_empty_source(self):
+        view = SimpleNamespace(total=0, row_provider=None)
+        self.assertEqual(VirtualListView.get_preview_text(view), "\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
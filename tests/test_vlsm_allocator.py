@@ -0,0 +1,80 @@
+import ipaddress
+import random
+import unittest
+from vlsm_allocator import BuddyAllocator, VLSMAllocator
+
+
+class VLSMAllocatorTest(unittest.TestCase):
+    def blocks(self, plan):
+        for index in range(plan.total):
+            label, start, prefix = plan.row(index)
+            yield label, ipaddress.IPv6Network((start, prefix))
+    
+    def check_tiling(self, network, plan):
+        allocated = [block for _, block in self.blocks(plan)]
+        for block in allocated:
+            self.assertTrue(block.subnet_of(network), block)
+        spans = sorted([(int(block.network_address), int(block.broadcast_address)) for block in allocated]
+                       + [(int(block.network_address), int(block.broadcast_address)) for block in plan.free_blocks])
+        self.assertEqual(spans[0][0], int(network.network_address))
+        self.assertEqual(spans[-1][1], int(network.broadcast_address))
+        for (_, previous_end), (start, _) in zip(spans, spans[1:]):
+            self.assertEqual(start, previous_end + 1)
+        self.assertEqual(plan.allocated_addresses(), sum(block.num_addresses for block in allocated))
+    
+    def test_parse_requests(self):
+        requests = VLSMAllocator.parse_requests("核心: 3 × /48, 200x/56；40,000 * /64 /60")
+        self.assertEqual(requests, [("核心", 48, 3), ("", 56, 200), ("", 64, 40000), ("", 60, 1)])
+        with self.assertRaises(ValueError):
+            VLSMAllocator.parse_requests("3 × /48, 乱码")
+        with self.assertRaises(ValueError):
+            VLSMAllocator.parse_requests("   ")
+    
+    def test_plan_tiles_network(self):
+        network = ipaddress.IPv6Network("2026:db8::/44")
+        requests = [("a", 48, 3), ("b", 56, 200), ("c", 64, 3000), ("d", 52, 5), ("e", 56, 7)]
+        plan = VLSMAllocator.plan(network, requests)
+        self.assertEqual(plan.total, sum(count for _, _, count in requests))
+        self.check_tiling(network, plan)
+        counts = {}
+        for label, block in self.blocks(plan):
+            counts[(label, block.prefixlen)] = counts.get((label, block.prefixlen), 0) + 1
+        self.assertEqual(counts, {(label, prefix): count for label, prefix, count in requests})
+    
+    def test_random_plans_tile_network(self):
+        rng = random.Random(2026)
+        network = ipaddress.IPv6Network("2026:db8::/112")
+        for _ in range(50):
+            requests = [(str(i), rng.randint(114, 128), rng.randint(1, 40)) for i in range(rng.randint(1, 6))]
+            if sum(count << (128 - prefix) for _, prefix, count in requests) > network.num_addresses:
+                with self.assertRaises(ValueError):
+                    VLSMAllocator.plan(network, requests)
+                continue
+            self.check_tiling(network, VLSMAllocator.plan(network, requests))
+    
+    def test_exact_fit_and_shortfall(self):
+        network = ipaddress.IPv6Network("2026:db8::/120")
+        plan = VLSMAllocator.plan(network, [("", 121, 1), ("", 122, 1), ("", 123, 1), ("", 124, 2)])
+        self.assertEqual(plan.free_blocks, [])
+        self.check_tiling(network, plan)
+        with self.assertRaises(ValueError):
+            VLSMAllocator.plan(network, [("", 121, 2), ("", 128, 1)])
+        with self.assertRaises(ValueError):
+            VLSMAllocator.plan(network, [("", 119, 1)])
+    
+    def test_buddy_allocator_tracks_free_space(self):
+        network = ipaddress.IPv6Network("2026:db8::/120")
+        allocator = BuddyAllocator(network)
+        base = int(network.network_address)
+        self.assertEqual(allocator.allocate(124, 3), [(base, 3)])
+        self.assertEqual(allocator.free_blocks(), [(base + 48, 124), (base + 64, 122), (base + 128, 121)])
+        self.assertEqual(allocator.free_addresses, 208)
+        self.assertEqual(allocator.allocate(121, 1), [(base + 128, 1)])
+        with self.assertRaises(ValueError):
+            allocator.allocate(121, 1)
+        with self.assertRaises(ValueError):
+            allocator.allocate(119)
+
+
+if __name__ == "__main__":
+    unittest.main()
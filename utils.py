@@ -1,6 +1,6 @@
 import tkinter as tk
 from tkinter import ttk
-import re
+from planner_engine import PlannerEngine
 
 
 class ToolTip:
@@ -33,15 +33,7 @@ class ToolTip:
 class UIUtils:
     @staticmethod
     def clean_ipv6_input(input_str):
-        cleaned = input_str.strip()
-        
-        bracket_match = re.search(r'\[([0-9a-fA-F:%]+)\]', cleaned)
-        if bracket_match:
-            cleaned = bracket_match.group(1)
-        
-        cleaned = cleaned.split('/', 1)[0]
-        
-        return cleaned
+        return PlannerEngine.clean_ipv6_input(input_str)
     
     @staticmethod
     def add_placeholder(entry, default_value, placeholder):
@@ -103,6 +95,12 @@ class UIUtils:
         setattr(parent, text_name, result_text)
         return result_text
     
+    @staticmethod
+    def render_segments(text_widget, segments):
+        text_widget.delete(1.0, tk.END)
+        for segment in segments:
+            text_widget.insert(tk.END, *segment)
+    
     @staticmethod
     def add_tooltip(widget, text):
         ToolTip(widget, text)
@@ -0,0 +1,125 @@
+import tkinter as tk
+from tkinter import ttk, font as tkfont
+
+
+PREVIEW_ROWS = 100
+
+
+class VirtualListView(ttk.Frame):
+    def __init__(self, parent, height=12, width=80, row_color="#009900"):
+        super().__init__(parent)
+        self.total = 0
+        self.top = 0
+        self.visible_rows = height
+        self.row_provider = None
+        self.row_font = tkfont.Font(family='Arial', size=10)
+        
+        self.text = tk.Text(self, height=height, width=width, wrap=tk.NONE, font=self.row_font, cursor="arrow")
+        self.text.grid(row=0, column=0, sticky=tk.NSEW)
+        self.text.tag_config("row", foreground=row_color)
+        self.text.config(state=tk.DISABLED)
+        
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self._on_scroll)
+        self.scrollbar.grid(row=0, column=1, sticky=tk.NS)
+        
+        jump_frame = ttk.Frame(self)
+        jump_frame.grid(row=1, column=0, columnspan=2, sticky=tk.W, pady=(5, 0))
+        ttk.Label(jump_frame, text="跳转到第").pack(side=tk.LEFT)
+        self.jump_entry = ttk.Entry(jump_frame, width=24)
+        self.jump_entry.pack(side=tk.LEFT, padx=3)
+        ttk.Label(jump_frame, text="行").pack(side=tk.LEFT)
+        ttk.Button(jump_frame, text="跳转", command=self._on_jump).pack(side=tk.LEFT, padx=5)
+        self.position_label = ttk.Label(jump_frame, text="", foreground="#666666")
+        self.position_label.pack(side=tk.LEFT, padx=10)
+        
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(0, weight=1)
+        
+        self.jump_entry.bind('<Return>', lambda e: self._on_jump())
+        self.text.bind('<Configure>', self._on_resize)
+        self.text.bind('<MouseWheel>', self._on_mousewheel)
+        self.text.bind('<Button-4>', lambda e: self.scroll_rows(-3))
+        self.text.bind('<Button-5>', lambda e: self.scroll_rows(3))
+        self.text.bind('<Up>', lambda e: self.scroll_rows(-1))
+        self.text.bind('<Down>', lambda e: self.scroll_rows(1))
+        self.text.bind('<Prior>', lambda e: self.scroll_rows(-self.visible_rows))
+        self.text.bind('<Next>', lambda e: self.scroll_rows(self.visible_rows))
+        self.text.bind('<Home>', lambda e: self.jump_to(1))
+        self.text.bind('<End>', lambda e: self.jump_to(self.total))
+        self.text.bind('<Button-1>', lambda e: self.text.focus_set())
+    
+    def set_source(self, total, row_provider):
+        self.total = total
+        self.row_provider = row_provider
+        self.top = 0
+        self.render()
+    
+    def clear(self):
+        self.set_source(0, None)
+    
+    def render(self):
+        self.top = max(0, min(self.top, self.total - self.visible_rows))
+        end = min(self.total, self.top + self.visible_rows)
+        rows = [self.row_provider(i) for i in range(self.top, end)] if self.row_provider else []
+        
+        self.text.config(state=tk.NORMAL)
+        self.text.delete(1.0, tk.END)
+        self.text.insert(tk.END, "\n".join(rows), "row")
+        self.text.config(state=tk.DISABLED)
+        
+        if self.total > 0:
+            self.scrollbar.set(self.top / self.total, end / self.total)
+            self.position_label.config(text=f"第 {self.top + 1:,} - {end:,} 行，共 {self.total:,} 行")
+        else:
+            self.scrollbar.set(0, 1)
+            self.position_label.config(text="")
+    
+    def get_visible_text(self):
+        return self.text.get(1.0, tk.END)
+    
+    def get_preview_text(self, limit=PREVIEW_ROWS, unit="行"):
+        end = min(self.total, limit)
+        rows = [self.row_provider(i) for i in range(end)] if self.row_provider else []
+        text = "\n".join(rows) + "\n"
+        if self.total > end:
+            text += f"\n... 还有 {self.total - end:,} {unit}未显示\n"
+        return text
+    
+    def scroll_rows(self, delta):
+        self.top += delta
+        self.render()
+        return "break"
+    
+    def jump_to(self, row):
+        self.top = row - 1
+        self.render()
+        return "break"
+    
+    def _on_scroll(self, *args):
+        if not self.total:
+            return
+        if args[0] == "moveto":
+            fraction = min(max(float(args[1]), 0.0), 1.0)
+            self.top = int(fraction * self.total)
+        elif args[0] == "scroll":
+            amount = int(args[1])
+            if args[2] == "pages":
+                amount *= self.visible_rows
+            self.top += amount
+        self.render()
+    
+    def _on_mousewheel(self, event):
+        return self.scroll_rows(-3 if event.delta > 0 else 3)
+    
+    def _on_jump(self):
+        try:
+            row = int(self.jump_entry.get().strip().replace(",", ""))
+        except ValueError:
+            return
+        self.jump_to(row)
+    
+    def _on_resize(self, event):
+        rows = max(1, (event.height - 6) // self.row_font.metrics('linespace'))
+        if rows != self.visible_rows:
+            self.visible_rows = rows
+            self.render()
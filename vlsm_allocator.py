@@ -0,0 +1,172 @@
+import bisect
+import heapq
+import ipaddress
+import itertools
+import re
+from address_format import AddressFormatter
+
+
+REQUEST_PATTERN = re.compile(
+    r'(?:(?P<label>[^\s,;:：/]+)\s*[:：]\s*)?'
+    r'(?:(?P<count>\d{1,3}(?:,\d{3})+|\d+)\s*[xX×*]\s*)?'
+    r'/(?P<prefix>\d{1,3})'
+)
+SEPARATOR_PATTERN = re.compile(r'^[\s,;，；]*$')
+
+
+class BuddyAllocator:
+    def __init__(self, network):
+        self.network = network
+        self.base_prefix = network.prefixlen
+        self.free_lists = {prefix: [] for prefix in range(self.base_prefix, 129)}
+        self.free_set = set()
+        self.free_addresses = 0
+        self._push(int(network.network_address), self.base_prefix)
+    
+    def _push(self, start, prefix):
+        heapq.heappush(self.free_lists[prefix], start)
+        self.free_set.add((start, prefix))
+        self.free_addresses += 1 << (128 - prefix)
+    
+    def _pop(self, prefix):
+        heap = self.free_lists[prefix]
+        while heap:
+            start = heapq.heappop(heap)
+            if (start, prefix) in self.free_set:
+                self.free_set.remove((start, prefix))
+                self.free_addresses -= 1 << (128 - prefix)
+                return start
+        return None
+    
+    def _release_range(self, start, end):
+        while start < end:
+            size = start & -start or 1 << (128 - self.base_prefix)
+            while size > end - start:
+                size >>= 1
+            self._push(start, 129 - size.bit_length())
+            start += size
+    
+    def allocate(self, prefix, count=1):
+        if not self.base_prefix <= prefix <= 128:
+            raise ValueError(f"请求的前缀必须在 /{self.base_prefix} 到 /128 之间")
+        size = 1 << (128 - prefix)
+        runs = []
+        while count > 0:
+            for level in range(prefix, self.base_prefix - 1, -1):
+                start = self._pop(level)
+                if start is not None:
+                    break
+            else:
+                raise ValueError(f"{self.network} 剩余空间不足，无法再分配 /{prefix}")
+            capacity = 1 << (prefix - level)
+            take = min(count, capacity)
+            runs.append((start, take))
+            self._release_range(start + take * size, start + capacity * size)
+            count -= take
+        return runs
+    
+    def free_blocks(self):
+        return sorted(self.free_set)
+
+
+class VLSMPlan:
+    def __init__(self, network, runs, free_blocks, requests):
+        self.network = network
+        self.runs = runs
+        self.free_blocks = free_blocks
+        self.requests = requests
+        self.offsets = []
+        total = 0
+        for _, _, _, count in runs:
+            self.offsets.append(total)
+            total += count
+        self.total = total
+    
+    def row(self, index):
+        position = bisect.bisect_right(self.offsets, index) - 1
+        label, prefix, start, _ = self.runs[position]
+        return label, start + ((index - self.offsets[position]) << (128 - prefix)), prefix
+    
+    def row_text(self, index):
+        label, start, prefix = self.row(index)
+        text = f"{index + 1}. {AddressFormatter.exploded(start)}/{prefix}"
+        return f"{text}  {label}" if label else text
+    
+    def allocated_addresses(self):
+        return sum(count << (128 - prefix) for _, prefix, _, count in self.runs)
+    
+    def summary_by_prefix(self):
+        summary = {}
+        for _, prefix, _, count in self.runs:
+            summary[prefix] = summary.get(prefix, 0) + count
+        return sorted(summary.items())
+
+
+class VLSMAllocator:
+    @staticmethod
+    def parse_requests(text):
+        requests = []
+        position = 0
+        for match in REQUEST_PATTERN.finditer(text):
+            gap = text[position:match.start()]
+            if not SEPARATOR_PATTERN.match(gap):
+                raise ValueError(f"无法解析的分配请求: {gap.strip()[:40]}")
+            position = match.end()
+            
+            count = int(match.group("count").replace(",", "")) if match.group("count") else 1
+            prefix = int(match.group("prefix"))
+            if count <= 0:
+                raise ValueError(f"请求数量必须大于 0: {match.group(0)}")
+            if prefix > 128:
+                raise ValueError(f"前缀长度必须在 0-128 之间: {match.group(0)}")
+            requests.append((match.group("label") or "", prefix, count))
+        
+        gap = text[position:]
+        if not SEPARATOR_PATTERN.match(gap):
+            raise ValueError(f"无法解析的分配请求: {gap.strip()[:40]}")
+        if not requests:
+            raise ValueError("请输入分配请求，例如: 3 × /48, 200 × /56, 40,000 × /64")
+        return requests
+    
+    @staticmethod
+    def parse_file(file_path):
+        with open(file_path, 'r', encoding='utf-8-sig', errors='replace') as f:
+            return VLSMAllocator.parse_requests(f.read())
+    
+    @staticmethod
+    def plan(network, requests, should_stop=None):
+        if not isinstance(network, ipaddress.IPv6Network):
+            network = ipaddress.IPv6Network(network, strict=False)
+        
+        for label, prefix, count in requests:
+            if prefix < network.prefixlen:
+                raise ValueError(f"请求的 /{prefix} 大于待分配网络 {network}")
+        needed = sum(count << (128 - prefix) for _, prefix, count in requests)
+        if needed > network.num_addresses:
+            smallest = max(prefix for _, prefix, _ in requests)
+            shortfall = -(-(needed - network.num_addresses) >> (128 - smallest))
+            raise ValueError(f"空间不足: {network} 还差 {shortfall:,} 个 /{smallest} 的空间，请减少数量或使用更大的网络")
+        
+        allocator = BuddyAllocator(network)
+        runs = []
+        ordered = sorted(range(len(requests)), key=lambda i: requests[i][1])
+        for prefix, group in itertools.groupby(ordered, key=lambda i: requests[i][1]):
+            group = list(group)
+            blocks = iter(allocator.allocate(prefix, sum(requests[i][2] for i in group)))
+            shift = 128 - prefix
+            start, available = next(blocks)
+            for n, request_index in enumerate(group):
+                if should_stop and n % 4096 == 0 and should_stop():
+                    return None
+                label, _, count = requests[request_index]
+                while count:
+                    if not available:
+                        start, available = next(blocks)
+                    taken = min(count, available)
+                    runs.append((label, prefix, start, taken))
+                    start += taken << shift
+                    available -= taken
+                    count -= taken
+        
+        free_blocks = [ipaddress.IPv6Network((start, prefix)) for start, prefix in allocator.free_blocks()]
+        return VLSMPlan(network, runs, free_blocks, requests)